@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import typing as t
+
+from core_utils import metrics_utils
+from cyclopts import App, Group, Parameter
+from loguru import logger as log
+import xkcdapi
+
+cache_app = App(name="cache", help="CLI for managing the HTTP cache.")
+
+
+def _print_cache_stats(name: str, stats: dict) -> None:
+    if not stats:
+        return
+
+    print(f"{name}: hits={stats['hits']} misses={stats['misses']} hit_ratio={stats['hit_ratio']:.1%}")
+
+    if stats.get("memory"):
+        print(f"{name} (memory): hits={stats['memory']['hits']} misses={stats['memory']['misses']} hit_ratio={stats['memory']['hit_ratio']:.1%}")
+
+
+@cache_app.command(name="warm")
+def warm_cache(
+    start: t.Annotated[int, Parameter(name=["--start", "-s"], show_default=True, help="First comic number to warm.")] = 1,
+    end: t.Annotated[int | None, Parameter(name=["--end", "-e"], help="Last comic number to warm. Defaults to the current comic.")] = None,
+    max_concurrency: t.Annotated[int, Parameter(name=["--max-concurrency", "-c"], show_default=True, help="Maximum number of comics requested at once.")] = 25,
+    batch_size: t.Annotated[int, Parameter(name=["--batch-size", "-b"], show_default=True, help="Number of comics saved to the database per write.")] = 100,
+    cache_ttl: t.Annotated[int, Parameter(name=["--cache-ttl", "-t"], show_default=True, help="Seconds the warmed HTTP cache entries are kept. Once they expire, the next request for a comic goes to the XKCD API again.")] = 900,
+    save: t.Annotated[bool, Parameter(name="--save", show_default=True, help="When True, comics & images are saved to the database. When False, only the HTTP cache is warmed.")] = True,
+    metrics_file: t.Annotated[str | None, Parameter(name="--metrics-file", help="Write request latency, cache & database metrics to this file in the Prometheus text format.")] = None,
+):
+    """Pre-populate the HTTP cache & the database with a range of comics.
+
+    The warmed cache entries only last `--cache-ttl` seconds. Each entry saves its own expiry in the SQLite & Redis
+    caches, so workers & the crawler serve warmed entries for that long, whatever TTL they were configured with
+    (a "file" cache expires entries by each reader's own TTL). Comics saved to the database are kept, but once the
+    cache entries expire, requests for those comics go to the XKCD API again. Warm the cache again (or raise
+    `--cache-ttl`) to keep it warm for longer.
+
+    Params:
+        start: First comic number to warm.
+        end: Last comic number to warm. Defaults to the current comic.
+        max_concurrency: Maximum number of comics requested at once.
+        batch_size: Number of comics saved to the database per write.
+        cache_ttl: Seconds the warmed HTTP cache entries are kept. Once they expire, the next request for a comic goes to the XKCD API again.
+        save: When True, comics & images are saved to the database. When False, only the HTTP cache is warmed.
+        metrics_file: Write request latency, cache & database metrics to this file in the Prometheus text format.
+    """
+    log.info(f"Warming cache for comics #{start}-#{end or 'current'} (cache entries expire after {cache_ttl}s)")
+
+    try:
+        summary: dict = xkcdapi.crawler.warm_cache(start=start, end=end, max_concurrency=max_concurrency, batch_size=batch_size, cache_ttl=cache_ttl, save=save)
+    except Exception as exc:
+        msg = f"({type(exc)}) Error warming cache. Details: {exc}"
+        log.error(msg)
+
+        raise exc
+
+    end = min(end or summary["current_comic_num"], summary["current_comic_num"])
+
+    print(f"Warmed comics #{start}-#{end}: requested={summary['requested']} crawled={summary['crawled']} saved_comics={summary['saved_comics']} saved_imgs={summary['saved_imgs']} failed={len(summary['failed'])}")
+    _print_cache_stats("Current comic cache", summary.get("current_comic_cache"))
+    _print_cache_stats("Comic cache", summary.get("cache"))
+
+    if metrics_file:
+        log.info(f"Metrics written to '{metrics_utils.write_metrics(metrics_file)}'")
+
+    if summary["failed"]:
+        log.warning(f"Failed to warm comic(s): {summary['failed']}")
+
+    log.success("Cache warmed.")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 import typing as t
 
 from celery import Celery
@@ -9,6 +10,7 @@ from domain import xkcd as xcd_domain
 from loguru import logger as log
 from scheduling.celery_scheduler import (
     CelerySettings,
+    LocalTaskExecutor,
     celery_settings,
     celeryapp,
     check_task,
@@ -30,13 +32,35 @@ tasks_call_app = App(name="call", help="Call specific Celery tasks by name")
 celery_tasks_app.command(tasks_call_app)
 celery_app.command(celery_tasks_app)
 
+LocalParam = t.Annotated[bool, Parameter(name="local", help="When True, run the task in this process's thread/process pool instead of sending it to a worker. Needs no broker or result backend.")]
+
+
+@contextmanager
+def get_task_sender(local: bool = False) -> t.Generator[Celery | LocalTaskExecutor, None, None]:
+    """Yield the Celery app, or a `LocalTaskExecutor` that runs tasks in this process when `local` is True.
+
+    Description:
+        Use it in a `with` block around sending & watching the task. The local executor's pool is shut down when
+        the block exits.
+    """
+    if local:
+        log.info("Running task in a local pool, without a Celery broker.")
+        
+        with LocalTaskExecutor(celery_app=CELERY_APP) as executor:
+            yield executor
+        
+        return
+    
+    yield CELERY_APP
+
 
 @celery_app.command(name="start")
-def _start_celery(mode: t.Annotated[str, Parameter(name="mode", show_default=True, help="Set the mode Celery should run in, options: ['worker', 'beat']")]):
+def _start_celery(mode: t.Annotated[str, Parameter(name="mode", show_default=True, help="Set the mode Celery should run in, options: ['worker', 'beat']")], queues: t.Annotated[str | None, Parameter(name=["--queues", "-q"], help="Comma-separated queues a worker consumes, options: ['realtime', 'bulk', 'maintenance']. Default: all queues.")] = None):
     """Start a Celery worker or beat schedule.
     
     Params:
         mode: The mode to run Celery in, options: ['worker', 'beat']
+        queues: Comma-separated queues a worker consumes, i.e. 'realtime' or 'bulk,maintenance'. Default: all queues.
     """
     if not mode:
         log.error("Missing a --mode (-m). Please re-run with -m ['beat', 'worker'] (choose 1).")
@@ -45,10 +69,13 @@ def _start_celery(mode: t.Annotated[str, Parameter(name="mode", show_default=Tru
     if mode not in ["beat", "worker"]:
         raise ValueError(f"Invalid mode: {mode}. Must be one of ['beat', 'worker']")
 
+    if queues and mode != "worker":
+        log.warning(f"--queues only applies to workers, ignoring it in '{mode}' mode.")
+
     log.info(f"Starting Celery in '{mode}' mode.")
     
     try:
-        start_celery.start(app=celeryapp.app, mode=mode)
+        start_celery.start(app=celeryapp.app, mode=mode, queues=queues)
     except Exception as exc:
         msg = f"({type(exc)}) Error running Celery in '{mode}' mode. Details: {exc}"
         log.error(msg)
@@ -66,28 +93,31 @@ def list_celery_tasks(include_celery: t.Annotated[bool, Parameter(name="include-
     
 
 @tasks_call_app.command(name="adhoc-current-comic")
-def run_celery_current_comic_task(save: t.Annotated[bool, Parameter(name="save", help="When True, current comic & img will be saved to the database. When False, the current comic metadata will be returned.")]):
-    if not save:
-        celery_task: AsyncResult = execute_celery_task(task_name="current-comic", celery_app=CELERY_APP)
-    else:
-        # Save current comic metadata & image after running
-        celery_task: AsyncResult = execute_celery_task(task_name="request_and_save_current_comic", celery_app=CELERY_APP)
-        
-    result = watch_celery_task(celery_task)
-    print(f"Celery task 'adhoc-current-comic' result: {result[0]}")
+def run_celery_current_comic_task(save: t.Annotated[bool, Parameter(name="save", help="When True, current comic & img will be saved to the database. When False, the current comic metadata will be returned.")], local: LocalParam = False):
+    with get_task_sender(local=local) as task_sender:
+        if not save:
+            celery_task: AsyncResult = execute_celery_task(task_name="adhoc-current-comic", celery_app=task_sender)
+        else:
+            # Save current comic metadata & image after running
+            celery_task: AsyncResult = execute_celery_task(task_name="request_and_save_current_comic", celery_app=task_sender)
+            
+        result = watch_celery_task(celery_task)
+    print(f"Celery task 'adhoc-current-comic' result: {result}")
 
 
 @tasks_call_app.command(name="update-current-metadata")
-def run_celery_update_current_comic_metadata_task():
-    celery_task: AsyncResult = execute_celery_task(task_name="update_current_comic_metadata", celery_app=CELERY_APP)
-    result = watch_celery_task(celery_task)
+def run_celery_update_current_comic_metadata_task(local: LocalParam = False):
+    with get_task_sender(local=local) as task_sender:
+        celery_task: AsyncResult = execute_celery_task(task_name="update_current_comic_metadata", celery_app=task_sender)
+        result = watch_celery_task(celery_task)
     
     print(f"Celery task 'update_current_comic_metadata' result: {result}")
     
 
 @tasks_call_app.command(name="get-comic")
-def run_celery_get_comic_task(num: t.Annotated[int, Parameter(name=["comic_num", "--num", "-n"], help="The number of an XKCD comic strip to request.")], save: t.Annotated[bool, Parameter(name="save", help="When True, current comic & img will be saved to the database. When False, the current comic metadata will be returned.")] = False):
-    celery_task: AsyncResult = execute_celery_task(task_name="adhoc-request-comic", num=num, save=save, celery_app=CELERY_APP)
-    result = watch_celery_task(celery_task)
+def run_celery_get_comic_task(num: t.Annotated[int, Parameter(name=["comic_num", "--num", "-n"], help="The number of an XKCD comic strip to request.")], save: t.Annotated[bool, Parameter(name="save", help="When True, current comic & img will be saved to the database. When False, the current comic metadata will be returned.")] = False, local: LocalParam = False):
+    with get_task_sender(local=local) as task_sender:
+        celery_task: AsyncResult = execute_celery_task(task_name="adhoc-request-comic", num=num, save=save, celery_app=task_sender)
+        result = watch_celery_task(celery_task)
     
     print(f"Celery task 'adhoc-request-current-comic' result: {result}")
\ No newline at end of file
@@ -4,6 +4,7 @@ import sys
 import typing as t
 
 from ._alembic import alembic_app
+from .cache import cache_app
 from .celery import celery_app
 from .db import db_app
 from .setup import setup_app
@@ -16,7 +17,7 @@ app = App(name="weathercli", help="CLI for WeatherData app.")
 
 app.meta.group_parameters = Group("Session Parameters", sort_key=0)
 
-MOUNT_SUB_CLIS: list = [celery_app, db_app, alembic_app, setup_app]
+MOUNT_SUB_CLIS: list = [celery_app, db_app, alembic_app, setup_app, cache_app]
 
 ## Mount apps
 for sub_cli in MOUNT_SUB_CLIS:
@@ -0,0 +1,212 @@
+"""A local stand-in for xkcd.com, serving synthetic comic JSON & PNG images.
+
+Description:
+    Serves `/info.0.json` (the current comic), `/<num>/info.0.json` & `/comics/<num>.png` for comics
+    1 through `num_comics`. Responses carry `Cache-Control`, `ETag` & `Last-Modified` headers like the
+    real site, and `If-None-Match` requests are answered `304 Not Modified`. Images are valid PNGs of
+    roughly `img_size` bytes, generated once per comic from a fixed seed so every run serves the same bytes.
+
+Usage:
+    with run_fake_xkcd_server(num_comics=500) as server:
+        api_ctl = XkcdApiController(base_url=server.base_url)
+
+    ## Or serve until interrupted
+    python benchmarks/fake_xkcd_server.py --port 8080 --num-comics 500
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+from email.utils import formatdate
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+import struct
+import threading
+import time
+import typing as t
+import zlib
+
+COMIC_JSON_RE = re.compile(r"^/(?:(\d+)/)?info\.0\.json$")
+COMIC_IMG_RE = re.compile(r"^/comics/(\d+)\.png$")
+
+## All responses were "last modified" at server start
+LAST_MODIFIED: str = formatdate(time.time(), usegmt=True)
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF)
+
+
+@lru_cache(maxsize=None)
+def build_png(seed: int, img_size: int = 32 * 1024) -> bytes:
+    """Build a grayscale PNG of random noise, about `img_size` bytes (noise does not compress)."""
+    width: int = 256
+    height: int = max(1, img_size // width)
+    rng: random.Random = random.Random(seed)
+
+    ## Each row starts with filter type 0 (none)
+    raw: bytes = b"".join(b"\x00" + rng.randbytes(width) for _ in range(height))
+
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)),
+            _png_chunk(b"IDAT", zlib.compress(raw, 1)),
+            _png_chunk(b"IEND", b""),
+        ]
+    )
+
+
+def build_comic(num: int, base_url: str) -> dict:
+    """Build a comic in the XKCD JSON API's format."""
+    return {
+        "month": str((num % 12) + 1),
+        "num": num,
+        "link": "",
+        "year": str(2006 + num // 365),
+        "news": "",
+        "safe_title": f"Benchmark Comic {num}",
+        "transcript": "",
+        "alt": f"Synthetic comic #{num} for benchmarks.",
+        "img": f"{base_url}/comics/{num}.png",
+        "title": f"Benchmark Comic {num}",
+        "day": str((num % 28) + 1),
+    }
+
+
+class FakeXkcdServer(ThreadingHTTPServer):
+    daemon_threads: bool = True
+    ## listen() backlog. The default (5) drops connections opened at once by the async benchmarks, which then wait
+    ## for a SYN retransmit (1s+) & measure the server instead of the client
+    request_queue_size: int = 128
+
+    def __init__(self, address: t.Tuple[str, int], num_comics: int = 500, img_size: int = 32 * 1024, latency: float = 0.0, max_age: int = 300) -> None:
+        super().__init__(address, FakeXkcdHandler)
+
+        self.num_comics: int = num_comics
+        self.img_size: int = img_size
+        self.latency: float = latency
+        self.max_age: int = max_age
+        ## Number of requests served, by path kind
+        self.request_counts: dict[str, int] = {"current": 0, "comic": 0, "img": 0, "not_modified": 0}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+
+class FakeXkcdHandler(BaseHTTPRequestHandler):
+    server: FakeXkcdServer
+    protocol_version: str = "HTTP/1.1"
+    ## Headers & body are written separately, Nagle + delayed ACKs would add ~40ms to every keep-alive response
+    disable_nagle_algorithm: bool = True
+
+    def do_GET(self) -> None:
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        path: str = self.path.split("?")[0]
+
+        if match := COMIC_JSON_RE.match(path):
+            num: int = int(match.group(1) or self.server.num_comics)
+            kind: str = "comic" if match.group(1) else "current"
+
+            if not 1 <= num <= self.server.num_comics:
+                return self._send(404, b"Not Found", "text/plain")
+
+            body: bytes = json.dumps(build_comic(num, self.server.base_url)).encode("utf-8")
+
+            return self._send(200, body, "application/json", kind=kind)
+
+        if match := COMIC_IMG_RE.match(path):
+            num: int = int(match.group(1))
+
+            if not 1 <= num <= self.server.num_comics:
+                return self._send(404, b"Not Found", "text/plain")
+
+            return self._send(200, build_png(num, self.server.img_size), "image/png", kind="img")
+
+        self._send(404, b"Not Found", "text/plain")
+
+    def _send(self, status: int, body: bytes, content_type: str, kind: str | None = None) -> None:
+        etag: str = f'"{zlib.crc32(body):08x}"'
+
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.server.request_counts["not_modified"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+            return
+
+        if kind:
+            self.server.request_counts[kind] += 1
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", f"max-age={self.server.max_age}")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        return
+
+
+@contextmanager
+def run_fake_xkcd_server(num_comics: int = 500, img_size: int = 32 * 1024, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0) -> t.Generator[FakeXkcdServer, None, None]:
+    """Serve a fake XKCD site from a background thread for the duration of the `with` block.
+
+    Params:
+        num_comics (int): (default: 500) Number of comics served. The current comic is the last one.
+        img_size (int): (default: 32 KiB) Approximate size of each comic image.
+        latency (float): (default: 0.0) Seconds to wait before answering each request, to simulate the network.
+        host (str): (default: "127.0.0.1") Address to listen on.
+        port (int): (default: 0) Port to listen on. `0` picks a free port.
+
+    Returns:
+        (FakeXkcdServer): The running server. Use `.base_url` as the XKCD base URL.
+
+    """
+    server: FakeXkcdServer = FakeXkcdServer((host, port), num_comics=num_comics, img_size=img_size, latency=latency)
+    thread: threading.Thread = threading.Thread(target=server.serve_forever, name="fake-xkcd-server", daemon=True)
+    thread.start()
+
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for xkcd.com.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+    parser.add_argument("--num-comics", type=int, default=500, help="Number of comics to serve.")
+    parser.add_argument("--img-size", type=int, default=32 * 1024, help="Approximate size of each comic image, in bytes.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering each request.")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    with run_fake_xkcd_server(num_comics=args.num_comics, img_size=args.img_size, latency=args.latency, host=args.host, port=args.port) as server:
+        print(f"Serving fake xkcd.com at {server.base_url} (Ctrl+C to stop)")
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
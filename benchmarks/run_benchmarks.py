@@ -0,0 +1,271 @@
+"""Benchmark the XKCD API controllers & database saves against a local fake xkcd.com.
+
+Description:
+    Starts the fake server from `fake_xkcd_server.py`, points the XKCD API controllers at it with `base_url`,
+    and times:
+        - `XkcdApiController.get_comic_and_img()` with an empty cache (misses), a warm cache (hits) & no cache.
+        - `AsyncXkcdApiController.crawl_range()` with an empty & a warm cache.
+        - `save_multiple_comics_and_imgs_to_db()` on a fresh SQLite database (inserts) & again (existing rows).
+
+    The HTTP cache, validators database, app database & image store all live in a temporary directory, and the
+    HTTP rate limit is disabled, so runs do not touch the app's real data & only measure the code. Results can be
+    saved with `--output` and compared to a previous run with `--compare`, failing if any benchmark's throughput
+    dropped by more than `--max-regression`.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --num-comics 500 --output .benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare .benchmarks/baseline.json --max-regression 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import typing as t
+
+from fake_xkcd_server import run_fake_xkcd_server
+from loguru import logger as log
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the XKCD API controllers & database saves against a local fake xkcd.com.")
+    parser.add_argument("--num-comics", type=int, default=200, help="Number of comics to request & save in each benchmark.")
+    parser.add_argument("--img-size", type=int, default=32 * 1024, help="Approximate size of each comic image, in bytes.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the fake server waits before answering each request.")
+    parser.add_argument("--max-concurrency", type=int, default=25, help="Concurrent requests in the async crawl benchmarks.")
+    parser.add_argument("--batch-size", type=int, default=50, help="Comics per batch in the async crawl & database save benchmarks.")
+    parser.add_argument("--memory-cache", action="store_true", help="Put the in-process memory cache in front of the HTTP cache.")
+    parser.add_argument("--log-level", default="ERROR", help="Log level for the app's logs. Saving existing rows logs a warning for every batch.")
+    parser.add_argument("-b", "--benchmark", action="append", default=None, help="Only run benchmarks whose name contains this value. Can be passed multiple times.")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Save the results to this JSON file.")
+    parser.add_argument("--compare", type=Path, default=None, help="Compare the results to a JSON file saved with --output.")
+    parser.add_argument("--max-regression", type=float, default=None, help="With --compare, exit non-zero if a benchmark's ops/s dropped by more than this fraction, i.e. 0.2.")
+
+    return parser.parse_args()
+
+
+def configure_env(tmp_dir: Path, memory_cache: bool = False) -> None:
+    """Point the app's caches at `tmp_dir` & disable the rate limit. Must run before the app's modules are imported."""
+    os.environ["HTTP_CACHE_HTTP_CACHE_TYPE"] = "sqlite"
+    os.environ["HTTP_CACHE_HTTP_CACHE_DB_FILE"] = str(tmp_dir / "http" / "hishel.sqlite3")
+    os.environ["HTTP_CACHE_HTTP_CACHE_FILE_DIR"] = str(tmp_dir / "http" / "hishel")
+    os.environ["HTTP_CACHE_HTTP_VALIDATORS_DB_FILE"] = str(tmp_dir / "http" / "validators.sqlite3")
+    os.environ["HTTP_CACHE_HTTP_CACHE_MEMORY"] = "true" if memory_cache else "false"
+    ## The rate limit would measure the limiter, not the code
+    os.environ["HTTP_CACHE_HTTP_RATELIMIT_RATE"] = "0"
+
+
+class BenchmarkResult:
+    """Timings for one benchmark.
+
+    Params:
+        name (str): The benchmark's name.
+        ops (int): Number of operations (comics) the benchmark ran.
+        total_seconds (float): Wall time for all operations.
+        samples (list[float]): Per-operation (or per-batch) times in seconds, for latency percentiles.
+
+    """
+
+    def __init__(self, name: str, ops: int, total_seconds: float, samples: list[float] | None = None) -> None:
+        self.name: str = name
+        self.ops: int = ops
+        self.total_seconds: float = total_seconds
+        self.samples: list[float] = samples or []
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.ops / self.total_seconds if self.total_seconds else 0.0
+
+    def percentile(self, pct: float) -> float | None:
+        if len(self.samples) < 2:
+            return None
+
+        return statistics.quantiles(self.samples, n=100, method="inclusive")[int(pct) - 1]
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "ops": self.ops,
+            "total_seconds": round(self.total_seconds, 6),
+            "ops_per_second": round(self.ops_per_second, 3),
+            "p50_ms": None if self.percentile(50) is None else round(self.percentile(50) * 1000, 3),
+            "p95_ms": None if self.percentile(95) is None else round(self.percentile(95) * 1000, 3),
+        }
+
+
+def time_each(name: str, func: t.Callable[[int], t.Any], items: t.Sequence[int]) -> BenchmarkResult:
+    """Call `func` once per item, timing each call."""
+    samples: list[float] = []
+
+    start: float = time.perf_counter()
+    for item in items:
+        op_start: float = time.perf_counter()
+        func(item)
+        samples.append(time.perf_counter() - op_start)
+
+    return BenchmarkResult(name=name, ops=len(items), total_seconds=time.perf_counter() - start, samples=samples)
+
+
+def bench_sync_controller(base_url: str, comic_nums: list[int]) -> list[BenchmarkResult]:
+    from xkcdapi.controllers import XkcdApiController
+
+    results: list[BenchmarkResult] = []
+
+    with XkcdApiController(base_url=base_url) as api_ctl:
+        results.append(time_each("sync get_comic_and_img (cold cache)", api_ctl.get_comic_and_img, comic_nums))
+        results.append(time_each("sync get_comic_and_img (warm cache)", api_ctl.get_comic_and_img, comic_nums))
+
+    with XkcdApiController(base_url=base_url, use_cache=False) as api_ctl:
+        results.append(time_each("sync get_comic_and_img (no cache)", api_ctl.get_comic_and_img, comic_nums))
+
+    return results
+
+
+def bench_async_crawl(base_url: str, num_comics: int, max_concurrency: int, batch_size: int) -> list[BenchmarkResult]:
+    from xkcdapi.controllers import AsyncXkcdApiController
+
+    async def crawl(name: str) -> BenchmarkResult:
+        ## Each batch's time is a sample; throughput is what matters for a crawl
+        samples: list[float] = []
+        crawled: int = 0
+
+        async with AsyncXkcdApiController(base_url=base_url, max_concurrency=max_concurrency) as api_ctl:
+            start: float = time.perf_counter()
+            batch_start: float = start
+
+            async for comics, _ in api_ctl.crawl_range(start=1, end=num_comics, batch_size=batch_size):
+                crawled += len(comics)
+                samples.append(time.perf_counter() - batch_start)
+                batch_start = time.perf_counter()
+
+            total: float = time.perf_counter() - start
+
+        return BenchmarkResult(name=name, ops=crawled, total_seconds=total, samples=samples)
+
+    return [asyncio.run(crawl("async crawl_range (cold cache)")), asyncio.run(crawl("async crawl_range (warm cache)"))]
+
+
+def bench_db_save(base_url: str, comic_nums: list[int], batch_size: int, tmp_dir: Path) -> list[BenchmarkResult]:
+    import db_lib
+    import setup
+    import sqlalchemy as sa
+    from xkcdapi import db_client
+    from xkcdapi.controllers import XkcdApiController
+    from xkcdapi.image_store import LocalImageStore
+
+    ## Fetch the comics to save first, so only the database is timed
+    with XkcdApiController(base_url=base_url) as api_ctl:
+        fetched = [api_ctl.get_comic_and_img(comic_num) for comic_num in comic_nums]
+
+    batches = [fetched[i : i + batch_size] for i in range(0, len(fetched), batch_size)]
+
+    engine: sa.Engine = db_lib.get_engine(url=sa.make_url(f"sqlite+pysqlite:///{tmp_dir / 'db' / 'benchmark.sqlite3'}"))
+    setup.setup_database(engine=engine)
+    image_store: LocalImageStore = LocalImageStore(base_path=tmp_dir / "images")
+
+    def save_batches(name: str) -> BenchmarkResult:
+        samples: list[float] = []
+
+        start: float = time.perf_counter()
+        for batch in batches:
+            batch_start: float = time.perf_counter()
+            db_client.save_multiple_comics_and_imgs_to_db(comics=[comic for comic, _ in batch], comic_imgs=[img for _, img in batch], engine=engine, image_store=image_store)
+            samples.append(time.perf_counter() - batch_start)
+
+        return BenchmarkResult(name=name, ops=len(fetched), total_seconds=time.perf_counter() - start, samples=samples)
+
+    try:
+        return [save_batches("save_multiple_comics_and_imgs_to_db (new rows)"), save_batches("save_multiple_comics_and_imgs_to_db (existing rows)")]
+    finally:
+        engine.dispose()
+
+
+def print_results(results: list[BenchmarkResult], baseline: dict[str, dict] | None = None) -> None:
+    def fmt_ms(value: float | None) -> str:
+        return "-" if value is None else f"{value:.2f}"
+
+    print(f"{'benchmark':<52} {'ops':>6} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9}" + (f" {'vs baseline':>12}" if baseline else ""))
+
+    for result in results:
+        row: dict = result.to_dict()
+        line: str = f"{row['name']:<52} {row['ops']:>6} {row['ops_per_second']:>10.1f} {fmt_ms(row['p50_ms']):>9} {fmt_ms(row['p95_ms']):>9}"
+
+        if baseline:
+            previous: dict | None = baseline.get(result.name)
+            change: float | None = get_change(result, previous)
+            line += f" {'-' if change is None else f'{change:+.1%}':>12}"
+
+        print(line)
+
+
+def get_change(result: BenchmarkResult, previous: dict | None) -> float | None:
+    """Return the change in ops/s from a previous result, i.e. -0.25 for 25% slower."""
+    if not previous or not previous.get("ops_per_second"):
+        return None
+
+    return result.ops_per_second / previous["ops_per_second"] - 1
+
+
+def main(args: argparse.Namespace) -> int:
+    log.remove()
+    log.add(sys.stderr, level=args.log_level)
+
+    baseline: dict[str, dict] | None = None
+    if args.compare:
+        baseline = {row["name"]: row for row in json.loads(args.compare.read_text())["results"]}
+
+    with tempfile.TemporaryDirectory(prefix="xkcd-benchmarks-") as tmp:
+        tmp_dir: Path = Path(tmp)
+        configure_env(tmp_dir, memory_cache=args.memory_cache)
+
+        comic_nums: list[int] = list(range(1, args.num_comics + 1))
+
+        benchmarks: dict[str, t.Callable[[str], list[BenchmarkResult]]] = {
+            "sync": lambda base_url: bench_sync_controller(base_url, comic_nums),
+            "async": lambda base_url: bench_async_crawl(base_url, args.num_comics, args.max_concurrency, args.batch_size),
+            "save": lambda base_url: bench_db_save(base_url, comic_nums, args.batch_size, tmp_dir),
+        }
+        if args.benchmark:
+            benchmarks = {name: bench for name, bench in benchmarks.items() if any(b in name for b in args.benchmark)}
+
+        results: list[BenchmarkResult] = []
+
+        with run_fake_xkcd_server(num_comics=args.num_comics, img_size=args.img_size, latency=args.latency) as server:
+            for name, bench in benchmarks.items():
+                ## Every group starts with an empty HTTP cache
+                for cache_file in (tmp_dir / "http").glob("*.sqlite3*"):
+                    cache_file.unlink()
+
+                results.extend(bench(server.base_url))
+
+            print(f"Fake server requests: {server.request_counts}")
+
+    print_results(results, baseline=baseline)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"created": time.time(), "python": sys.version.split()[0], "num_comics": args.num_comics, "results": [r.to_dict() for r in results]}, indent=2))
+        print(f"Saved results to {args.output}")
+
+    if baseline and args.max_regression is not None:
+        regressed: list[str] = [r.name for r in results if (change := get_change(r, baseline.get(r.name))) is not None and change < -args.max_regression]
+
+        if regressed:
+            print(f"Throughput dropped by more than {args.max_regression:.0%} for: {', '.join(regressed)}")
+
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    sys.exit(main(args))
@@ -1,3 +1,3 @@
 from __future__ import annotations
 
-from .methods import get_hash_from_str
\ No newline at end of file
+from .methods import get_hash_from_str, get_hashes_from_strs
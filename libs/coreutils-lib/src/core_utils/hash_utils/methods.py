@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import typing as t
 
 from loguru import logger as log
 
@@ -51,7 +52,25 @@ def get_hash_from_str(input_str: str = None, encoding: str = "utf-8") -> str:
     return hash
 
 
-if __name__ == "__main__":
+
+def get_hashes_from_strs(input_strs: t.Iterable[t.Any], encoding: str = "utf-8") -> list[str]:
+    """Return the hash of many input strings at once, i.e. for bulk saves.
+
+    Description:
+        Returns the same hashes as `get_hash_from_str()`, without its per-item validation & error handling.
+        Non-str inputs are converted with `str()`.
+
+    Params:
+        input_strs (Iterable[Any]): The strings to hash.
+        encoding (str): The character encoding to use
+
+    Returns:
+        (list[str]): The hash of each input string, in input order.
+
+    """
+    md5 = hashlib.md5
+
+    return [md5(str(input_str).encode(encoding)).hexdigest() for input_str in input_strs]
     log.info(f"Hashlib demo start")
 
     _str: str = (
@@ -0,0 +1,15 @@
+"""Counters & histograms rendered in the Prometheus text exposition format, served over HTTP or dumped to a file."""
+
+from __future__ import annotations
+
+from .classes import DEFAULT_BUCKETS, Counter, Histogram, MetricsRegistry
+from .methods import (
+    REGISTRY,
+    counter,
+    get_registry,
+    histogram,
+    render_metrics,
+    start_metrics_server,
+    timed,
+    write_metrics,
+)
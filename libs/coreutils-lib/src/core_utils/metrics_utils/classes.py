@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import abc
+import math
+import threading
+import typing as t
+
+## Default histogram buckets, in seconds. Spans cache hits (sub-millisecond) to slow downloads & Celery tasks
+DEFAULT_BUCKETS: t.Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+
+    if float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    escaped: list[str] = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        escaped.append(f'{name}="{value}"')
+
+    return "{" + ",".join(escaped) + "}"
+
+
+class _Metric(abc.ABC):
+    """Base class for a metric family with a fixed set of label names."""
+
+    type_name: str = "untyped"
+
+    def __init__(self, name: str, help: str = "", labelnames: t.Sequence[str] = ()) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.labelnames: t.Tuple[str, ...] = tuple(labelnames)
+
+        ## Samples, by label values. Subclasses decide what each value holds
+        self._values: dict[t.Tuple[str, ...], t.Any] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _label_values(self, labels: dict[str, t.Any]) -> t.Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric '{self.name}' expects labels {list(self.labelnames)}, got {list(labels)}")
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def reset_lock(self) -> None:
+        """Replace the lock, i.e. in a forked child where another thread may have held it at fork time."""
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Drop every sample, i.e. in a forked child that should not report its parent's values again."""
+        with self._lock:
+            self._values.clear()
+
+    @abc.abstractmethod
+    def _samples(self) -> t.Iterator[t.Tuple[str, dict[str, str], float]]:
+        """Yield each sample's name, labels & value, in the order they are rendered."""
+
+    def render(self, const_labels: dict[str, str] | None = None) -> str:
+        """Render the metric family in the Prometheus text exposition format."""
+        lines: list[str] = [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+        for sample_name, labels, value in self._samples():
+            if const_labels:
+                labels = {**const_labels, **labels}
+
+            lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """A value that only goes up, i.e. requests sent or bytes downloaded.
+
+    Usage:
+        requests = Counter("http_requests_total", "Requests sent.", labelnames=("kind",))
+        requests.inc(kind="comic")
+    """
+
+    type_name: str = "counter"
+
+    _values: dict[t.Tuple[str, ...], float]
+
+    def inc(self, amount: float = 1, **labels: t.Any) -> None:
+        if amount < 0:
+            raise ValueError(f"Counter '{self.name}' can only be incremented by a positive amount.")
+
+        key: t.Tuple[str, ...] = self._label_values(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: t.Any) -> float:
+        return self._values.get(self._label_values(labels), 0)
+
+    def _samples(self) -> t.Iterator[t.Tuple[str, dict[str, str], float]]:
+        with self._lock:
+            values: list = sorted(self._values.items())
+
+        for key, value in values:
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram(_Metric):
+    """Count observations (i.e. durations in seconds) into cumulative buckets, with their sum & count.
+
+    Usage:
+        latency = Histogram("http_request_duration_seconds", "Request latency.", labelnames=("kind",))
+        latency.observe(0.25, kind="comic")
+    """
+
+    type_name: str = "histogram"
+
+    ## Per label set: [bucket counts (not cumulative)..., sum, count]
+    _values: dict[t.Tuple[str, ...], list[float]]
+
+    def __init__(self, name: str, help: str = "", labelnames: t.Sequence[str] = (), buckets: t.Sequence[float] = DEFAULT_BUCKETS) -> None:
+        if "le" in labelnames:
+            raise ValueError("Histograms cannot have an 'le' label.")
+
+        super().__init__(name=name, help=help, labelnames=labelnames)
+
+        self.buckets: t.Tuple[float, ...] = tuple(sorted(buckets))
+        if not self.buckets or self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+
+    def observe(self, value: float, **labels: t.Any) -> None:
+        key: t.Tuple[str, ...] = self._label_values(labels)
+
+        with self._lock:
+            values: list[float] | None = self._values.get(key)
+            if values is None:
+                values = [0] * (len(self.buckets) + 2)
+                self._values[key] = values
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    values[i] += 1
+                    break
+
+            values[-2] += value
+            values[-1] += 1
+
+    def get_count(self, **labels: t.Any) -> float:
+        values: list[float] | None = self._values.get(self._label_values(labels))
+
+        return values[-1] if values else 0
+
+    def get_sum(self, **labels: t.Any) -> float:
+        values: list[float] | None = self._values.get(self._label_values(labels))
+
+        return values[-2] if values else 0
+
+    def _samples(self) -> t.Iterator[t.Tuple[str, dict[str, str], float]]:
+        with self._lock:
+            values: list = sorted((key, list(value)) for key, value in self._values.items())
+
+        for key, value in values:
+            labels: dict[str, str] = dict(zip(self.labelnames, key))
+
+            cumulative: float = 0
+            for bound, count in zip(self.buckets, value):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+
+            yield f"{self.name}_sum", labels, value[-2]
+            yield f"{self.name}_count", labels, value[-1]
+
+
+class MetricsRegistry:
+    """A named collection of metrics, rendered together in the Prometheus text format.
+
+    Description:
+        Metrics are created with `counter()`/`histogram()`, which return the existing metric when one with the same
+        name was already registered, so modules can declare the metrics they use at import time.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _register(self, metric_cls: type, name: str, **kwargs: t.Any) -> t.Any:
+        with self._lock:
+            metric: _Metric | None = self._metrics.get(name)
+
+            if metric is None:
+                metric = metric_cls(name=name, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.type_name}.")
+
+        return metric
+
+    def counter(self, name: str, help: str = "", labelnames: t.Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help=help, labelnames=labelnames)
+
+    def histogram(self, name: str, help: str = "", labelnames: t.Sequence[str] = (), buckets: t.Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help=help, labelnames=labelnames, buckets=buckets)
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def reset_locks(self) -> None:
+        """Replace every lock, i.e. in a forked child where another thread may have held one at fork time."""
+        self._lock = threading.Lock()
+
+        for metric in self._metrics.values():
+            metric.reset_lock()
+
+    def reset_after_fork(self) -> None:
+        """Replace every lock & drop every sample in a forked child.
+
+        Description:
+            A forked child starts with a copy of its parent's samples. Each process reports its own metrics (i.e. a
+            file per Celery worker process), so without clearing them the parent's values would be counted again for
+            every child.
+        """
+        self.reset_locks()
+
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self, const_labels: dict[str, str] | None = None) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Params:
+            const_labels (dict[str, str] | None): Labels added to every sample, i.e. `{"pid": "1234"}` when each
+                worker process writes its own file.
+
+        """
+        with self._lock:
+            metrics: list[_Metric] = [self._metrics[name] for name in sorted(self._metrics)]
+
+        return "\n".join(metric.render(const_labels=const_labels) for metric in metrics) + "\n"
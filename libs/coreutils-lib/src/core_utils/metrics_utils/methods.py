@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+from pathlib import Path
+import threading
+import time
+import typing as t
+
+from .classes import DEFAULT_BUCKETS, Counter, Histogram, MetricsRegistry
+
+from loguru import logger as log
+
+## Process-wide registry the app's metrics are declared in
+REGISTRY: MetricsRegistry = MetricsRegistry()
+
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def get_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return REGISTRY
+
+
+def counter(name: str, help: str = "", labelnames: t.Sequence[str] = ()) -> Counter:
+    """Return the counter `name` from the process-wide registry, creating it on first use.
+
+    Params:
+        name (str): The metric's name, i.e. "xkcd_http_downloaded_bytes_total".
+        help (str): Description shown in the metric's `# HELP` line.
+        labelnames (Sequence[str]): Names of the labels every sample must set, i.e. `("kind",)`.
+
+    Returns:
+        (Counter): The registered counter.
+
+    """
+    return REGISTRY.counter(name=name, help=help, labelnames=labelnames)
+
+
+def histogram(name: str, help: str = "", labelnames: t.Sequence[str] = (), buckets: t.Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Return the histogram `name` from the process-wide registry, creating it on first use.
+
+    Params:
+        name (str): The metric's name, i.e. "xkcd_http_request_duration_seconds".
+        help (str): Description shown in the metric's `# HELP` line.
+        labelnames (Sequence[str]): Names of the labels every sample must set.
+        buckets (Sequence[float]): Upper bounds of the histogram's buckets. Defaults to 0.5ms-300s.
+
+    Returns:
+        (Histogram): The registered histogram.
+
+    """
+    return REGISTRY.histogram(name=name, help=help, labelnames=labelnames, buckets=buckets)
+
+
+@contextmanager
+def timed(metric: Histogram, **labels: t.Any) -> t.Generator[None, None, None]:
+    """Observe the time spent in the `with` block, in seconds, on `metric`.
+
+    Usage:
+        with timed(DB_SAVE_SECONDS, function="save_comic_to_db"):
+            ...
+    """
+    start: float = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        metric.observe(time.perf_counter() - start, **labels)
+
+
+def render_metrics(const_labels: dict[str, str] | None = None) -> str:
+    """Render the process-wide registry in the Prometheus text exposition format.
+
+    Params:
+        const_labels (dict[str, str] | None): Labels added to every sample.
+
+    Returns:
+        (str): The rendered metrics.
+
+    """
+    return REGISTRY.render(const_labels=const_labels)
+
+
+def write_metrics(path: t.Union[str, Path], const_labels: dict[str, str] | None = None) -> Path:
+    """Dump the process-wide registry to a Prometheus text file, i.e. for node_exporter's textfile collector.
+
+    Description:
+        The file is written to a temporary file & renamed into place, so a scraper never reads a partial file.
+
+    Params:
+        path (str | Path): The file to write, i.e. ".metrics/worker.prom".
+        const_labels (dict[str, str] | None): Labels added to every sample, i.e. `{"pid": str(os.getpid())}` when
+            several processes write to the same directory.
+
+    Returns:
+        (Path): The path written to.
+
+    """
+    path: Path = Path(str(path))
+
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path: Path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(render_metrics(const_labels=const_labels))
+    os.replace(tmp_path, path)
+
+    return path
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+
+            return
+
+        body: bytes = render_metrics().encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        log.debug(f"Metrics request: {format % args}")
+
+
+def start_metrics_server(port: int = 9464, addr: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve the process-wide registry at `http://<addr>:<port>/metrics` from a background thread.
+
+    Description:
+        Only one process can bind a port, so use this for single-process apps. Celery workers with several
+        processes should dump files with `write_metrics()` instead.
+
+    Params:
+        port (int): (default: 9464) The port to listen on.
+        addr (str): (default: "0.0.0.0") The address to listen on.
+
+    Returns:
+        (ThreadingHTTPServer): The running server. Call `.shutdown()` to stop it.
+
+    """
+    server: ThreadingHTTPServer = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    server.daemon_threads = True
+
+    thread: threading.Thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+
+    log.info(f"Serving metrics at http://{addr}:{port}/metrics")
+
+    return server
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=REGISTRY.reset_after_fork)
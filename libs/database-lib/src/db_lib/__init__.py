@@ -11,4 +11,10 @@ from .__methods import (
 )
 from .base import Base
 from .mixins import TableNameMixin, TimestampMixin
+from .registry import (
+    clear_engine_registry,
+    dispose_engines,
+    get_cached_engine,
+    get_cached_session_pool,
+)
 from .utils import backup_sqlite_db, dump_sqlite_db_schema
@@ -92,7 +92,24 @@ def get_engine(
     hide_parameters: bool = False,
     echo: bool = False,
     query_cache_size: int = 500,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_pre_ping: bool = False,
+    pool_recycle: int | None = None,
 ) -> sa.Engine:
+    ## Only pass pool options that were set, SQLite's default pools do not accept all of them
+    pool_kwargs: dict = {
+        k: v
+        for k, v in {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_recycle": pool_recycle,
+        }.items()
+        if v is not None
+    }
+    if pool_pre_ping:
+        pool_kwargs["pool_pre_ping"] = True
+
     engine = sa.create_engine(
         pool=pool,
         logging_name=logging_name,
@@ -101,6 +118,7 @@ def get_engine(
         echo=echo,
         hide_parameters=hide_parameters,
         query_cache_size=query_cache_size,
+        **pool_kwargs,
     )
 
     return engine
@@ -9,6 +9,9 @@ import sqlalchemy.orm as so
 ## Generic type representing an instance of a class
 T = t.TypeVar("T")
 
+## Maximum number of bound parameters per statement for dialects with a native upsert
+UPSERT_MAX_BIND_PARAMS: dict[str, int] = {"sqlite": 32766, "postgresql": 65535}
+
 
 class Base(so.DeclarativeBase):
     pass
@@ -59,6 +62,118 @@ class BaseRepository(t.Generic[T]):
             self.session.rollback()
             raise RuntimeError(f"Failed to create objects: {exc}")
 
+    def upsert_all(
+        self,
+        rows: list[dict],
+        index_elements: list[str],
+        update_columns: list[str] | None = None,
+        chunk_size: int = 1000,
+        commit: bool = True,
+    ) -> list[dict]:
+        """Insert many rows, skipping (or updating) rows that conflict on a unique constraint.
+
+        Description:
+            On SQLite & PostgreSQL, each chunk is written with one `INSERT ... ON CONFLICT` statement &
+            the written rows are read back with `RETURNING`, so no per-row refresh is needed. Other dialects
+            fall back to selecting the existing keys & inserting the remaining rows.
+
+            Rows are returned as dicts rather than ORM objects, so they stay readable after the commit.
+
+        Params:
+            rows (list[dict]): Column name/value mappings to insert. All rows must have the same keys.
+            index_elements (list[str]): The columns of the unique constraint to detect conflicts on.
+            update_columns (list[str] | None): Columns to overwrite when a row conflicts. When `None`,
+                conflicting rows are skipped & not returned.
+            chunk_size (int): (default: 1000) Maximum number of rows written per statement.
+            commit (bool): (default: True) Commit the session after writing. Pass `False` to write more rows in
+                the same transaction; the caller is then responsible for committing or rolling back.
+
+        Returns:
+            (list[dict]): The inserted (and updated) rows, including primary keys.
+
+        """
+        if not rows:
+            return []
+
+        dialect: str = self.session.get_bind().dialect.name
+        table: sa.Table = self.model.__table__
+
+        try:
+            if dialect in UPSERT_MAX_BIND_PARAMS:
+                ## Keep each statement under the dialect's bound parameter limit
+                chunk_size = max(
+                    1, min(chunk_size, UPSERT_MAX_BIND_PARAMS[dialect] // len(rows[0]))
+                )
+
+                if dialect == "sqlite":
+                    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+                else:
+                    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+                written: list[dict] = []
+
+                for i in range(0, len(rows), chunk_size):
+                    stmt = dialect_insert(table).values(rows[i : i + chunk_size])
+
+                    if update_columns:
+                        stmt = stmt.on_conflict_do_update(
+                            index_elements=index_elements,
+                            set_={c: stmt.excluded[c] for c in update_columns},
+                        )
+                    else:
+                        stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+                    result = self.session.execute(stmt.returning(*table.columns))
+                    written.extend(dict(r) for r in result.mappings())
+            else:
+                written = self._insert_missing(
+                    rows=rows, index_elements=index_elements, chunk_size=chunk_size
+                )
+
+            if commit:
+                self.session.commit()
+
+            return written
+        except Exception as exc:
+            self.session.rollback()
+            raise RuntimeError(f"Failed to upsert objects: {exc}")
+
+    def _insert_missing(
+        self, rows: list[dict], index_elements: list[str], chunk_size: int
+    ) -> list[dict]:
+        """Insert rows whose `index_elements` values are not already in the table (dialects without ON CONFLICT)."""
+        table: sa.Table = self.model.__table__
+        key_cols: list[sa.Column] = [table.c[c] for c in index_elements]
+
+        def row_key(row) -> tuple:
+            return tuple(row[c] for c in index_elements)
+
+        existing_keys: set[tuple] = set()
+        for i in range(0, len(rows), chunk_size):
+            keys: list[tuple] = [row_key(r) for r in rows[i : i + chunk_size]]
+            existing_keys.update(
+                tuple(r)
+                for r in self.session.execute(
+                    sa.select(*key_cols).where(sa.tuple_(*key_cols).in_(keys))
+                )
+            )
+
+        new_rows: list[dict] = [r for r in rows if row_key(r) not in existing_keys]
+        if not new_rows:
+            return []
+
+        self.session.execute(sa.insert(table), new_rows)
+
+        written: list[dict] = []
+        for i in range(0, len(new_rows), chunk_size):
+            keys = [row_key(r) for r in new_rows[i : i + chunk_size]]
+            result = self.session.execute(
+                sa.select(table).where(sa.tuple_(*key_cols).in_(keys))
+            )
+            written.extend(dict(r) for r in result.mappings())
+
+        return written
+
     def get(self, id: int) -> t.Optional[T]:
         return self.session.get(self.model, id)
 
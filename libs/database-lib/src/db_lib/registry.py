@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import typing as t
+
+log = logging.getLogger(__name__)
+
+from .__methods import get_engine, get_session_pool
+
+import sqlalchemy as sa
+import sqlalchemy.orm as so
+
+## Engines & session pools memoized for the life of the process
+_ENGINES: dict[tuple, sa.Engine] = {}
+_SESSION_POOLS: dict[sa.Engine, so.sessionmaker[so.Session]] = {}
+_REGISTRY_LOCK: threading.Lock = threading.Lock()
+
+
+def _engine_key(
+    url: sa.URL | str,
+    echo: bool,
+    pool_size: int | None,
+    max_overflow: int | None,
+    pool_pre_ping: bool,
+    pool_recycle: int | None,
+) -> tuple:
+    """Build the registry key for an engine from its URL & pool options."""
+    if isinstance(url, sa.URL):
+        url = url.render_as_string(hide_password=False)
+
+    return (str(url), echo, pool_size, max_overflow, pool_pre_ping, pool_recycle)
+
+
+def get_cached_engine(
+    url: sa.URL | str,
+    echo: bool = False,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_pre_ping: bool = False,
+    pool_recycle: int | None = None,
+) -> sa.Engine:
+    """Return the process-wide SQLAlchemy `Engine` for a URL, creating it on first use.
+
+    Description:
+        Engines own a connection pool, so building one per call opens a new pool (and new database
+        connections) each time. This function memoizes one engine per URL & pool configuration.
+
+        Pool sizing options are ignored for SQLite URLs, which use SQLAlchemy's default SQLite pools.
+
+    Params:
+        url (sqlalchemy.URL | str): The database URL.
+        echo (bool): Echo SQL statements to the console.
+        pool_size (int | None): Number of connections kept open in the pool.
+        max_overflow (int | None): Number of connections allowed above `pool_size`.
+        pool_pre_ping (bool): Test connections before handing them out of the pool.
+        pool_recycle (int | None): Recycle connections older than this many seconds.
+
+    Returns:
+        (sqlalchemy.Engine): A memoized SQLAlchemy `Engine`.
+
+    """
+    if url is None:
+        raise ValueError("url cannot be None")
+
+    if sa.make_url(url).get_backend_name() == "sqlite":
+        pool_size = None
+        max_overflow = None
+        pool_recycle = None
+
+    key: tuple = _engine_key(
+        url=url,
+        echo=echo,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+    )
+
+    engine: sa.Engine | None = _ENGINES.get(key)
+    if engine is not None:
+        return engine
+
+    with _REGISTRY_LOCK:
+        ## Another thread may have created the engine while waiting on the lock
+        engine = _ENGINES.get(key)
+        if engine is not None:
+            return engine
+
+        log.debug(f"Creating SQLAlchemy engine for '{sa.make_url(url).render_as_string()}'")
+        engine = get_engine(
+            url=url,
+            echo=echo,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
+        )
+        _ENGINES[key] = engine
+
+    return engine
+
+
+def get_cached_session_pool(engine: sa.Engine) -> so.sessionmaker[so.Session]:
+    """Return the process-wide `sessionmaker` bound to an engine, creating it on first use.
+
+    Params:
+        engine (sqlalchemy.Engine): The engine the session pool is bound to.
+
+    Returns:
+        (sqlalchemy.orm.sessionmaker): A memoized SQLAlchemy `Session` pool.
+
+    """
+    session_pool: so.sessionmaker[so.Session] | None = _SESSION_POOLS.get(engine)
+    if session_pool is not None:
+        return session_pool
+
+    with _REGISTRY_LOCK:
+        session_pool = _SESSION_POOLS.get(engine)
+        if session_pool is None:
+            session_pool = get_session_pool(engine=engine)
+            _SESSION_POOLS[engine] = session_pool
+
+    return session_pool
+
+
+def dispose_engines(close: bool = True) -> None:
+    """Dispose the connection pool of every registered engine.
+
+    Params:
+        close (bool): (default: True) Close the pooled connections. Pass `False` in a forked child
+            process, where the connections belong to the parent & must not be closed by the child.
+
+    """
+    for engine in list(_ENGINES.values()):
+        try:
+            engine.dispose(close=close)
+        except Exception as exc:
+            log.warning(f"({type(exc)}) Error disposing engine. Details: {exc}")
+
+
+def clear_engine_registry() -> None:
+    """Dispose & forget every registered engine & session pool."""
+    with _REGISTRY_LOCK:
+        dispose_engines(close=True)
+
+        _ENGINES.clear()
+        _SESSION_POOLS.clear()
+
+
+def _dispose_engines_after_fork() -> None:
+    """Drop connections inherited from the parent process (i.e. Celery prefork workers)."""
+    global _REGISTRY_LOCK
+
+    ## The lock may have been held by another thread at fork time
+    _REGISTRY_LOCK = threading.Lock()
+
+    dispose_engines(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_engines_after_fork)
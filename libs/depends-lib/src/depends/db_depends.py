@@ -67,34 +67,65 @@ def get_db_uri(
         return db_uri
 
 
-def get_db_engine(db_uri: sa.URL = get_db_uri(), echo: bool = False) -> sa.Engine:
+def get_db_engine(db_uri: sa.URL | None = None, echo: bool = False, cached: bool = True) -> sa.Engine:
     """Construct a SQLAlchemy `Engine` for a database connection.
 
+    Description:
+        By default, engines are memoized per URL for the life of the process (see `db_lib.get_cached_engine()`),
+        so repeated calls share one connection pool. Pool options are read from the database settings:
+        `DB_POOL_SIZE`, `DB_MAX_OVERFLOW`, `DB_POOL_PRE_PING` & `DB_POOL_RECYCLE`.
+
     Params:
-        db_uri (sa.URL): A SQLAlchemy `URL` for a database connection.
+        db_uri (sa.URL | None): A SQLAlchemy `URL` for a database connection. When `None`, the URL
+            is built from the app's database settings.
         echo (bool): Echo SQL statements to the console.
+        cached (bool): (default: True) Return the process-wide engine for the URL. When `False`, a new
+            `Engine` (and connection pool) is created.
 
     Returns:
         (sa.Engine): A SQLAlchemy `Engine`
 
     """
-    engine: sa.Engine = db.get_engine(url=db_uri, echo=echo)
+    if db_uri is None:
+        db_uri = get_db_uri()
+
+    pool_options: dict = {
+        "pool_size": DB_SETTINGS.get("DB_POOL_SIZE", default=None),
+        "max_overflow": DB_SETTINGS.get("DB_MAX_OVERFLOW", default=None),
+        "pool_pre_ping": DB_SETTINGS.get("DB_POOL_PRE_PING", default=True),
+        "pool_recycle": DB_SETTINGS.get("DB_POOL_RECYCLE", default=None),
+    }
+
+    if cached:
+        engine: sa.Engine = db.get_cached_engine(url=db_uri, echo=echo, **pool_options)
+    else:
+        if db_uri.get_backend_name() == "sqlite":
+            pool_options = {"pool_pre_ping": pool_options["pool_pre_ping"]}
+
+        engine: sa.Engine = db.get_engine(url=db_uri, echo=echo, **pool_options)
 
     return engine
 
 
 def get_session_pool(
-    engine: sa.Engine = get_db_engine(),
+    engine: sa.Engine | None = None,
 ) -> so.sessionmaker[so.Session]:
     """Construct a SQLAlchemy `Session` pool for a database connection.
 
+    Description:
+        Session pools are memoized per engine, so repeated calls with the same engine return the same `sessionmaker`.
+
     Params:
-        engine (sa.Engine): A SQLAlchemy `Engine` for a database connection.
+        engine (sa.Engine | None): A SQLAlchemy `Engine` for a database connection. When `None`, an
+            `Engine` is built from the app's database settings.
 
     Returns:
         (so.sessionmaker[so.Session]): A SQLAlchemy `Session` pool
 
     """
-    session: so.sessionmaker[so.Session] = db.get_session_pool(engine=engine)
+    if engine is None:
+        engine = get_db_engine()
+
+    session: so.sessionmaker[so.Session] = db.get_cached_session_pool(engine=engine)
 
     return session
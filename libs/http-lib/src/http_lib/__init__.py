@@ -1,5 +1,19 @@
 from __future__ import annotations
 
-from . import cache, client, constants, controllers
-from .client import build_request, decode_response, encode_data, save_json
-from .controllers import HttpxController, get_http_controller, merge_headers
+from . import cache, client, constants, controllers, ratelimit, validators
+from .client import build_request, decode_response, encode_data, loads_json, save_json
+from .controllers import (
+    AsyncHttpxController,
+    HttpxController,
+    get_async_http_controller,
+    get_http_controller,
+    merge_headers,
+)
+from .ratelimit import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RateLimiter,
+    RetryPolicy,
+    get_rate_limiter,
+)
+from .validators import Validators, ValidatorStore, get_validator_store
@@ -1,23 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+import datetime as dt
+import importlib.util
+import os
 from pathlib import Path
 import sqlite3
+import threading
+import time
 import typing as t
 
 import hishel
+import httpcore
 import httpx
 
 def get_sqlite_cache_storage(
-    cache_db_path: str = ".cache/http/hishel.sqlite3", ttl=900
-) -> hishel.SQLiteStorage:
-    """Get a hishel.SQLiteStorage cache.
+    cache_db_path: str = ".cache/http/hishel.sqlite3",
+    ttl=900,
+    busy_timeout: float = 30.0,
+    check_ttl_every: float = 60,
+) -> SQLiteCacheStorage:
+    """Get a SQLiteCacheStorage cache.
+
+    Description:
+        The storage opens the database in WAL mode with one connection per thread, so the Celery worker processes
+        (& the threads in each) on a host can share one cache database. See `SQLiteCacheStorage`.
 
     Params:
         cache_db_path (str): The path where the SQLite database file will be saved.
         ttl (int): (default: 900) Amount of time, in seconds, for cached items to live.
+        busy_timeout (float): (default: 30.0) Seconds to wait for another process's write lock before failing.
+        check_ttl_every (float): (default: 60) Interval in seconds to delete expired cached items.
 
     Returns:
-        (hishel.SQLiteStorage): An initialized SQLiteStorage object.
+        (SQLiteCacheStorage): An initialized SQLiteCacheStorage object.
 
     """
     ## Ensure database filename ends with a valid SQLite file extension
@@ -29,10 +48,67 @@ def get_sqlite_cache_storage(
     if not cache_dir.exists():
         cache_dir.mkdir(parents=True, exist_ok=True)
 
-    ## Get sqlite3 connection to cache database
-    conn: sqlite3.Connection = sqlite3.connect(database=cache_db_path)
-    ## Create SQLiteStorage object using sqlite3 connection
-    storage: hishel.SQLiteStorage = hishel.SQLiteStorage(connection=conn, ttl=ttl)
+    ## Create storage, connections are opened by each thread on first use
+    storage: SQLiteCacheStorage = SQLiteCacheStorage(
+        db_file=cache_db_path,
+        ttl=ttl,
+        busy_timeout=busy_timeout,
+        check_ttl_every=check_ttl_every,
+    )
+
+    return storage
+
+
+def get_redis_cache_storage(
+    redis_url: str = "redis://localhost:6379/0", ttl: int | None = 900
+) -> hishel.RedisStorage:
+    """Get a hishel.RedisStorage cache.
+
+    Description:
+        Every process using the same Redis server shares one cache, i.e. all Celery workers pointed at the result
+        backend. Cached responses expire in Redis after `ttl` seconds. Requires the `redis` package.
+
+    Params:
+        redis_url (str): (default: "redis://localhost:6379/0") URL of the Redis server to cache responses in.
+        ttl (int | None): (default: 900) Amount of time, in seconds, for cached items to live.
+
+    Returns:
+        (hishel.RedisStorage): An initialized RedisStorage object.
+
+    """
+    if not importlib.util.find_spec("redis"):
+        raise ImportError("The Redis HTTP cache requires the 'redis' package.")
+
+    import redis
+
+    storage: hishel.RedisStorage = hishel.RedisStorage(
+        client=redis.Redis.from_url(redis_url), ttl=ttl
+    )
+
+    return storage
+
+
+def get_async_redis_cache_storage(
+    redis_url: str = "redis://localhost:6379/0", ttl: int | None = 900
+) -> hishel.AsyncRedisStorage:
+    """Get a hishel.AsyncRedisStorage cache.
+
+    Params:
+        redis_url (str): (default: "redis://localhost:6379/0") URL of the Redis server to cache responses in.
+        ttl (int | None): (default: 900) Amount of time, in seconds, for cached items to live.
+
+    Returns:
+        (hishel.AsyncRedisStorage): An initialized AsyncRedisStorage object.
+
+    """
+    if not importlib.util.find_spec("redis"):
+        raise ImportError("The Redis HTTP cache requires the 'redis' package.")
+
+    import redis.asyncio
+
+    storage: hishel.AsyncRedisStorage = hishel.AsyncRedisStorage(
+        client=redis.asyncio.Redis.from_url(redis_url), ttl=ttl
+    )
 
     return storage
 
@@ -104,11 +180,9 @@ def get_cache_controller(
 
 
 def get_cache_transport(
-    transport_base: httpx.HTTPTransport = httpx.HTTPTransport(),
-    cache_storage: t.Union[
-        hishel.SQLiteStorage, hishel.FileStorage
-    ] = get_sqlite_cache_storage(),
-    cache_controller: hishel.Controller = get_cache_controller(),
+    transport_base: httpx.HTTPTransport | None = None,
+    cache_storage: hishel.BaseStorage | None = None,
+    cache_controller: hishel.Controller | None = None,
 ) -> hishel.CacheTransport:
     """Build & return a hishel.CacheTransport for httpx client.
 
@@ -120,19 +194,772 @@ def get_cache_transport(
         & more.
 
     Params:
-        trasport_base (httpx.HTTPTransport): The base transport object to append a cache storage & controller to.
-        cache_storage (hishel.SQLiteStorage | hishel.FileStorage): The cache storage to use for requests made using a client
-            with this transport mounted.
-        cache_controller (hishel.Controller): The cache controller that handles responses from HTTP requests made using a client
-            with this transport mounted.
+        trasport_base (httpx.HTTPTransport | None): The base transport object to append a cache storage & controller to.
+            When `None`, a new `httpx.HTTPTransport` is created.
+        cache_storage (hishel.BaseStorage | None): The cache storage to use for requests made using a client
+            with this transport mounted. When `None`, a default SQLite storage is created.
+        cache_controller (hishel.Controller | None): The cache controller that handles responses from HTTP requests made using a client
+            with this transport mounted. When `None`, a default controller is created.
 
     Returns:
         (hishel.CacheTransport): An initialized hishel.CacheTransport HTTP transport.
 
     """
+    ## Build defaults when called, not at import, so importing http_lib does not open the cache database
+    if transport_base is None:
+        transport_base = httpx.HTTPTransport()
+    if cache_storage is None:
+        cache_storage = get_sqlite_cache_storage()
+    if cache_controller is None:
+        cache_controller = get_cache_controller()
+
     ## Build cache transport
     transport: hishel.CacheTransport = hishel.CacheTransport(
         transport=transport_base, storage=cache_storage, controller=cache_controller
     )
 
     return transport
+
+
+def get_async_sqlite_cache_storage(
+    cache_db_path: str = ".cache/http/hishel.sqlite3",
+    ttl=900,
+    busy_timeout: float = 30.0,
+    check_ttl_every: float = 60,
+) -> AsyncSQLiteCacheStorage:
+    """Get an AsyncSQLiteCacheStorage cache.
+
+    Description:
+        The async storage reads & writes the same database as `get_sqlite_cache_storage()`, so the sync & async
+        controllers share cached responses. See `AsyncSQLiteCacheStorage`.
+
+    Params:
+        cache_db_path (str): The path where the SQLite database file will be saved.
+        ttl (int): (default: 900) Amount of time, in seconds, for cached items to live.
+        busy_timeout (float): (default: 30.0) Seconds to wait for another process's write lock before failing.
+        check_ttl_every (float): (default: 60) Interval in seconds to delete expired cached items.
+
+    Returns:
+        (AsyncSQLiteCacheStorage): An initialized AsyncSQLiteCacheStorage object.
+
+    """
+    storage: AsyncSQLiteCacheStorage = AsyncSQLiteCacheStorage(
+        storage=get_sqlite_cache_storage(
+            cache_db_path=cache_db_path,
+            ttl=ttl,
+            busy_timeout=busy_timeout,
+            check_ttl_every=check_ttl_every,
+        )
+    )
+
+    return storage
+
+
+def get_async_file_cache_storage(
+    base_path: str = ".cache/http/hishel", ttl: int = 900, check_ttl_every: float = 60
+) -> hishel.AsyncFileStorage:
+    """Get a hishel.AsyncFileStorage cache.
+
+    Params:
+        base_path (str): The path where file caches will be saved.
+        ttl (int): (default: 900) Amount of time, in seconds, for cached items to live.
+        check_ttl_every (int): (default: 60) Interval in seconds to check cached item ttl.
+
+    Returns:
+        (hishel.AsyncFileStorage): An initialized AsyncFileStorage object.
+
+    """
+    ## Ensure cache directory exists
+    if not Path(base_path).exists():
+        Path(base_path).mkdir(parents=True, exist_ok=True)
+
+    storage: hishel.AsyncFileStorage = hishel.AsyncFileStorage(
+        base_path=base_path, ttl=ttl, check_ttl_every=check_ttl_every
+    )
+
+    return storage
+
+
+def get_async_cache_transport(
+    transport_base: httpx.AsyncHTTPTransport,
+    cache_storage: t.Union[AsyncSQLiteCacheStorage, hishel.AsyncFileStorage],
+    cache_controller: hishel.Controller,
+) -> hishel.AsyncCacheTransport:
+    """Build & return a hishel.AsyncCacheTransport for an httpx.AsyncClient.
+
+    Params:
+        transport_base (httpx.AsyncHTTPTransport): The base async transport to append a cache storage & controller to.
+        cache_storage (AsyncSQLiteCacheStorage | hishel.AsyncFileStorage): The async cache storage to use.
+        cache_controller (hishel.Controller): The cache controller that handles responses from HTTP requests.
+
+    Returns:
+        (hishel.AsyncCacheTransport): An initialized hishel.AsyncCacheTransport HTTP transport.
+
+    """
+    transport: hishel.AsyncCacheTransport = hishel.AsyncCacheTransport(
+        transport=transport_base, storage=cache_storage, controller=cache_controller
+    )
+
+    return transport
+
+
+class CacheStats:
+    """Count the responses a client got from its cache (hits) & from the network (misses).
+
+    Description:
+        hishel marks each response with a `from_cache` extension. Responses revalidated with the server (a 304 turned
+        into the cached response) count as hits, and are also counted in `revalidated`.
+    """
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidated: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+
+    def record(self, response: httpx.Response) -> None:
+        """Count a response sent through a cache transport."""
+        with self._lock:
+            if response.extensions.get("from_cache"):
+                self.hits += 1
+
+                if response.extensions.get("revalidated"):
+                    self.revalidated += 1
+            else:
+                self.misses += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.revalidated = 0
+
+    def stats(self) -> dict:
+        """Return the hit & miss counts and the hit ratio."""
+        lookups: int = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+class SQLiteCacheStorage(hishel.BaseStorage):
+    """hishel storage in a SQLite database shared by many threads & processes.
+
+    Description:
+        `hishel.SQLiteStorage` shares one connection between all threads behind a lock, runs in SQLite's default
+        rollback journal mode (readers block writers) & deletes expired rows on every read, so every cache hit
+        takes the database's write lock. With several worker processes on one database that means "database is
+        locked" errors & serialized reads.
+
+        This storage opens one connection per thread (& per process, connections are not reused after a fork) in
+        WAL mode, so reads do not block on a writer, & waits up to `busy_timeout` seconds for another process's
+        write lock. Expired rows are filtered out of reads & deleted at most every `check_ttl_every` seconds.
+
+        Each row's expiry is saved with it (`expires_at`, from the `ttl` of the storage that wrote it), so a row
+        written with a long TTL, i.e. by a cache warm-up, is served & kept by storages configured with a shorter
+        one. Rows without an expiry (written by `hishel.SQLiteStorage`) expire `ttl` seconds after they were created.
+
+        The table is `hishel.SQLiteStorage`'s with an extra `expires_at` column (and indexes), so the sync & async
+        controllers can share a database file.
+
+    Params:
+        db_file (str): Path to the SQLite database file.
+        ttl (int | float | None): (default: None) Amount of time, in seconds, for cached items written by this storage to live.
+        busy_timeout (float): (default: 30.0) Seconds to wait for another connection's write lock.
+        check_ttl_every (float): (default: 60) Interval in seconds to delete expired cached items.
+        serializer (hishel.BaseSerializer | None): Serializer for stored responses. Defaults to hishel's JSON serializer.
+    """
+
+    def __init__(
+        self,
+        db_file: str,
+        ttl: int | float | None = None,
+        busy_timeout: float = 30.0,
+        check_ttl_every: float = 60,
+        serializer: hishel.BaseSerializer | None = None,
+    ) -> None:
+        super().__init__(serializer=serializer, ttl=ttl)
+
+        self.db_file: str = str(db_file)
+        self.busy_timeout: float = busy_timeout
+        self.check_ttl_every: float = check_ttl_every
+
+        self._init_connections()
+
+    def _init_connections(self) -> None:
+        self._pid: int = os.getpid()
+        self._local: threading.local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock: threading.Lock = threading.Lock()
+        ## Serializes this process's writers, SQLite's busy handler backs off by sleeping when they contend
+        self._write_lock: threading.Lock = threading.Lock()
+        self._setup_completed: bool = False
+        self._next_expiry_check: float = 0.0
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        if self._pid != os.getpid():
+            ## Forked, connections (& locks) inherited from the parent process must not be used
+            self._init_connections()
+
+        conn: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if conn is not None:
+            return conn
+
+        ## Autocommit, transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(
+            self.db_file,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+
+        with self._connections_lock:
+            if not self._setup_completed:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache(key TEXT, data BLOB, date_created REAL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_key ON cache(key)")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_cache_date_created ON cache(date_created)"
+                )
+
+                ## Databases created before rows saved their expiry
+                columns: list[str] = [
+                    row[1] for row in conn.execute("PRAGMA table_info(cache)")
+                ]
+                if "expires_at" not in columns:
+                    conn.execute("ALTER TABLE cache ADD COLUMN expires_at REAL")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_cache_expires_at ON cache(expires_at)"
+                )
+
+                self._setup_completed = True
+
+            self._connections.append(conn)
+
+        self._local.connection = conn
+
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> t.Generator[sqlite3.Connection, None, None]:
+        """Run statements in a write transaction, taking the write lock up front."""
+        conn: sqlite3.Connection = self._get_connection()
+
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            conn.execute("COMMIT")
+
+    def store(
+        self,
+        key: str,
+        response: httpcore.Response,
+        request: httpcore.Request,
+        metadata: dict | None = None,
+    ) -> None:
+        metadata = metadata or {
+            "cache_key": key,
+            "created_at": dt.datetime.now(dt.timezone.utc),
+            "number_of_uses": 0,
+        }
+        ## Serialize before taking the write lock
+        serialized_response: bytes = self._serializer.dumps(
+            response=response, request=request, metadata=metadata
+        )
+
+        now: float = time.time()
+
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", [key])
+            conn.execute(
+                "INSERT INTO cache(key, data, date_created, expires_at) VALUES(?, ?, ?, ?)",
+                [
+                    key,
+                    serialized_response,
+                    now,
+                    None if self._ttl is None else now + self._ttl,
+                ],
+            )
+
+        self._remove_expired_caches()
+
+    def retrieve(self, key: str) -> t.Tuple[httpcore.Response, httpcore.Request, dict] | None:
+        conn: sqlite3.Connection = self._get_connection()
+        now: float = time.time()
+
+        ## Rows expire when the storage that wrote them said, rows without an expiry `ttl` seconds after they were created
+        if self._ttl is None:
+            row = conn.execute(
+                "SELECT data FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at >= ?)",
+                [key, now],
+            ).fetchone()
+        else:
+            row = conn.execute(
+                "SELECT data FROM cache WHERE key = ? AND (expires_at >= ? OR (expires_at IS NULL AND date_created >= ?))",
+                [key, now, now - self._ttl],
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return self._serializer.loads(row[0])
+
+    def update_metadata(
+        self,
+        key: str,
+        response: httpcore.Response,
+        request: httpcore.Request,
+        metadata: dict,
+    ) -> None:
+        serialized_response: bytes = self._serializer.dumps(
+            response=response, request=request, metadata=metadata
+        )
+
+        with self._transaction() as conn:
+            updated: int = conn.execute(
+                "UPDATE cache SET data = ? WHERE key = ?", [serialized_response, key]
+            ).rowcount
+
+        if not updated:
+            self.store(key, response=response, request=request, metadata=metadata)
+
+    def remove(self, key: t.Union[str, httpcore.Response]) -> None:
+        if isinstance(key, httpcore.Response):
+            key = key.extensions["cache_metadata"]["cache_key"]
+
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", [key])
+
+    def close(self) -> None:
+        """Close every thread's connection opened by this process."""
+        if self._pid != os.getpid():
+            return
+
+        with self._connections_lock:
+            connections: list[sqlite3.Connection] = self._connections
+            self._connections = []
+
+        for conn in connections:
+            conn.close()
+
+        self._local = threading.local()
+
+    def _remove_expired_caches(self) -> None:
+        if time.monotonic() < self._next_expiry_check:
+            return
+
+        self._next_expiry_check = time.monotonic() + self.check_ttl_every
+        now: float = time.time()
+
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM cache WHERE expires_at < ?", [now])
+
+            if self._ttl is not None:
+                conn.execute(
+                    "DELETE FROM cache WHERE expires_at IS NULL AND date_created < ?",
+                    [now - self._ttl],
+                )
+
+
+class AsyncSQLiteCacheStorage(hishel.AsyncBaseStorage):
+    """hishel async storage backed by a `SQLiteCacheStorage`, running each query in a worker thread.
+
+    Description:
+        `hishel.AsyncSQLiteStorage` sends every query through one `anysqlite` connection behind a lock & deletes
+        expired rows (a write & commit) on every read & write, so concurrent requests queue on the cache. This
+        storage runs the sync `SQLiteCacheStorage`'s reads & writes in the event loop's thread pool instead: each
+        thread has its own WAL connection, reads do not block each other & expired rows are deleted at most every
+        `check_ttl_every` seconds. It needs no extra packages, and shares the database with the sync controllers.
+
+    Params:
+        storage (SQLiteCacheStorage): The sync storage to run queries on.
+    """
+
+    def __init__(self, storage: SQLiteCacheStorage) -> None:
+        super().__init__(ttl=storage._ttl)
+
+        self.storage: SQLiteCacheStorage = storage
+
+    async def store(
+        self,
+        key: str,
+        response: httpcore.Response,
+        request: httpcore.Request,
+        metadata: dict | None = None,
+    ) -> None:
+        await asyncio.to_thread(
+            self.storage.store,
+            key,
+            response=response,
+            request=request,
+            metadata=metadata,
+        )
+
+    async def retrieve(self, key: str) -> t.Tuple[httpcore.Response, httpcore.Request, dict] | None:
+        return await asyncio.to_thread(self.storage.retrieve, key)
+
+    async def update_metadata(
+        self,
+        key: str,
+        response: httpcore.Response,
+        request: httpcore.Request,
+        metadata: dict,
+    ) -> None:
+        await asyncio.to_thread(
+            self.storage.update_metadata,
+            key,
+            response=response,
+            request=request,
+            metadata=metadata,
+        )
+
+    async def remove(self, key: t.Union[str, httpcore.Response]) -> None:
+        await asyncio.to_thread(self.storage.remove, key)
+
+    async def aclose(self) -> None:
+        self.storage.close()
+
+
+@dataclass
+class _MemoryCacheEntry:
+    response: httpcore.Response
+    request: httpcore.Request
+    metadata: dict
+    size: int
+    expires_at: float
+
+
+class MemoryCache:
+    """In-process LRU cache of hishel responses, with a TTL & size bound.
+
+    Description:
+        Entries are evicted least recently used first once the cache holds `capacity` entries or `max_bytes` of
+        response bodies. Responses larger than `max_entry_bytes` (i.e. comic images) are not kept in memory.
+
+        Hits & misses are counted in `hits`/`misses`, see `stats()`.
+
+    Params:
+        capacity (int): (default: 256) Maximum number of responses kept in memory.
+        max_bytes (int): (default: 64 MiB) Maximum total size of response bodies kept in memory.
+        max_entry_bytes (int): (default: 1 MiB) Largest response body kept in memory.
+        ttl (float): (default: 300) Seconds a response is kept in memory. Never longer than the response's TTL in the
+            backing storage.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 1024 * 1024,
+        ttl: float = 300,
+    ) -> None:
+        self.capacity: int = capacity
+        self.max_bytes: int = max_bytes
+        self.max_entry_bytes: int = max_entry_bytes
+        self.ttl: float = ttl
+
+        self._entries: OrderedDict[str, _MemoryCacheEntry] = OrderedDict()
+        self._size: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> _MemoryCacheEntry | None:
+        with self._lock:
+            entry: _MemoryCacheEntry | None = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._pop(key)
+                self.misses += 1
+
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry
+
+    def put(
+        self,
+        key: str,
+        response: httpcore.Response,
+        request: httpcore.Request,
+        metadata: dict,
+        ttl: float | None = None,
+    ) -> bool:
+        """Keep a read response in memory. Returns `False` if it is too large or already expired."""
+        size: int = len(response.content)
+        ttl = self.ttl if ttl is None else min(self.ttl, ttl)
+
+        if size > self.max_entry_bytes or ttl <= 0:
+            return False
+
+        entry: _MemoryCacheEntry = _MemoryCacheEntry(
+            response=response,
+            request=request,
+            metadata=metadata,
+            size=size,
+            expires_at=time.monotonic() + ttl,
+        )
+
+        with self._lock:
+            self._pop(key)
+
+            self._entries[key] = entry
+            self._size += size
+
+            while self._entries and (
+                len(self._entries) > self.capacity or self._size > self.max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+
+        return True
+
+    def update_metadata(self, key: str, metadata: dict) -> bool:
+        """Replace the metadata of a cached response. Returns `False` if the key is not in memory."""
+        with self._lock:
+            entry: _MemoryCacheEntry | None = self._entries.get(key)
+            if entry is None:
+                return False
+
+            entry.metadata = metadata
+
+            return True
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def _pop(self, key: str) -> None:
+        entry: _MemoryCacheEntry | None = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def reset_lock(self) -> None:
+        """Replace the lock, i.e. in a forked child where another thread may have held it at fork time."""
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        """Return the cache's hit & miss counts, hit ratio, and current size."""
+        lookups: int = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
+
+
+class LayeredCacheStorage(hishel.BaseStorage):
+    """hishel storage serving responses from an in-process `MemoryCache` (L1) before a backing storage (L2).
+
+    Description:
+        A hit in the backing storage (i.e. `hishel.SQLiteStorage`) costs a query, deserializing the stored response
+        & rebuilding it. Responses read or stored through this storage are also kept in the memory cache, so repeated
+        reads of the same URL are served from memory.
+
+        hishel updates a response's metadata (its use count) on every cache hit. For responses in memory, only the
+        in-memory metadata is updated, which avoids a write to the backing storage on every hit.
+
+    Params:
+        storage (hishel.BaseStorage): The backing (L2) storage.
+        memory_cache (MemoryCache): The in-process (L1) cache. Share one between storages (see `get_memory_cache()`)
+            so it outlives a single client.
+    """
+
+    def __init__(self, storage: hishel.BaseStorage, memory_cache: MemoryCache) -> None:
+        super().__init__(ttl=getattr(storage, "_ttl", None))
+
+        self.storage: hishel.BaseStorage = storage
+        self.memory_cache: MemoryCache = memory_cache
+
+    def _remaining_ttl(self, metadata: dict) -> float | None:
+        """Seconds until the backing storage expires a response, so it is not served from memory after that."""
+        if self._ttl is None:
+            return None
+
+        created_at: dt.datetime | None = metadata.get("created_at")
+        if created_at is None:
+            return self._ttl
+
+        return self._ttl - (dt.datetime.now(dt.timezone.utc) - created_at).total_seconds()
+
+    def store(
+        self,
+        key: str,
+        response: httpcore.Response,
+        request: httpcore.Request,
+        metadata: dict | None = None,
+    ) -> None:
+        self.storage.store(key, response=response, request=request, metadata=metadata)
+
+        metadata = metadata or {
+            "cache_key": key,
+            "created_at": dt.datetime.now(dt.timezone.utc),
+            "number_of_uses": 0,
+        }
+        response.read()
+        self.memory_cache.put(
+            key,
+            response=response,
+            request=request,
+            metadata=metadata,
+            ttl=self._remaining_ttl(metadata),
+        )
+
+    def retrieve(self, key: str) -> t.Tuple[httpcore.Response, httpcore.Request, dict] | None:
+        entry: _MemoryCacheEntry | None = self.memory_cache.get(key)
+
+        if entry is None:
+            stored: t.Tuple[httpcore.Response, httpcore.Request, dict] | None = (
+                self.storage.retrieve(key)
+            )
+            if stored is None:
+                return None
+
+            response, request, metadata = stored
+            response.read()
+            self.memory_cache.put(
+                key,
+                response=response,
+                request=request,
+                metadata=metadata,
+                ttl=self._remaining_ttl(metadata),
+            )
+
+            return stored
+
+        ## hishel adds extensions to the response it is given, hand out a copy so entries are not shared
+        response: httpcore.Response = httpcore.Response(
+            status=entry.response.status,
+            headers=list(entry.response.headers),
+            content=entry.response.content,
+            extensions=dict(entry.response.extensions),
+        )
+
+        return response, entry.request, entry.metadata
+
+    def update_metadata(
+        self,
+        key: str,
+        response: httpcore.Response,
+        request: httpcore.Request,
+        metadata: dict,
+    ) -> None:
+        if self.memory_cache.update_metadata(key, metadata):
+            return
+
+        self.storage.update_metadata(key, response=response, request=request, metadata=metadata)
+
+    def remove(self, key: t.Union[str, httpcore.Response]) -> None:
+        if isinstance(key, httpcore.Response):
+            key = key.extensions["cache_metadata"]["cache_key"]
+
+        self.memory_cache.remove(key)
+        self.storage.remove(key)
+
+    def close(self) -> None:
+        self.storage.close()
+
+
+## In-process memory caches, shared by every controller in the process. Keyed by the backing storage's location
+_MEMORY_CACHES: dict[str, MemoryCache] = {}
+_MEMORY_CACHES_LOCK: threading.Lock = threading.Lock()
+
+
+def get_memory_cache(
+    name: str,
+    capacity: int = 256,
+    max_bytes: int = 64 * 1024 * 1024,
+    max_entry_bytes: int = 1024 * 1024,
+    ttl: float = 300,
+) -> MemoryCache:
+    """Return the process-wide MemoryCache for `name`, creating it on first use.
+
+    Params:
+        name (str): The cache's name. Use the backing storage's location (i.e. the SQLite database path), so
+            controllers sharing a backing storage also share a memory cache.
+        capacity (int): (default: 256) Maximum number of responses kept in memory.
+        max_bytes (int): (default: 64 MiB) Maximum total size of response bodies kept in memory.
+        max_entry_bytes (int): (default: 1 MiB) Largest response body kept in memory.
+        ttl (float): (default: 300) Seconds a response is kept in memory.
+
+    Returns:
+        (MemoryCache): A memoized MemoryCache. Size options only apply when the cache is created.
+
+    """
+    with _MEMORY_CACHES_LOCK:
+        memory_cache: MemoryCache | None = _MEMORY_CACHES.get(name)
+
+        if memory_cache is None:
+            memory_cache = MemoryCache(
+                capacity=capacity,
+                max_bytes=max_bytes,
+                max_entry_bytes=max_entry_bytes,
+                ttl=ttl,
+            )
+            _MEMORY_CACHES[name] = memory_cache
+
+    return memory_cache
+
+
+def get_layered_cache_storage(
+    storage: hishel.BaseStorage, memory_cache: MemoryCache
+) -> LayeredCacheStorage:
+    """Wrap a hishel storage in a `LayeredCacheStorage`, serving repeated reads from `memory_cache`.
+
+    Params:
+        storage (hishel.BaseStorage): The backing (L2) storage, i.e. from `get_sqlite_cache_storage()`.
+        memory_cache (MemoryCache): The in-process (L1) cache, i.e. from `get_memory_cache()`.
+
+    Returns:
+        (LayeredCacheStorage): The layered storage.
+
+    """
+    return LayeredCacheStorage(storage=storage, memory_cache=memory_cache)
+
+
+def _reset_memory_caches_after_fork() -> None:
+    """Replace locks inherited from the parent process, which may have been held by another thread at fork time."""
+    global _MEMORY_CACHES_LOCK
+
+    _MEMORY_CACHES_LOCK = threading.Lock()
+
+    for memory_cache in _MEMORY_CACHES.values():
+        memory_cache.reset_lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_memory_caches_after_fork)
@@ -6,6 +6,7 @@ Users can call the client to build a request, decode a response, encode data for
 
 from __future__ import annotations
 
+import importlib.util
 import json
 import logging
 from pathlib import Path
@@ -15,6 +16,12 @@ log = logging.getLogger(__name__)
 
 import httpx
 
+## Parse JSON with orjson when it is installed. It parses bytes directly & is several times faster than the json module
+if importlib.util.find_spec("orjson"):
+    import orjson
+else:
+    orjson = None
+
 def build_request(
     method: str = "GET",
     url: str = None,
@@ -62,9 +69,29 @@ def build_request(
     return request
 
 
+def loads_json(content: t.Union[bytes, str]) -> t.Any:
+    """Parse JSON from bytes or a str, with orjson when it is installed.
+
+    Params:
+        content (bytes | str): The JSON document. Bytes must be UTF-8 (or UTF-16/32 without orjson).
+
+    Returns:
+        (Any): The parsed JSON.
+
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+
+    ## json.loads() detects the encoding of bytes itself, no need to decode to a str first
+    return json.loads(content)
+
+
 def decode_response(response: httpx.Response = None, encoding: str = "utf-8") -> dict:
     """Decode an httpx.Response object to a Python dict.
 
+    Description:
+        UTF-8 content is parsed straight from the response's bytes, without decoding to a str first.
+
     Params:
         response (httpx.Response): An httpx.Response object to convert to a dict.
         encoding (str): (default: "utf-8"): Encoding of response content.
@@ -76,10 +103,12 @@ def decode_response(response: httpx.Response = None, encoding: str = "utf-8") ->
     ## Extract response content
     content: bytes = response.content
 
-    ## Decode content to str
-    decoded_str: str = content.decode(encoding=encoding)
-    ## Load decoded str to dict
-    data: dict = json.loads(decoded_str)
+    if encoding.lower().replace("-", "").replace("_", "") != "utf8":
+        ## Decode content to str
+        content: str = content.decode(encoding=encoding)
+
+    ## Load content to dict
+    data: dict = loads_json(content)
 
     return data
 
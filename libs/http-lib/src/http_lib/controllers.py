@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from contextlib import AbstractContextManager, contextmanager
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    contextmanager,
+)
+import importlib.util
 import json
 import logging
 from pathlib import Path
@@ -9,6 +14,14 @@ import typing as t
 log = logging.getLogger(__name__)
 
 from . import cache
+from .ratelimit import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RateLimiter,
+    RetryPolicy,
+    get_rate_limiter,
+)
+from .validators import ValidatorStore, get_validator_store
 
 from dynaconf import Dynaconf
 import hishel
@@ -58,11 +71,37 @@ def get_http_controller(
     check_ttl_every: float | None = HTTP_SETTINGS.get(
         "HTTP_CACHE_CHECK_TTL_EVERY", default=60
     ),
+    cache_redis_url: str | None = HTTP_SETTINGS.get("HTTP_CACHE_REDIS_URL", default=None),
     cacheable_methods: list[str] | None = None,
     cacheable_status_codes: list[int] | None = None,
     cache_allow_heuristics: bool = True,
     cache_allow_stale: bool = False,
+    memory_cache: bool = HTTP_SETTINGS.get("HTTP_CACHE_MEMORY", default=False),
+    memory_cache_capacity: int = HTTP_SETTINGS.get(
+        "HTTP_CACHE_MEMORY_CAPACITY", default=256
+    ),
+    memory_cache_ttl: float = HTTP_SETTINGS.get("HTTP_CACHE_MEMORY_TTL", default=300),
     timeout: int | float = 30.0,
+    persistent: bool = False,
+    http2: bool = HTTP_SETTINGS.get("HTTP_CLIENT_HTTP2", default=False),
+    max_connections: int | None = HTTP_SETTINGS.get(
+        "HTTP_CLIENT_MAX_CONNECTIONS", default=10
+    ),
+    max_keepalive_connections: int | None = HTTP_SETTINGS.get(
+        "HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", default=10
+    ),
+    keepalive_expiry: float | None = HTTP_SETTINGS.get(
+        "HTTP_CLIENT_KEEPALIVE_EXPIRY", default=30.0
+    ),
+    validators_db_file: str = HTTP_SETTINGS.get(
+        "HTTP_VALIDATORS_DB_FILE", default=".cache/http/validators.sqlite3"
+    ),
+    rate_limit: float | None = HTTP_SETTINGS.get("HTTP_RATELIMIT_RATE", default=10.0),
+    rate_limit_burst: int = HTTP_SETTINGS.get("HTTP_RATELIMIT_BURST", default=20),
+    rate_limit_redis_url: str | None = HTTP_SETTINGS.get(
+        "HTTP_RATELIMIT_REDIS_URL", default=None
+    ),
+    max_retries: int = HTTP_SETTINGS.get("HTTP_RETRY_MAX_RETRIES", default=3),
 ) -> HttpxController:
     """Return an initialized HttpxController class object.
 
@@ -81,19 +120,41 @@ def get_http_controller(
             that disable response caching.
         follow_redirects (bool): (default: True) When `True`, follow any redirect responses from the
             remote to the new location.
-        cache_type (str): The type of hishel cache to use, i.e. "sqlite", "file", & more.
+        cache_type (str): The type of hishel cache to use: "sqlite" (one database shared by the processes on a host),
+            "file" or "redis" (one cache shared by every host using the Redis server).
         cache_file_dir (str): If hishel.FileStorage is the cache backend, define the path where cache
             files will be saved.
-        cache_db_file (str): If hishel.SQLiteStorage is the cache backend, define the path where the
+        cache_db_file (str): If SQLite is the cache backend, define the path where the
             cache SQLite database file will be saved.
         cache_ttl (int): (default: 900) Amount of time, in seconds, cached items should live for.
         check_ttl_every (int): (default: 60) Interval where cache will check for stale objects to remove.
+        cache_redis_url (str | None): If Redis is the cache backend, the URL of the Redis server, i.e. the Celery
+            result backend. Defaults to "redis://localhost:6379/0".
         cacheable_methods (list[str] | None): List of HTTP methods that will be cached, i.e. "GET", "POST", etc.
         cacheable_status_codes (list[int] | None): List of HTTP response codes that will be cached, i.e. 200, 301, etc.
         cache_allow_heuristics (bool): (default: True) Use heuristics to match objects in cache, improves performance &
             reliability of caching new objects.
         cache_allow_stale (bool): (default: False) When `True`, allow stale/expired responses from cache.
+        memory_cache (bool): (default: False) Keep responses read from the cache in an in-process LRU cache, shared by
+            every controller in the process, so repeated reads skip the cache database.
+        memory_cache_capacity (int): (default: 256) Maximum number of responses kept in memory.
+        memory_cache_ttl (float): (default: 300) Seconds a response is kept in memory.
         timeout (int | float): (default: 30.0) Amount of time, in seconds, to wait for a response.
+        persistent (bool): (default: False) When `True`, the client stays open when a `with` block exits, so
+            repeated `with` blocks reuse the same connection pool & cache connection. Call `.close()` when done.
+        http2 (bool): (default: False) Enable HTTP/2. Requires the `h2` package (`httpx[http2]`).
+        max_connections (int | None): (default: 10) Maximum number of concurrent connections in the client's pool.
+        max_keepalive_connections (int | None): (default: 10) Maximum number of idle connections kept alive in the pool.
+        keepalive_expiry (float | None): (default: 30.0) Time, in seconds, an idle connection is kept alive for.
+        validators_db_file (str): (default: ".cache/http/validators.sqlite3") Path to the SQLite database where
+            ETag/Last-Modified validators for conditional requests are saved.
+        rate_limit (float | None): (default: 10.0) Maximum requests per second sent to each host. Responses served from
+            the cache do not count. `None` or `0` disables rate limiting.
+        rate_limit_burst (int): (default: 20) Number of requests sent to a host at once before `rate_limit` applies.
+        rate_limit_redis_url (str | None): Keep rate limit buckets in Redis (i.e. the Celery result backend), so every
+            worker shares one budget per host. When `None`, each process has its own budget.
+        max_retries (int): (default: 3) Retries for 429/5xx responses & timeouts, with jittered exponential backoff
+            that honors `Retry-After`. `0` disables retries.
 
     Returns:
         (HttpxController): Initialized HttpxController object to use for requests.
@@ -106,6 +167,7 @@ def get_http_controller(
         cache_db_file = None
         cache_ttl = None
         check_ttl_every = None
+        cache_redis_url = None
 
     ## Build HttpxController object
     try:
@@ -118,11 +180,25 @@ def get_http_controller(
             cache_db_file=cache_db_file,
             cache_ttl=cache_ttl,
             check_ttl_every=check_ttl_every,
+            cache_redis_url=cache_redis_url,
             cacheable_methods=cacheable_methods,
             cacheable_status_codes=cacheable_status_codes,
             cache_allow_heuristics=cache_allow_heuristics,
             cache_allow_stale=cache_allow_stale,
+            memory_cache=memory_cache,
+            memory_cache_capacity=memory_cache_capacity,
+            memory_cache_ttl=memory_cache_ttl,
             timeout=timeout,
+            persistent=persistent,
+            http2=http2,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            validators_db_file=validators_db_file,
+            rate_limiter=_get_rate_limiter(
+                rate=rate_limit, burst=rate_limit_burst, redis_url=rate_limit_redis_url
+            ),
+            retry_policy=_get_retry_policy(max_retries=max_retries),
         )
 
         return http_ctl
@@ -133,6 +209,110 @@ def get_http_controller(
         raise exc
 
 
+def get_async_http_controller(
+    use_cache: bool = True,
+    force_cache: bool = True,
+    follow_redirects: bool = False,
+    cache_type: str = HTTP_SETTINGS.get("HTTP_CACHE_TYPE", default="sqlite"),
+    cache_file_dir: str = HTTP_SETTINGS.get(
+        "HTTP_CACHE_FILE_DIR", default=".cache/http/hishel"
+    ),
+    cache_db_file: str = HTTP_SETTINGS.get(
+        "HTTP_CACHE_DB_FILE", default=".cache/http/hishel.sqlite3"
+    ),
+    cache_ttl: int | None = HTTP_SETTINGS.get("HTTP_CACHE_TTL", default=900),
+    check_ttl_every: float | None = HTTP_SETTINGS.get(
+        "HTTP_CACHE_CHECK_TTL_EVERY", default=60
+    ),
+    cache_redis_url: str | None = HTTP_SETTINGS.get("HTTP_CACHE_REDIS_URL", default=None),
+    cacheable_methods: list[str] | None = None,
+    cacheable_status_codes: list[int] | None = None,
+    cache_allow_heuristics: bool = True,
+    cache_allow_stale: bool = False,
+    timeout: int | float = 30.0,
+    max_connections: int = 25,
+    max_keepalive_connections: int = 25,
+    rate_limit: float | None = HTTP_SETTINGS.get("HTTP_RATELIMIT_RATE", default=10.0),
+    rate_limit_burst: int = HTTP_SETTINGS.get("HTTP_RATELIMIT_BURST", default=20),
+    rate_limit_redis_url: str | None = HTTP_SETTINGS.get(
+        "HTTP_RATELIMIT_REDIS_URL", default=None
+    ),
+    max_retries: int = HTTP_SETTINGS.get("HTTP_RETRY_MAX_RETRIES", default=3),
+) -> AsyncHttpxController:
+    """Return an initialized AsyncHttpxController class object.
+
+    Description:
+        The async counterpart of `get_http_controller()`. Use the returned controller with `async with`
+        to make many requests concurrently over a single pooled `httpx.AsyncClient`.
+
+    Params:
+        See `get_http_controller()`. Additional params:
+        max_connections (int): (default: 25) Maximum number of concurrent connections in the client's pool.
+        max_keepalive_connections (int): (default: 25) Maximum number of idle connections kept alive in the pool.
+
+    Returns:
+        (AsyncHttpxController): Initialized AsyncHttpxController object to use for requests.
+
+    """
+    if not use_cache:
+        log.debug("use_cache is disabled, setting all cache-related settings to None.")
+        cache_type = None
+        cache_file_dir = None
+        cache_db_file = None
+        cache_ttl = None
+        check_ttl_every = None
+        cache_redis_url = None
+
+    try:
+        http_ctl: AsyncHttpxController = AsyncHttpxController(
+            use_cache=use_cache,
+            force_cache=force_cache,
+            follow_redirects=follow_redirects,
+            cache_type=cache_type,
+            cache_file_dir=cache_file_dir,
+            cache_db_file=cache_db_file,
+            cache_ttl=cache_ttl,
+            check_ttl_every=check_ttl_every,
+            cache_redis_url=cache_redis_url,
+            cacheable_methods=cacheable_methods,
+            cacheable_status_codes=cacheable_status_codes,
+            cache_allow_heuristics=cache_allow_heuristics,
+            cache_allow_stale=cache_allow_stale,
+            timeout=timeout,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            rate_limiter=_get_rate_limiter(
+                rate=rate_limit, burst=rate_limit_burst, redis_url=rate_limit_redis_url
+            ),
+            retry_policy=_get_retry_policy(max_retries=max_retries),
+        )
+
+        return http_ctl
+    except Exception as exc:
+        msg = f"({type(exc)}) Error initializing AsyncHttpxController. Details: {exc}"
+        log.error(msg)
+
+        raise exc
+
+
+def _get_rate_limiter(
+    rate: float | None, burst: int = 20, redis_url: str | None = None
+) -> RateLimiter | None:
+    """Return the shared rate limiter for a rate, or `None` if rate limiting is disabled."""
+    if not rate:
+        return None
+
+    return get_rate_limiter(rate=float(rate), burst=int(burst), redis_url=redis_url or None)
+
+
+def _get_retry_policy(max_retries: int | None) -> RetryPolicy | None:
+    """Return a retry policy, or `None` if retries are disabled."""
+    if not max_retries:
+        return None
+
+    return RetryPolicy(max_retries=int(max_retries))
+
+
 def merge_headers(header_dicts: list[t.Union[str, dict]] | None = []) -> dict:
     """Merge multiple header dicts/JSON strings into a single header.
 
@@ -187,19 +367,49 @@ class HttpxController(AbstractContextManager):
             that disable response caching.
         follow_redirects (bool): (default: True) When `True`, follow any redirect responses from the
             remote to the new location.
-        cache_type (str): The type of hishel cache to use, i.e. "sqlite", "file", & more.
+        cache_type (str): The type of hishel cache to use: "sqlite" (one database shared by the processes on a host),
+            "file" or "redis" (one cache shared by every host using the Redis server).
         cache_file_dir (str): If hishel.FileStorage is the cache backend, define the path where cache
             files will be saved.
-        cache_db_file (str): If hishel.SQLiteStorage is the cache backend, define the path where the
+        cache_db_file (str): If SQLite is the cache backend, define the path where the
             cache SQLite database file will be saved.
         cache_ttl (int): (default: 900) Amount of time, in seconds, cached items should live for.
         check_ttl_every (int): (default: 60) Interval where cache will check for stale objects to remove.
+        cache_redis_url (str | None): If Redis is the cache backend, the URL of the Redis server, i.e. the Celery
+            result backend. Defaults to "redis://localhost:6379/0".
         cacheable_methods (list[str] | None): List of HTTP methods that will be cached, i.e. "GET", "POST", etc.
         cacheable_status_codes (list[int] | None): List of HTTP response codes that will be cached, i.e. 200, 301, etc.
         cache_allow_heuristics (bool): (default: True) Use heuristics to match objects in cache, improves performance &
             reliability of caching new objects.
         cache_allow_stale (bool): (default: False) When `True`, allow stale/expired responses from cache.
+        memory_cache (bool): (default: False) Serve repeated cache reads from an in-process LRU/TTL cache (L1) in front of
+            the SQLite/file cache (L2). The memory cache is shared by every controller using the same cache location.
+        memory_cache_capacity (int): (default: 256) Maximum number of responses kept in memory.
+        memory_cache_ttl (float): (default: 300) Seconds a response is kept in memory.
         timeout (int | float): (default: 30.0) Amount of time, in seconds, to wait for a response.
+        persistent (bool): (default: False) When `True`, the client is kept open between `with` blocks and
+            only closed by `.close()`. Use this to reuse pooled keep-alive connections across many requests.
+        http2 (bool): (default: False) Enable HTTP/2. Requires the `h2` package (`httpx[http2]`); when it is
+            not installed, the client falls back to HTTP/1.1.
+        max_connections (int | None): (default: 10) Maximum number of concurrent connections in the client's pool.
+        max_keepalive_connections (int | None): (default: 10) Maximum number of idle connections kept alive in the pool.
+        keepalive_expiry (float | None): (default: 30.0) Time, in seconds, an idle connection is kept alive for.
+        validators_db_file (str): (default: ".cache/http/validators.sqlite3") Path to the SQLite database where
+            ETag/Last-Modified validators for `send_conditional_request()` are saved.
+        rate_limiter (RateLimiter | None): Per-host rate limiter for requests sent over the network. Responses served
+            from the cache are not rate limited.
+        retry_policy (RetryPolicy | None): Retry policy for 429/5xx responses, timeouts & connection errors.
+
+    Usage:
+        http_ctl = get_http_controller(persistent=True)
+
+        with http_ctl:
+            http_ctl.send_request(req_1)
+        ## Connection is still open & reused
+        with http_ctl:
+            http_ctl.send_request(req_2)
+
+        http_ctl.close()
     """
 
     def __init__(
@@ -212,6 +422,7 @@ class HttpxController(AbstractContextManager):
         cache_db_file: str = ".cache/http/hishel.sqlite3",
         cache_ttl: int | None = 900,
         check_ttl_every: float | None = 60,
+        cache_redis_url: str | None = None,
         cacheable_methods: list[str] | None = [
             "GET",
             "POST",
@@ -225,7 +436,18 @@ class HttpxController(AbstractContextManager):
         cacheable_status_codes: list[int] | None = [200, 201, 202, 301, 308],
         cache_allow_heuristics: bool = True,
         cache_allow_stale: bool = False,
+        memory_cache: bool = False,
+        memory_cache_capacity: int = 256,
+        memory_cache_ttl: float = 300,
         timeout: int | float = 30.0,
+        persistent: bool = False,
+        http2: bool = False,
+        max_connections: int | None = 10,
+        max_keepalive_connections: int | None = 10,
+        keepalive_expiry: float | None = 30.0,
+        validators_db_file: str = ".cache/http/validators.sqlite3",
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
     ) -> None:
         self.use_cache: bool = use_cache
         self.force_cache: bool = force_cache
@@ -237,72 +459,184 @@ class HttpxController(AbstractContextManager):
         self.cache_db_file: str = cache_db_file
         self.cache_ttl: int | None = cache_ttl
         self.check_ttl_every: float | None = check_ttl_every
+        self.cache_redis_url: str | None = cache_redis_url
         self.cacheable_methods: list[str] | None = cacheable_methods
         self.cacheable_status_codes: list[int] | None = cacheable_status_codes
         self.cache_allow_heuristics: bool = cache_allow_heuristics
         self.cache_allow_stale: bool = cache_allow_stale
+        self.memory_cache: bool = memory_cache
+        self.memory_cache_capacity: int = memory_cache_capacity
+        self.memory_cache_ttl: float = memory_cache_ttl
         self.timeout: int | float = timeout
+        self.persistent: bool = persistent
+        self.http2: bool = http2
+        self.max_connections: int | None = max_connections
+        self.max_keepalive_connections: int | None = max_keepalive_connections
+        self.keepalive_expiry: float | None = keepalive_expiry
+        self.validators_db_file: str = validators_db_file
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.retry_policy: RetryPolicy | None = retry_policy
 
         ## Placeholder for initialized httpx.Client
         self.client: httpx.Client | None = None
+        ## Placeholder for the pooled transport shared by the client & the uncached client
+        self.transport_base: t.Union[httpx.HTTPTransport, RateLimitedTransport] | None = None
+        ## Placeholder for the httpx.Client that sends conditional & streamed requests around the cache
+        self.uncached_client: httpx.Client | None = None
+        ## Placeholder for the store of ETag/Last-Modified validators
+        self.validator_store: ValidatorStore | None = None
         ## Placeholder for hishel cache storage object
-        self.cache: t.Union[hishel.SQLiteStorage, hishel.FileStorage] | None = None
+        self.cache: hishel.BaseStorage | None = None
         ## Placeholder for hishel cache controller object
         self.cache_controller: hishel.Controller | None = None
         ## Placeholder for hishel cache transport object
         self.cache_transport: hishel.CacheTransport | None = None
 
+        ## Responses served from the cache vs. the network, see `get_cache_stats()`
+        self.cache_stats: cache.CacheStats = cache.CacheStats()
+
         ## Class logger
         self.logger: logging.Logger = log.getChild("HttpxController")
 
     def __enter__(self) -> t.Self:
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, traceback) -> t.Literal[False] | None:
+        if not self.persistent:
+            self.close()
+
+        if exc_val:
+            msg = f"({exc_type}) {exc_val}"
+            self.logger.error(msg)
+
+            if traceback:
+                self.logger.error(f"Traceback: {traceback}")
+
+            return False
+
+        return
+
+    @property
+    def is_open(self) -> bool:
+        """`True` when the controller has an httpx.Client that has not been closed."""
+        return self.client is not None and not self.client.is_closed
+
+    def open(self) -> t.Self:
+        """Build the cache & httpx.Client, or return early if the client is already open.
+
+        Description:
+            Called by `__enter__()`. A persistent controller can be opened once & used for many requests,
+            reusing pooled connections (and the cache's SQLite connection) until `.close()` is called.
+
+        """
+        if self.is_open:
+            return self
+
+        ## Pooled transport, shared by the cache transport & the uncached client
+        self.transport_base = self._get_transport_base()
+
         if self.use_cache:
             ## If cache is enabled, build cache from class params
-            cache: hishel.SQLiteStorage | hishel.FileStorage | None = self._get_cache()
-            transport: hishel.CacheTransport = self._get_cache_transport()
-            controller: hishel.Controller = self._get_cache_controller()
+            self.cache = self._get_cache()
+            self.cache_controller = self._get_cache_controller()
+            self.cache_transport = self._get_cache_transport()
         else:
             ## Set all cache objects to None to disable
-            cache = None
-            transport = None
-            controller = None
-
-        self.cache = cache
-        self.cache_transport = transport
-        self.cache_controller = controller
+            self.cache = None
+            self.cache_transport = None
+            self.cache_controller = None
 
         ## Initialize httpx Client
-        self.client: httpx.Client = self._get_client()
+        self.client = self._get_client()
 
         return self
 
-    def __exit__(self, exc_type, exc_val, traceback) -> t.Literal[False] | None:
+    def close(self) -> None:
+        """Close the httpx.Client, its connection pool & the cache transport's storage."""
         if self.client:
-            self.client.close()
+            try:
+                self.client.close()
+            except Exception as exc:
+                self.logger.warning(
+                    f"({type(exc)}) Error closing httpx client. Details: {exc}"
+                )
 
-        if exc_val:
-            msg = f"({exc_type}) {exc_val}"
-            self.logger.error(msg)
+        if self.validator_store:
+            self.validator_store.close()
+
+        ## The uncached client shares the base transport, which was closed with the client
+        self.client = None
+        self.uncached_client = None
+        self.transport_base = None
+        self.cache = None
+        self.cache_transport = None
+
+    def _get_limits(self) -> httpx.Limits:
+        """Build the connection pool limits for the client."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
 
-            if traceback:
-                self.logger.error(f"Traceback: {traceback}")
+    def _http2_enabled(self) -> bool:
+        """Return `True` if HTTP/2 is requested & the `h2` package is installed."""
+        if not self.http2:
+            return False
+
+        if not importlib.util.find_spec("h2"):
+            self.logger.warning(
+                "HTTP/2 requires the 'h2' package (httpx[http2]). Falling back to HTTP/1.1."
+            )
+            self.http2 = False
 
             return False
 
-        return
+        return True
+
+    def _get_transport_base(self) -> t.Union[httpx.HTTPTransport, RateLimitedTransport]:
+        """Build the pooled base transport the client (or cache transport) sends requests through.
+
+        Description:
+            When a rate limiter or retry policy is set, the pooled transport is wrapped in a `RateLimitedTransport`.
+            It sits underneath the cache transport, so only requests that reach the network are throttled & retried.
+
+        """
+        transport: httpx.HTTPTransport = httpx.HTTPTransport(
+            limits=self._get_limits(), http2=self._http2_enabled()
+        )
+
+        if self.rate_limiter is None and self.retry_policy is None:
+            return transport
 
-    def _get_cache(self) -> t.Union[hishel.SQLiteStorage, hishel.FileStorage] | None:
-        """Initialize hishel cache storage."""
+        return RateLimitedTransport(
+            transport=transport,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+        )
+
+    def _get_cache(
+        self,
+    ) -> hishel.BaseStorage | None:
+        """Initialize hishel cache storage, wrapped in a memory cache layer when `memory_cache` is enabled."""
         if not self.use_cache:
             return None
 
+        if self.cache_type == "redis" and not importlib.util.find_spec("redis"):
+            log.warning(
+                "Redis cache requires the 'redis' package. Falling back to a SQLite cache."
+            )
+            self.cache_type = "sqlite"
+
         match self.cache_type:
             case None:
                 return None
             case "sqlite":
-                ## Get hishel SQLite storage object
-                _cache: hishel.SQLiteStorage = cache.get_sqlite_cache_storage(
-                    cache_db_path=self.cache_db_file, ttl=self.cache_ttl
+                ## Get SQLite storage object, shared with other processes through WAL mode
+                _cache: cache.SQLiteCacheStorage = cache.get_sqlite_cache_storage(
+                    cache_db_path=self.cache_db_file,
+                    ttl=self.cache_ttl,
+                    check_ttl_every=self.check_ttl_every or 60,
                 )
             case "file":
                 ## Get hishel file storage object
@@ -311,12 +645,36 @@ class HttpxController(AbstractContextManager):
                     ttl=self.cache_ttl,
                     check_ttl_every=self.check_ttl_every,
                 )
+            case "redis":
+                ## Get hishel Redis storage object
+                _cache: hishel.RedisStorage = cache.get_redis_cache_storage(
+                    redis_url=self.cache_redis_url or "redis://localhost:6379/0",
+                    ttl=self.cache_ttl,
+                )
             case _:
                 ## Unsupported cache type
                 log.error(f"Unrecognized cache type: {self.cache_type}")
 
                 return None
 
+        if self.memory_cache:
+            match self.cache_type:
+                case "sqlite":
+                    cache_location: str = str(Path(str(self.cache_db_file)).resolve())
+                case "file":
+                    cache_location: str = str(Path(str(self.cache_file_dir)).resolve())
+                case _:
+                    cache_location: str = self.cache_redis_url or "redis://localhost:6379/0"
+
+            _cache = cache.get_layered_cache_storage(
+                storage=_cache,
+                memory_cache=cache.get_memory_cache(
+                    name=f"{self.cache_type}:{cache_location}",
+                    capacity=self.memory_cache_capacity,
+                    ttl=self.memory_cache_ttl,
+                ),
+            )
+
         return _cache
 
     def _get_cache_controller(self) -> hishel.Controller:
@@ -351,9 +709,11 @@ class HttpxController(AbstractContextManager):
                 cache_controller: hishel.Controller = self._get_cache_controller()
                 self.cache_controller = cache_controller
 
-        if self.use_cache:
+        if self.use_cache and self.cache is not None:
             _transport: hishel.CacheTransport = cache.get_cache_transport(
-                cache_storage=self.cache, cache_controller=self.cache_controller
+                transport_base=self.transport_base or self._get_transport_base(),
+                cache_storage=self.cache,
+                cache_controller=self.cache_controller,
             )
         else:
             _transport = None
@@ -364,19 +724,396 @@ class HttpxController(AbstractContextManager):
 
     def _get_client(self) -> httpx.Client:
         """Return an httpx.Client object initialized from class parameters."""
-        if self.use_cache:
-            transport: hishel.CacheTransport | None = self.cache_transport
-            client = httpx.Client(
-                transport=transport,
+        if self.use_cache and self.cache_transport is not None:
+            transport: t.Union[hishel.CacheTransport, httpx.HTTPTransport] = (
+                self.cache_transport
+            )
+        else:
+            transport = self.transport_base or self._get_transport_base()
+
+        client = httpx.Client(
+            transport=transport,
+            follow_redirects=self.follow_redirects,
+            timeout=self.timeout,
+        )
+
+        return client
+
+    def send_request(
+        self,
+        request: httpx.Request,
+        auth: t.Union[
+            t.Tuple[t.Union[str, bytes], t.Union[str, bytes]],
+            t.Callable[[httpx.Request], httpx.Request],
+            httpx.Auth,
+        ] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Make an HTTP request and return the httpx.Response using the controller's .client.
+
+        Params:
+            request (httpx.Request): An initialized HTTPX Request object to send.
+
+        Returns:
+            (httpx.Response): An HTTPX Response object with the response's data.
+
+        """
+        if not self.is_open:
+            raise RuntimeError(
+                "HttpxController client is not open. Use 'with' or call '.open()' before sending requests."
+            )
+
+        try:
+            res: httpx.Response = self.client.send(request, stream=stream, auth=auth)
+            if self.cache_transport is not None:
+                self.cache_stats.record(res)
+
+            return res
+        except Exception as exc:
+            msg = f"({type(exc)}) Error sending request. Details: {exc}"
+            self.logger.error(msg)
+
+            raise exc
+
+    def get_cache_stats(self) -> dict:
+        """Return the number of responses sent through this controller that were cache hits & misses, and the hit ratio.
+
+        Description:
+            When a memory cache is layered over the cache storage, its stats (shared by every controller in the
+            process) are included under "memory".
+
+        Returns:
+            (dict): The cache's "hits", "misses", "revalidated" & "hit_ratio" (and "memory" stats, if enabled).
+
+        """
+        stats: dict = self.cache_stats.stats()
+
+        if isinstance(self.cache, cache.LayeredCacheStorage):
+            stats["memory"] = self.cache.memory_cache.stats()
+
+        return stats
+
+    def _get_validator_store(self) -> ValidatorStore:
+        if self.validator_store is None:
+            self.validator_store = get_validator_store(db_file=self.validators_db_file)
+
+        return self.validator_store
+
+    def _get_uncached_client(self) -> httpx.Client:
+        """Return an httpx.Client that sends requests straight through the pooled base transport, skipping the cache.
+
+        Description:
+            hishel answers a request from its stored response when one exists, and turns a server's `304 Not Modified`
+            back into the stored `200`. A conditional request sent through the cache transport can never see the 304,
+            so conditional requests use this client instead. hishel also reads a whole response body (and stores it)
+            before returning it, so streamed downloads use this client too. It shares the main client's connection pool.
+
+        """
+        if self.uncached_client is None:
+            self.uncached_client = httpx.Client(
+                transport=self.transport_base,
                 follow_redirects=self.follow_redirects,
                 timeout=self.timeout,
             )
 
-            return client
+        return self.uncached_client
+
+    def send_uncached_request(
+        self,
+        request: httpx.Request,
+        auth: t.Union[
+            t.Tuple[t.Union[str, bytes], t.Union[str, bytes]],
+            t.Callable[[httpx.Request], httpx.Request],
+            httpx.Auth,
+        ] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send a request around the hishel cache, through the same connection pool, rate limiter & retry policy.
+
+        Description:
+            Use it to stream large responses (i.e. images) without buffering them in memory or copying them into
+            the cache. A streamed response must be closed once it has been read.
+
+        Params:
+            request (httpx.Request): An initialized HTTPX Request object to send.
+            stream (bool): (default: False) Return before the body is read, see `httpx.Response.iter_bytes()`.
+
+        Returns:
+            (httpx.Response): An HTTPX Response object. Never served from, or saved to, the cache.
+
+        """
+        if not self.is_open:
+            raise RuntimeError(
+                "HttpxController client is not open. Use 'with' or call '.open()' before sending requests."
+            )
+
+        try:
+            return self._get_uncached_client().send(request, stream=stream, auth=auth)
+        except Exception as exc:
+            msg = f"({type(exc)}) Error sending uncached request. Details: {exc}"
+            self.logger.error(msg)
+
+            raise exc
+
+    def send_conditional_request(
+        self,
+        request: httpx.Request,
+        scope: str = "default",
+        save_validators: bool = True,
+    ) -> httpx.Response:
+        """Send a request with the saved `If-None-Match`/`If-Modified-Since` validators for its URL.
+
+        Description:
+            The response is a `304 Not Modified` with no body when the resource has not changed since the
+            validators were saved. Conditional requests skip the hishel cache (see `_get_uncached_client()`).
+
+            Pass `save_validators=False` to save the response's validators later with `save_validators()`, i.e.
+            only after the response has been processed. If processing fails, the next request is not answered
+            with a 304 for a change that was never saved.
+
+        Params:
+            request (httpx.Request): An initialized HTTPX Request object to send.
+            scope (str): (default: "default") Namespace for the saved validators. Different jobs polling the
+                same URL should use different scopes.
+            save_validators (bool): (default: True) Save the validators from a 200 response.
+
+        Returns:
+            (httpx.Response): An HTTPX Response object, with status code 304 if the resource is unchanged.
+
+        """
+        if not self.is_open:
+            raise RuntimeError(
+                "HttpxController client is not open. Use 'with' or call '.open()' before sending requests."
+            )
+
+        validator_store: ValidatorStore = self._get_validator_store()
+        validator_store.apply(request=request, scope=scope)
+
+        try:
+            res: httpx.Response = self._get_uncached_client().send(request)
+        except Exception as exc:
+            msg = f"({type(exc)}) Error sending conditional request. Details: {exc}"
+            self.logger.error(msg)
+
+            raise exc
+
+        if save_validators:
+            validator_store.update_from_response(response=res, scope=scope)
+
+        return res
+
+    def save_validators(self, response: httpx.Response, scope: str = "default") -> bool:
+        """Save the ETag/Last-Modified validators from a 200 response, for the next conditional request.
+
+        Returns:
+            (bool): `True` if any validators were saved.
+
+        """
+        return self._get_validator_store().update_from_response(
+            response=response, scope=scope
+        )
+
+
+class AsyncHttpxController(AbstractAsyncContextManager):
+    """Controller for an httpx.AsyncClient with optional hishel cache storage.
+
+    Description:
+        The async counterpart of `HttpxController`. A single `httpx.AsyncClient` (and its connection pool)
+        is opened in `__aenter__()` and shared by every request sent through the controller, so many
+        requests can be awaited concurrently without opening a new connection for each one.
+
+        The "sqlite" cache type uses the same database as `HttpxController`, so responses cached by either
+        controller are served to both (see `cache.AsyncSQLiteCacheStorage`).
+
+    Params:
+        See `HttpxController`. Additional params:
+        max_connections (int): (default: 25) Maximum number of concurrent connections in the client's pool.
+        max_keepalive_connections (int): (default: 25) Maximum number of idle connections kept alive in the pool.
+        rate_limiter (RateLimiter | None): Per-host rate limiter for requests sent over the network.
+        retry_policy (RetryPolicy | None): Retry policy for 429/5xx responses, timeouts & connection errors.
+    """
+
+    def __init__(
+        self,
+        use_cache: bool = True,
+        force_cache: bool = True,
+        follow_redirects: bool = False,
+        cache_type: str | None = "sqlite",
+        cache_file_dir: str | None = ".cache/http/hishel",
+        cache_db_file: str = ".cache/http/hishel.sqlite3",
+        cache_ttl: int | None = 900,
+        check_ttl_every: float | None = 60,
+        cache_redis_url: str | None = None,
+        cacheable_methods: list[str] | None = ["GET"],
+        cacheable_status_codes: list[int] | None = [200, 201, 202, 301, 308],
+        cache_allow_heuristics: bool = True,
+        cache_allow_stale: bool = False,
+        timeout: int | float = 30.0,
+        max_connections: int = 25,
+        max_keepalive_connections: int = 25,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        self.use_cache: bool = use_cache
+        self.force_cache: bool = force_cache
+        self.follow_redirects: bool = follow_redirects
+        self.cache_type: str | None = (
+            cache_type.lower() if (cache_type and isinstance(cache_type, str)) else None
+        )
+        self.cache_file_dir: str | None = cache_file_dir
+        self.cache_db_file: str = cache_db_file
+        self.cache_ttl: int | None = cache_ttl
+        self.check_ttl_every: float | None = check_ttl_every
+        self.cache_redis_url: str | None = cache_redis_url
+        self.cacheable_methods: list[str] | None = cacheable_methods
+        self.cacheable_status_codes: list[int] | None = cacheable_status_codes
+        self.cache_allow_heuristics: bool = cache_allow_heuristics
+        self.cache_allow_stale: bool = cache_allow_stale
+        self.timeout: int | float = timeout
+        self.max_connections: int = max_connections
+        self.max_keepalive_connections: int = max_keepalive_connections
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.retry_policy: RetryPolicy | None = retry_policy
+
+        ## Placeholder for initialized httpx.AsyncClient
+        self.client: httpx.AsyncClient | None = None
+        ## Placeholder for the pooled transport shared by the client & the uncached client
+        self.transport_base: t.Union[httpx.AsyncHTTPTransport, AsyncRateLimitedTransport] | None = None
+        ## Placeholder for the httpx.AsyncClient that sends streamed requests around the cache
+        self.uncached_client: httpx.AsyncClient | None = None
+        ## Placeholder for hishel async cache storage object
+        self.cache: t.Union[
+            cache.AsyncSQLiteCacheStorage, hishel.AsyncFileStorage, hishel.AsyncRedisStorage
+        ] | None = None
+        ## Placeholder for hishel cache controller object
+        self.cache_controller: hishel.Controller | None = None
+        ## Placeholder for hishel async cache transport object
+        self.cache_transport: hishel.AsyncCacheTransport | None = None
+
+        ## Responses served from the cache vs. the network, see `get_cache_stats()`
+        self.cache_stats: cache.CacheStats = cache.CacheStats()
+
+        ## Class logger
+        self.logger: logging.Logger = log.getChild("AsyncHttpxController")
+
+    async def __aenter__(self) -> t.Self:
+        transport_base: t.Union[httpx.AsyncHTTPTransport, AsyncRateLimitedTransport] = (
+            httpx.AsyncHTTPTransport(limits=self._get_limits())
+        )
+
+        if self.rate_limiter is not None or self.retry_policy is not None:
+            ## Throttle & retry requests underneath the cache, cached responses are not rate limited
+            transport_base = AsyncRateLimitedTransport(
+                transport=transport_base,
+                rate_limiter=self.rate_limiter,
+                retry_policy=self.retry_policy,
+            )
+
+        if self.use_cache:
+            self.cache = await self._get_cache()
+            self.cache_controller = cache.get_cache_controller(
+                force_cache=self.force_cache,
+                cacheable_methods=self.cacheable_methods,
+                cacheable_status_codes=self.cacheable_status_codes,
+                allow_heuristics=self.cache_allow_heuristics,
+                allow_stale=self.cache_allow_stale,
+            )
+
+        self.transport_base = transport_base
+
+        if self.use_cache and self.cache is not None:
+            self.cache_transport = cache.get_async_cache_transport(
+                transport_base=transport_base,
+                cache_storage=self.cache,
+                cache_controller=self.cache_controller,
+            )
+            transport = self.cache_transport
         else:
-            return httpx.Client()
+            transport = transport_base
 
-    def send_request(
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            follow_redirects=self.follow_redirects,
+            timeout=self.timeout,
+        )
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, traceback) -> t.Literal[False] | None:
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+        ## The uncached client shares the base transport, which was closed with the client
+        self.uncached_client = None
+        self.transport_base = None
+
+        if exc_val:
+            msg = f"({exc_type}) {exc_val}"
+            self.logger.error(msg)
+
+            if traceback:
+                self.logger.error(f"Traceback: {traceback}")
+
+            return False
+
+        return
+
+    def get_cache_stats(self) -> dict:
+        """Return the number of responses sent through this controller that were cache hits & misses, and the hit ratio."""
+        return self.cache_stats.stats()
+
+    def _get_limits(self) -> httpx.Limits:
+        """Build the connection pool limits for the async client."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+
+    async def _get_cache(
+        self,
+    ) -> t.Union[
+        cache.AsyncSQLiteCacheStorage, hishel.AsyncFileStorage, hishel.AsyncRedisStorage
+    ] | None:
+        """Initialize hishel async cache storage."""
+        if not self.use_cache:
+            return None
+
+        cache_type: str | None = self.cache_type
+
+        if cache_type == "redis" and not importlib.util.find_spec("redis"):
+            self.logger.warning(
+                "Redis cache requires the 'redis' package. Falling back to a file cache."
+            )
+            cache_type = "file"
+
+        match cache_type:
+            case None:
+                return None
+            case "sqlite":
+                ## Same database & storage as the sync controller, queries run in the loop's thread pool
+                return cache.get_async_sqlite_cache_storage(
+                    cache_db_path=self.cache_db_file,
+                    ttl=self.cache_ttl,
+                    check_ttl_every=self.check_ttl_every or 60,
+                )
+            case "file":
+                return cache.get_async_file_cache_storage(
+                    base_path=self.cache_file_dir or ".cache/http/hishel",
+                    ttl=self.cache_ttl,
+                    check_ttl_every=self.check_ttl_every,
+                )
+            case "redis":
+                return cache.get_async_redis_cache_storage(
+                    redis_url=self.cache_redis_url or "redis://localhost:6379/0",
+                    ttl=self.cache_ttl,
+                )
+            case _:
+                self.logger.error(f"Unrecognized cache type: {self.cache_type}")
+
+                return None
+
+    async def send_request(
         self,
         request: httpx.Request,
         auth: t.Union[
@@ -395,8 +1132,17 @@ class HttpxController(AbstractContextManager):
             (httpx.Response): An HTTPX Response object with the response's data.
 
         """
+        if self.client is None:
+            raise RuntimeError(
+                "AsyncHttpxController client is not open. Use 'async with' before sending requests."
+            )
+
         try:
-            res: httpx.Response = self.client.send(request, stream=stream, auth=auth)
+            res: httpx.Response = await self.client.send(
+                request, stream=stream, auth=auth
+            )
+            if self.cache_transport is not None:
+                self.cache_stats.record(res)
 
             return res
         except Exception as exc:
@@ -404,3 +1150,46 @@ class HttpxController(AbstractContextManager):
             self.logger.error(msg)
 
             raise exc
+
+    def _get_uncached_client(self) -> httpx.AsyncClient:
+        """Return an httpx.AsyncClient that sends requests straight through the pooled base transport, skipping the cache.
+
+        Description:
+            hishel reads a whole response body (and stores it) before returning it, so streamed downloads use this
+            client instead. It shares the main client's connection pool, rate limiter & retry policy.
+
+        """
+        if self.uncached_client is None:
+            self.uncached_client = httpx.AsyncClient(
+                transport=self.transport_base,
+                follow_redirects=self.follow_redirects,
+                timeout=self.timeout,
+            )
+
+        return self.uncached_client
+
+    async def send_uncached_request(
+        self,
+        request: httpx.Request,
+        auth: t.Union[
+            t.Tuple[t.Union[str, bytes], t.Union[str, bytes]],
+            t.Callable[[httpx.Request], httpx.Request],
+            httpx.Auth,
+        ] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send a request around the hishel cache. See `HttpxController.send_uncached_request()`."""
+        if self.client is None:
+            raise RuntimeError(
+                "AsyncHttpxController client is not open. Use 'async with' before sending requests."
+            )
+
+        try:
+            return await self._get_uncached_client().send(
+                request, stream=stream, auth=auth
+            )
+        except Exception as exc:
+            msg = f"({type(exc)}) Error sending uncached request. Details: {exc}"
+            self.logger.error(msg)
+
+            raise exc
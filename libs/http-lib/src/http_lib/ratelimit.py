@@ -0,0 +1,491 @@
+"""Per-host rate limiting & retry with backoff for httpx transports.
+
+Description:
+    `RateLimiter` keeps one token bucket per host, stored as a "theoretical arrival time" (the GCRA form of a
+    token bucket), so reserving a request slot is a single read & write. Buckets live in process memory, or in
+    Redis when a `redis_url` is given, so every worker sharing the Redis server shares one request budget.
+
+    `RetryPolicy` retries 429/5xx responses & timeouts with jittered exponential backoff, honoring `Retry-After`.
+
+    `RateLimitedTransport`/`AsyncRateLimitedTransport` wrap the pooled base transport, underneath the hishel cache
+    transport, so responses served from the cache are not throttled.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import datetime as dt
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import importlib.util
+import logging
+import random
+import threading
+import time
+import typing as t
+
+log = logging.getLogger(__name__)
+
+import httpx
+
+## Reserve a request slot in a Redis-backed bucket. Uses the Redis server's clock, so workers on different hosts agree on time.
+##   KEYS[1]: bucket key
+##   ARGV[1]: seconds between requests at the bucket's rate
+##   ARGV[2]: seconds of burst tolerance
+##   ARGV[3]: seconds to block the bucket for (Retry-After); when > 0, no slot is reserved & the burst is used up
+##   Returns: seconds the caller must wait before sending, as a string
+_REDIS_GCRA_SCRIPT: str = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local block = tonumber(ARGV[3])
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+if block > 0 then
+    tat = math.max(tat, now + block + tolerance)
+    redis.call('SET', KEYS[1], string.format('%.6f', tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+    return '0'
+end
+
+local delay = tat - tolerance - now
+if delay < 0 then
+    delay = 0
+end
+
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], string.format('%.6f', new_tat), 'PX', math.ceil((new_tat - now) * 1000) + 1000)
+
+return string.format('%.6f', delay)
+"""
+
+
+class RateLimiter:
+    """Per-host token bucket rate limiter with adaptive rate.
+
+    Description:
+        Each call to `reserve()` takes a slot from the host's bucket and returns how long the caller must wait before
+        sending. Up to `burst` requests are sent without waiting, after which requests are spaced `1 / rate` seconds apart.
+
+        When a host responds with 429/503, `throttle()` halves that host's rate (down to `min_rate`) and, if the server
+        sent `Retry-After`, blocks the bucket until then. Each successful response raises the rate back toward `rate`
+        in small steps, so throughput settles at the highest rate the server accepts instead of swinging between
+        bursts & failures.
+
+    Params:
+        rate (float): (default: 10.0) Maximum requests per second, per host.
+        burst (int): (default: 20) Number of requests that can be sent at once before the rate applies.
+        min_rate (float | None): Lowest rate `throttle()` can reduce a host to. Defaults to 1/16th of `rate`.
+        redis_url (str | None): When set, buckets are kept in Redis so every process using the same server shares one budget.
+            Requires the `redis` package. If Redis cannot be reached, the limiter falls back to in-process buckets
+            for `redis_cooldown` seconds, then tries Redis again.
+        key_prefix (str): (default: "http_lib:ratelimit") Prefix for Redis bucket keys.
+        redis_cooldown (float): (default: 30.0) Seconds to use in-process buckets after a Redis error, before trying
+            Redis again. Every process falling back gets its own budget, so keep it short.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        min_rate: float | None = None,
+        redis_url: str | None = None,
+        key_prefix: str = "http_lib:ratelimit",
+        redis_cooldown: float = 30.0,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be a positive number. Got: {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be a positive integer. Got: {burst}")
+
+        self.rate: float = rate
+        self.burst: int = burst
+        self.min_rate: float = min_rate or rate / 16
+        self.redis_url: str | None = redis_url
+        self.key_prefix: str = key_prefix
+        self.redis_cooldown: float = redis_cooldown
+
+        ## Current (adapted) rate for each host
+        self._host_rates: dict[str, float] = {}
+        ## In-process buckets: host -> theoretical arrival time of the next request
+        self._tats: dict[str, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        ## Placeholder for the Redis client & registered GCRA script
+        self._redis: t.Any | None = None
+        self._redis_script: t.Any | None = None
+        ## time.monotonic() until which slots are reserved in-process after a Redis error. 0 while Redis is in use
+        self._redis_retry_at: float = 0
+
+        self.logger: logging.Logger = log.getChild("RateLimiter")
+
+    def get_rate(self, host: str) -> float:
+        """Return the current requests per second for a host."""
+        return self._host_rates.get(host, self.rate)
+
+    def _get_redis_script(self) -> t.Any | None:
+        if not self.redis_url:
+            return None
+
+        if self._redis_script is not None:
+            return self._redis_script
+
+        if not importlib.util.find_spec("redis"):
+            self.logger.warning(
+                "Shared rate limiting requires the 'redis' package. Falling back to in-process rate limiting."
+            )
+            self.redis_url = None
+
+            return None
+
+        import redis
+
+        ## Fail fast when Redis is down, reserve() falls back to in-process buckets
+        self._redis = redis.Redis.from_url(
+            self.redis_url, socket_connect_timeout=5, socket_timeout=5
+        )
+        self._redis_script = self._redis.register_script(_REDIS_GCRA_SCRIPT)
+
+        return self._redis_script
+
+    def _reserve(self, host: str, block: float = 0) -> float:
+        interval: float = 1 / self.get_rate(host)
+        tolerance: float = interval * (self.burst - 1)
+
+        ## After a Redis error, only this process's buckets are used until the cooldown ends
+        script = (
+            self._get_redis_script()
+            if time.monotonic() >= self._redis_retry_at
+            else None
+        )
+        if script is not None:
+            try:
+                delay: float = float(
+                    script(
+                        keys=[f"{self.key_prefix}:{host}"],
+                        args=[interval, tolerance, block],
+                    )
+                )
+            except Exception as exc:
+                with self._lock:
+                    ## Several threads can fail at once, log once per cooldown
+                    already_falling_back: bool = time.monotonic() < self._redis_retry_at
+                    self._redis_retry_at = time.monotonic() + self.redis_cooldown
+
+                if not already_falling_back:
+                    self.logger.warning(
+                        f"({type(exc)}) Error reserving rate limit slot in Redis, using in-process rate limiting for {self.redis_cooldown}s. Details: {exc}"
+                    )
+            else:
+                if self._redis_retry_at:
+                    self._redis_retry_at = 0
+                    self.logger.info("Reserving rate limit slots in Redis again.")
+
+                return delay
+
+        with self._lock:
+            now: float = time.monotonic()
+            tat: float = max(self._tats.get(host, now), now)
+
+            if block > 0:
+                ## Push past the burst tolerance too, so no request is allowed before the block ends
+                self._tats[host] = max(tat, now + block + tolerance)
+
+                return 0
+
+            self._tats[host] = tat + interval
+
+            return max(0, tat - tolerance - now)
+
+    def reserve(self, host: str) -> float:
+        """Take a slot from the host's bucket, returning the number of seconds to wait before sending."""
+        return self._reserve(host)
+
+    def block(self, host: str, seconds: float) -> None:
+        """Stop sending requests to a host for `seconds`, i.e. when it responds with `Retry-After`."""
+        if seconds > 0:
+            self._reserve(host, block=seconds)
+
+    def wait(self, host: str) -> float:
+        """Reserve a slot & sleep until it is due. Returns the number of seconds slept."""
+        delay: float = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
+
+    async def async_wait(self, host: str) -> float:
+        """Async version of `wait()`."""
+        if self.redis_url:
+            ## Redis calls block, keep them off the event loop
+            delay: float = await asyncio.to_thread(self.reserve, host)
+        else:
+            delay = self.reserve(host)
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        return delay
+
+    def throttle(self, host: str, retry_after: float | None = None) -> None:
+        """Slow down requests to a host after it responds with 429/503."""
+        new_rate: float = max(self.min_rate, self.get_rate(host) / 2)
+        self._host_rates[host] = new_rate
+
+        self.logger.warning(
+            f"Throttled by {host}, reducing rate to {new_rate:.2f} request(s)/second."
+        )
+
+        if retry_after:
+            self.block(host, retry_after)
+
+    def recover(self, host: str) -> None:
+        """Raise a throttled host's rate back toward the configured rate after a successful response."""
+        current_rate: float | None = self._host_rates.get(host)
+        if current_rate is None:
+            return
+
+        new_rate: float = current_rate + self.rate / 20
+        if new_rate >= self.rate:
+            self._host_rates.pop(host, None)
+        else:
+            self._host_rates[host] = new_rate
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When & how long to wait before retrying a failed request.
+
+    Params:
+        max_retries (int): (default: 3) Maximum number of retries after the first attempt.
+        backoff_base (float): (default: 0.5) Seconds to back off after the first failure, doubled on each retry.
+        backoff_max (float): (default: 30.0) Longest backoff between retries, in seconds.
+        max_retry_after (float): (default: 120.0) Longest `Retry-After` that is honored, in seconds.
+        retry_statuses (tuple[int]): Response status codes that are retried.
+        retry_methods (tuple[str]): HTTP methods that are retried. Only idempotent methods are retried by default.
+    """
+
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    max_retry_after: float = 120.0
+    retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504)
+    retry_methods: tuple[str, ...] = ("GET", "HEAD", "OPTIONS")
+
+    def can_retry(self, request: httpx.Request, attempt: int) -> bool:
+        return attempt < self.max_retries and request.method in self.retry_methods
+
+    def should_retry(self, request: httpx.Request, response: httpx.Response, attempt: int) -> bool:
+        return response.status_code in self.retry_statuses and self.can_retry(request, attempt)
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, so retrying clients spread out instead of retrying in lockstep."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+
+    def get_retry_after(self, response: httpx.Response) -> float | None:
+        """Parse a response's `Retry-After` header (seconds or an HTTP date), capped at `max_retry_after`."""
+        retry_after: str | None = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
+
+        try:
+            seconds: float = float(retry_after)
+        except ValueError:
+            try:
+                retry_at: dt.datetime = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                return None
+
+            seconds = (retry_at - dt.datetime.now(dt.timezone.utc)).total_seconds()
+
+        return min(max(0, seconds), self.max_retry_after)
+
+    def get_delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """Return the number of seconds to wait before retry number `attempt + 1`."""
+        if response is not None:
+            retry_after: float | None = self.get_retry_after(response)
+            if retry_after is not None:
+                return retry_after
+
+        return self.backoff(attempt)
+
+
+class _RateLimitMixin:
+    """Shared bookkeeping for the sync & async rate limited transports."""
+
+    rate_limiter: RateLimiter | None
+    retry_policy: RetryPolicy | None
+    logger: logging.Logger
+
+    def _handle_response(
+        self, request: httpx.Request, response: httpx.Response, attempt: int
+    ) -> float | None:
+        """Record a response with the rate limiter. Returns the seconds to wait before retrying, or `None` to return the response."""
+        host: str = request.url.host
+        retry_after: float | None = (
+            self.retry_policy.get_retry_after(response) if self.retry_policy else None
+        )
+        ## True when the host was blocked in the rate limiter until Retry-After
+        blocked: bool = False
+
+        if response.status_code in (429, 503) and self.rate_limiter:
+            self.rate_limiter.throttle(host, retry_after=retry_after)
+            blocked = bool(retry_after)
+        elif response.status_code < 400 and self.rate_limiter:
+            self.rate_limiter.recover(host)
+
+        if not self.retry_policy or not self.retry_policy.should_retry(
+            request, response, attempt
+        ):
+            return None
+
+        if blocked:
+            ## Waiting for the host's next slot in the rate limiter covers Retry-After
+            delay: float = 0
+        else:
+            ## Back off at least until Retry-After, i.e. for a 502/504 that sent one but did not throttle the host
+            delay = max(self.retry_policy.get_delay(attempt), retry_after or 0)
+
+        self.logger.warning(
+            f"[{response.status_code}] response from {request.url}, retrying in {retry_after if blocked else delay:.2f}s (retry {attempt + 1}/{self.retry_policy.max_retries})."
+        )
+
+        return delay
+
+    def _handle_error(
+        self, request: httpx.Request, exc: Exception, attempt: int
+    ) -> float | None:
+        """Return the seconds to wait before retrying a request that timed out or failed to connect, or `None` to re-raise."""
+        if not self.retry_policy or not self.retry_policy.can_retry(request, attempt):
+            return None
+
+        delay: float = self.retry_policy.get_delay(attempt)
+        self.logger.warning(
+            f"({type(exc).__name__}) requesting {request.url}, retrying in {delay:.2f}s (retry {attempt + 1}/{self.retry_policy.max_retries})."
+        )
+
+        return delay
+
+
+class RateLimitedTransport(_RateLimitMixin, httpx.BaseTransport):
+    """httpx transport that rate limits & retries requests sent through a wrapped transport.
+
+    Params:
+        transport (httpx.BaseTransport): The transport requests are sent through, i.e. a pooled `httpx.HTTPTransport`.
+        rate_limiter (RateLimiter | None): Per-host rate limiter. When `None`, requests are not rate limited.
+        retry_policy (RetryPolicy | None): Retry policy. When `None`, requests are not retried.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        self.transport: httpx.BaseTransport = transport
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.retry_policy: RetryPolicy | None = retry_policy
+
+        self.logger: logging.Logger = log.getChild("RateLimitedTransport")
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt: int = 0
+
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.wait(request.url.host)
+
+            try:
+                response: httpx.Response = self.transport.handle_request(request)
+            except (httpx.TimeoutException, httpx.NetworkError) as exc:
+                delay: float | None = self._handle_error(request, exc, attempt)
+                if delay is None:
+                    raise
+
+                time.sleep(delay)
+                attempt += 1
+
+                continue
+
+            delay = self._handle_response(request, response, attempt)
+            if delay is None:
+                return response
+
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(_RateLimitMixin, httpx.AsyncBaseTransport):
+    """Async version of `RateLimitedTransport`."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        self.transport: httpx.AsyncBaseTransport = transport
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.retry_policy: RetryPolicy | None = retry_policy
+
+        self.logger: logging.Logger = log.getChild("AsyncRateLimitedTransport")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt: int = 0
+
+        while True:
+            if self.rate_limiter:
+                await self.rate_limiter.async_wait(request.url.host)
+
+            try:
+                response: httpx.Response = await self.transport.handle_async_request(
+                    request
+                )
+            except (httpx.TimeoutException, httpx.NetworkError) as exc:
+                delay: float | None = self._handle_error(request, exc, attempt)
+                if delay is None:
+                    raise
+
+                await asyncio.sleep(delay)
+                attempt += 1
+
+                continue
+
+            delay = self._handle_response(request, response, attempt)
+            if delay is None:
+                return response
+
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(
+    rate: float = 10.0, burst: int = 20, redis_url: str | None = None
+) -> RateLimiter:
+    """Return the process-wide RateLimiter for a configuration, so every controller in the process shares one budget per host.
+
+    Params:
+        rate (float): (default: 10.0) Maximum requests per second, per host.
+        burst (int): (default: 20) Number of requests that can be sent at once before the rate applies.
+        redis_url (str | None): Keep buckets in Redis, sharing the budget with other processes.
+
+    Returns:
+        (RateLimiter): A memoized RateLimiter.
+
+    """
+    return RateLimiter(rate=rate, burst=burst, redis_url=redis_url)
@@ -0,0 +1,169 @@
+"""Persist HTTP cache validators (ETag/Last-Modified) to send conditional requests.
+
+Validators are stored per (scope, URL) in a small SQLite database. The scope lets separate jobs poll the same
+URL without one job's 304 hiding a change from another.
+
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+import time
+import typing as t
+
+log = logging.getLogger(__name__)
+
+import httpx
+
+@dataclass(frozen=True)
+class Validators:
+    """Validators saved from a previous response.
+
+    Params:
+        etag (str | None): The response's `ETag` header.
+        last_modified (str | None): The response's `Last-Modified` header.
+    """
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def as_headers(self) -> dict[str, str]:
+        """Return the conditional request headers for these validators."""
+        headers: dict[str, str] = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class ValidatorStore:
+    """SQLite-backed store of response validators, keyed by (scope, URL).
+
+    Params:
+        db_file (str): (default: ".cache/http/validators.sqlite3") Path to the SQLite database file.
+    """
+
+    def __init__(self, db_file: str = ".cache/http/validators.sqlite3"):
+        self.db_file: str = db_file
+
+        self._conn: sqlite3.Connection | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+        self.logger: logging.Logger = log.getChild("ValidatorStore")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database & create the validators table on first use."""
+        if self._conn is not None:
+            return self._conn
+
+        Path(self.db_file).parent.mkdir(parents=True, exist_ok=True)
+
+        conn: sqlite3.Connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS validators (
+                scope TEXT NOT NULL,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (scope, url)
+            )"""
+        )
+        conn.commit()
+
+        self._conn = conn
+
+        return conn
+
+    def get(self, url: t.Union[str, httpx.URL], scope: str = "default") -> Validators | None:
+        """Return the saved validators for a URL, or `None` if there are none."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT etag, last_modified FROM validators WHERE scope = ? AND url = ?",
+                    (scope, str(url)),
+                )
+                .fetchone()
+            )
+
+        if not row:
+            return None
+
+        return Validators(etag=row[0], last_modified=row[1])
+
+    def set(
+        self,
+        url: t.Union[str, httpx.URL],
+        etag: str | None = None,
+        last_modified: str | None = None,
+        scope: str = "default",
+    ) -> None:
+        """Save validators for a URL, replacing any saved before."""
+        with self._lock:
+            conn: sqlite3.Connection = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO validators (scope, url, etag, last_modified, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (scope, str(url), etag, last_modified, time.time()),
+            )
+            conn.commit()
+
+    def delete(self, url: t.Union[str, httpx.URL], scope: str = "default") -> None:
+        """Forget the validators for a URL, so the next request is unconditional."""
+        with self._lock:
+            conn: sqlite3.Connection = self._connect()
+            conn.execute("DELETE FROM validators WHERE scope = ? AND url = ?", (scope, str(url)))
+            conn.commit()
+
+    def apply(self, request: httpx.Request, scope: str = "default") -> httpx.Request:
+        """Add conditional headers (`If-None-Match`/`If-Modified-Since`) to a request, if validators are saved for its URL."""
+        validators: Validators | None = self.get(url=request.url, scope=scope)
+
+        if validators:
+            request.headers.update(validators.as_headers())
+
+        return request
+
+    def update_from_response(self, response: httpx.Response, scope: str = "default") -> bool:
+        """Save the validators from a 200 response. Returns `True` if any validators were saved."""
+        if response.status_code != 200:
+            return False
+
+        etag: str | None = response.headers.get("ETag")
+        last_modified: str | None = response.headers.get("Last-Modified")
+
+        if not etag and not last_modified:
+            self.logger.debug(f"Response from {response.request.url} has no ETag or Last-Modified header.")
+
+            return False
+
+        self.set(url=response.request.url, etag=etag, last_modified=last_modified, scope=scope)
+
+        return True
+
+    def close(self) -> None:
+        """Close the SQLite connection. It is reopened if the store is used again."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def get_validator_store(db_file: str = ".cache/http/validators.sqlite3") -> ValidatorStore:
+    """Return an initialized ValidatorStore.
+
+    Params:
+        db_file (str): (default: ".cache/http/validators.sqlite3") Path to the SQLite database file.
+
+    Returns:
+        (ValidatorStore): A store for response validators. The database is opened on first use.
+
+    """
+    return ValidatorStore(db_file=db_file)
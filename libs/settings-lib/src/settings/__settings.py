@@ -9,6 +9,8 @@ __all__ = [
     "CELERY_SETTINGS",
     "FASTAPI_SETTINGS",
     "UVICORN_SETTINGS",
+    "MINIO_SETTINGS",
+    "IMAGE_STORE_SETTINGS",
 ]
 
 LOGGING_SETTINGS = get_namespace("logging")
@@ -17,3 +19,5 @@ DATABASE_SETTINGS = get_namespace("database")
 CELERY_SETTINGS = get_namespace("celery")
 FASTAPI_SETTINGS = get_namespace("fastapi")
 UVICORN_SETTINGS = get_namespace("uvicorn")
+MINIO_SETTINGS = get_namespace("minio")
+IMAGE_STORE_SETTINGS = get_namespace("image_store")
@@ -1,18 +1,118 @@
 from __future__ import annotations
 
+from glob import glob, has_magic
+import os
+import sys
+import typing as t
+
 from dynaconf import Dynaconf
 
-__all__ = ["SETTINGS", "get_namespace"]
+__all__ = ["SETTINGS", "SETTINGS_FILES", "get_namespace", "find_settings_files"]
+
+## Settings files to load, relative to the invoked script or the current working directory
+SETTINGS_FILES: list[str] = [
+    "settings.toml",
+    ".secrets.toml",
+    "config/**/settings.toml",
+    "config/**/.secrets.toml",
+]
+
+
+def _walk_to_root(path: str, break_at: str | None = None) -> list[str]:
+    """Return `path` & its `./config` dir, then the same for each parent up to the root (or `break_at`)."""
+    paths: list[str] = []
+    current_dir: str = os.path.abspath(path)
+
+    while True:
+        paths.extend([current_dir, os.path.join(current_dir, "config")])
+
+        parent_dir: str = os.path.dirname(current_dir)
+        if parent_dir == current_dir or (
+            break_at and current_dir == os.path.abspath(break_at)
+        ):
+            return paths
+
+        current_dir = parent_dir
+
+
+def _find_file(
+    filename: str, search_tree: list[str], project_root: str | None = None
+) -> str:
+    if os.path.isabs(filename):
+        return filename if os.path.exists(filename) else ""
+
+    if project_root is not None:
+        search_tree = list(
+            dict.fromkeys(
+                _walk_to_root(project_root, break_at=os.getcwd()) + search_tree
+            )
+        )
+
+    for dirname in search_tree:
+        check_path: str = os.path.join(dirname, filename)
+        if os.path.exists(check_path):
+            return check_path
+
+    return ""
+
+
+def find_settings_files(settings_files: t.Sequence[str]) -> list[str]:
+    """Find settings files the way Dynaconf does, and return their absolute paths.
+
+    Description:
+        Dynaconf searches for each relative settings file in the invoked script's directory & the current working
+        directory, then their parents (and a `./config` dir in each), every time a namespace is loaded. It finds
+        the invoked script with `inspect.stack()`, which reads the source of every frame on the stack & was most
+        of the app's import time. Given absolute paths, Dynaconf skips the search.
+
+    Params:
+        settings_files (Sequence[str]): Settings file names or glob patterns.
+
+    Returns:
+        (list[str]): Absolute paths of the settings files found, in the order Dynaconf loads them.
+
+    """
+    ## The outermost frame is the invoked script, the same frame Dynaconf reads with inspect.stack()[-1]
+    frame = sys._getframe()
+    while frame.f_back is not None:
+        frame = frame.f_back
+
+    script_dir: str = os.path.dirname(os.path.abspath(frame.f_code.co_filename))
+    search_tree: list[str] = list(
+        dict.fromkeys(_walk_to_root(script_dir) + _walk_to_root(os.getcwd()))
+    )
+
+    found_files: list[str] = []
+    for settings_file in settings_files:
+        ## Like Dynaconf, globs & later files are searched from the directory of the first file found
+        project_root: str | None = (
+            os.path.dirname(found_files[0]) if found_files else None
+        )
+
+        if has_magic(settings_file):
+            filenames: list[str] = glob(
+                settings_file,
+                root_dir=project_root,
+                recursive=True,
+                include_hidden=True,
+            )
+        else:
+            filenames = [settings_file]
+
+        for filename in filenames:
+            found: str = _find_file(
+                filename, search_tree=search_tree, project_root=project_root
+            )
+            if found:
+                found_files.append(os.path.abspath(found))
+
+    return found_files
+
 
 ## Initialize Dynaconf object with all configurations
 SETTINGS = Dynaconf(
     environments=True,
-    settings_files=[
-        "settings.toml",
-        ".secrets.toml",
-        "config/**/settings.toml",
-        "config/**/.secrets.toml",
-    ],
+    settings_files=find_settings_files(SETTINGS_FILES),
 )
 
 
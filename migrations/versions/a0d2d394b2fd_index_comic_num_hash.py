@@ -0,0 +1,42 @@
+"""index & backfill xkcd_comic.comic_num_hash
+
+Revision ID: a0d2d394b2fd
+Revises: e778b57501bc
+Create Date: 2026-10-17 20:05:13.418290
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a0d2d394b2fd'
+down_revision: Union[str, None] = 'e778b57501bc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    ## Fill in hashes missing from older rows, so every comic can be looked up by hash
+    xkcd_comic = sa.table('xkcd_comic', sa.column('id', sa.INTEGER()), sa.column('num', sa.INTEGER()), sa.column('comic_num_hash', sa.TEXT()))
+    conn = op.get_bind()
+
+    rows = conn.execute(
+        sa.select(xkcd_comic.c.id, xkcd_comic.c.num).where(sa.or_(xkcd_comic.c.comic_num_hash.is_(None), xkcd_comic.c.comic_num_hash == ''))
+    ).all()
+    if rows:
+        conn.execute(
+            sa.update(xkcd_comic).where(xkcd_comic.c.id == sa.bindparam('row_id')).values(comic_num_hash=sa.bindparam('row_hash')),
+            [{'row_id': row.id, 'row_hash': hashlib.md5(str(row.num).encode('utf-8')).hexdigest()} for row in rows],
+        )
+
+    with op.batch_alter_table('xkcd_comic') as batch_op:
+        batch_op.create_index(batch_op.f('ix_xkcd_comic_comic_num_hash'), ['comic_num_hash'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('xkcd_comic') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_xkcd_comic_comic_num_hash'))
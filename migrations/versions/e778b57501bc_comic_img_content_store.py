@@ -0,0 +1,36 @@
+"""store comic images by content hash
+
+Revision ID: e778b57501bc
+Revises: 2838aca92f65
+Create Date: 2026-10-17 09:12:41.520317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e778b57501bc'
+down_revision: Union[str, None] = '2838aca92f65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('comic_img') as batch_op:
+        batch_op.add_column(sa.Column('img_hash', sa.TEXT(), nullable=True))
+        batch_op.add_column(sa.Column('img_size', sa.INTEGER(), nullable=True))
+        batch_op.add_column(sa.Column('img_mime_type', sa.TEXT(), nullable=True))
+        batch_op.alter_column('img_bytes', existing_type=sa.LargeBinary(), nullable=True)
+        batch_op.create_index(batch_op.f('ix_comic_img_img_hash'), ['img_hash'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('comic_img') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_comic_img_img_hash'))
+        batch_op.alter_column('img_bytes', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.drop_column('img_mime_type')
+        batch_op.drop_column('img_size')
+        batch_op.drop_column('img_hash')
@@ -202,6 +202,36 @@ def run_tests(session: nox.Session):
     )
 
 
+## Check entry point import times against a budget
+@nox.session(python=DEFAULT_PYTHON, name="import-budget", tags=["quality"])
+def run_import_budget_check(session: nox.Session):
+    install_uv_project(session)
+
+    log.info("Checking entry point import times with python -X importtime")
+    session.run(
+        "uv",
+        "run",
+        "python",
+        "scripts/importtime/check_import_budget.py",
+        *session.posargs,
+    )
+
+
+## Benchmark the XKCD API controllers & database saves against a local fake xkcd.com
+@nox.session(python=DEFAULT_PYTHON, name="benchmarks", tags=["quality"])
+def run_benchmarks(session: nox.Session):
+    install_uv_project(session)
+
+    log.info("Running benchmarks against a local fake xkcd.com")
+    session.run(
+        "uv",
+        "run",
+        "python",
+        "benchmarks/run_benchmarks.py",
+        *session.posargs,
+    )
+
+
 @nox.session(name="init-clone-setup")
 def run_init_clone_setup(session: nox.Session):
     install_uv_project(session)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from . import constants
 from .models import XkcdComicImageModel, XkcdComicModel, XkcdCurrentComicMetadataModel
+from .records import XkcdComicRecord
 from .repository import (
     XkcdComicImageRepository,
     XkcdComicRepository,
@@ -18,4 +19,6 @@ from .schemas import (
     XkcdComicWithImgOut,
     XkcdCurrentComicMetadataIn,
     XkcdCurrentComicMetadataOut,
+    get_comic_num_hash,
+    get_comic_num_hashes,
 )
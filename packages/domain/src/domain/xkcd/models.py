@@ -40,7 +40,7 @@ class XkcdComicModel(db_lib.Base):
     alt_text: so.Mapped[str] = so.mapped_column(__name_pos=sa.TEXT)
     img_url: so.Mapped[str] = so.mapped_column(sa.TEXT)
     img_saved: so.Mapped[bool] = so.mapped_column(sa.BOOLEAN, default=False)
-    comic_num_hash: so.Mapped[str] = so.mapped_column(sa.TEXT)
+    comic_num_hash: so.Mapped[str] = so.mapped_column(sa.TEXT, index=True)
 
 
 class XkcdCurrentComicMetadataModel(db_lib.Base):
@@ -60,7 +60,12 @@ class XkcdComicImageModel(db_lib.Base):
     id: so.Mapped[db_lib.annotated.INT_PK]
 
     num: so.Mapped[int] = so.mapped_column(sa.INTEGER)
-    img_bytes: so.Mapped[bytes] = so.mapped_column(sa.LargeBinary)
+    ## Legacy inline image bytes. New images are saved in an image store & referenced by img_hash.
+    #  Deferred so listing rows does not load image blobs.
+    img_bytes: so.Mapped[bytes | None] = so.mapped_column(sa.LargeBinary, deferred=True)
+    img_hash: so.Mapped[str | None] = so.mapped_column(sa.TEXT, index=True)
+    img_size: so.Mapped[int | None] = so.mapped_column(sa.INTEGER)
+    img_mime_type: so.Mapped[str | None] = so.mapped_column(sa.TEXT)
 
     def __repr__(self):
-        return f"XkcdComicImageModel(id={self.id or None}, num={self.num})"
+        return f"XkcdComicImageModel(id={self.id or None}, num={self.num}, img_hash={self.img_hash})"
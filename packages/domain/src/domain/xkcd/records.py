@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import typing as t
+
+from .constants import XKCD_URL_BASE
+from .models import XkcdComicModel
+from .schemas import XkcdComicIn, get_comic_num_hash
+
+import pydantic_core
+
+## XkcdComicModel columns a comic record fills, in table order
+COMIC_ROW_COLUMNS: t.Tuple[str, ...] = ("year", "month", "day", "num", "link", "title", "transcript", "alt_text", "img_url", "comic_num_hash")
+
+
+@dataclass(slots=True)
+class XkcdComicRecord:
+    """A lightweight comic for bulk crawls.
+
+    Description:
+        Holds the same data as `XkcdComicIn` in a slotted dataclass, without pydantic validation or computed
+        fields. `link` & `comic_num_hash` are derived once when the record is created, not on every dump, and
+        `to_row()` returns the dict `BaseRepository.upsert_all()` inserts, so a batch converts to
+        `XkcdComicModel` rows without going through pydantic.
+
+        Records are not frozen, frozen dataclasses are several times slower to create. Treat them as read-only,
+        the derived fields are not updated if `num` changes.
+
+        Use `XkcdComicIn` where validation matters (i.e. data from users), and records where thousands of comics
+        from the XKCD API are held in memory at once.
+
+    Params:
+        num (int): Comic number.
+        year (str): Published year.
+        month (str): Published month.
+        day (str): Published day.
+        title (str): Comic title.
+        transcript (str | None): Comic transcript.
+        alt_text (str | None): Comic alt text.
+        img_url (str | None): Link to comic image.
+    """
+
+    num: int
+    year: str | None = None
+    month: str | None = None
+    day: str | None = None
+    title: str | None = None
+    transcript: str | None = None
+    alt_text: str | None = None
+    img_url: str | None = None
+
+    link: str = field(init=False, repr=False, compare=False)
+    comic_num_hash: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.link = f"{XKCD_URL_BASE}/{self.num}"
+        self.comic_num_hash = get_comic_num_hash(self.num)
+
+    @classmethod
+    def from_api_dict(cls, data: dict) -> XkcdComicRecord:
+        """Create a record from a comic in the XKCD JSON API's format (`alt` & `img` keys)."""
+        try:
+            num: int = int(data["num"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"XKCD API comic is missing a valid 'num'. Got: {data.get('num') if isinstance(data, dict) else data!r}") from exc
+
+        return cls(
+            num=num,
+            year=data.get("year"),
+            month=data.get("month"),
+            day=data.get("day"),
+            title=data.get("title"),
+            transcript=data.get("transcript"),
+            alt_text=data.get("alt"),
+            img_url=data.get("img"),
+        )
+
+    @classmethod
+    def from_json(cls, content: t.Union[bytes, str]) -> XkcdComicRecord:
+        """Create a record from an XKCD JSON API response body, parsed with pydantic's JSON parser."""
+        return cls.from_api_dict(pydantic_core.from_json(content))
+
+    @classmethod
+    def from_comic(cls, comic: XkcdComicIn) -> XkcdComicRecord:
+        """Create a record from an `XkcdComicIn` (or `XkcdComicOut`)."""
+        return cls(num=comic.num, year=comic.year, month=comic.month, day=comic.day, title=comic.title, transcript=comic.transcript, alt_text=comic.alt_text, img_url=comic.img_url)
+
+    def to_row(self) -> dict:
+        """Return the record as a dict of `XkcdComicModel` column values."""
+        return {column: getattr(self, column) for column in COMIC_ROW_COLUMNS}
+
+    def to_model(self) -> XkcdComicModel:
+        """Return the record as a new, unsaved `XkcdComicModel`."""
+        return XkcdComicModel(**self.to_row())
+
+    def to_comic(self) -> XkcdComicIn:
+        """Return the record as a validated `XkcdComicIn`."""
+        return XkcdComicIn(year=self.year, month=self.month, day=self.day, num=self.num, title=self.title, transcript=self.transcript, alt=self.alt_text, img=self.img_url)
@@ -20,6 +20,41 @@ class XkcdComicRepository(db_lib.base.BaseRepository[XkcdComicModel]):
     def get_multiple_by_num(self, comic_nums: list[int]) -> list[XkcdComicModel] | None:
         return self.session.query(XkcdComicModel).filter(XkcdComicModel.num.in_(comic_nums)).all()
 
+    def get_by_num_hash(self, comic_num_hash: str) -> XkcdComicModel | None:
+        return self.session.query(XkcdComicModel).filter(XkcdComicModel.comic_num_hash == comic_num_hash).one_or_none()
+
+    def get_complete_comic_nums(self) -> set[int]:
+        """Return the set of comic numbers that have both a comic and an image saved.
+
+        Description:
+            Uses a single query (an outer join against the image table) instead of loading models, so
+            the cost is one round trip regardless of archive size. A comic counts as complete when its
+            `img_saved` flag is set, or when a matching row exists in the image table.
+        """
+        stmt = (
+            sa.select(XkcdComicModel.num)
+            .outerjoin(XkcdComicImageModel, XkcdComicImageModel.num == XkcdComicModel.num)
+            .where(sa.or_(XkcdComicModel.img_saved.is_(True), XkcdComicImageModel.id.is_not(None)))
+        )
+
+        return set(self.session.execute(stmt).scalars().all())
+
+    def set_img_saved(self, comic_nums: list[int], img_saved: bool = True, commit: bool = True) -> int:
+        """Set the `img_saved` flag for multiple comics in a single UPDATE, returning the number of rows changed."""
+        if not comic_nums:
+            return 0
+
+        stmt = (
+            sa.update(XkcdComicModel)
+            .where(XkcdComicModel.num.in_(comic_nums), XkcdComicModel.img_saved.is_not(img_saved))
+            .values(img_saved=img_saved)
+        )
+        result = self.session.execute(stmt)
+        if commit:
+            self.session.commit()
+
+        return result.rowcount
+
 
 class XkcdComicImageRepository(db_lib.base.BaseRepository[XkcdComicModel]):
     def __init__(self, session: so.Session):
@@ -57,3 +92,26 @@ class XkcdCurrentComicMetadataRepository(db_lib.base.BaseRepository[XkcdCurrentC
             db_comic_metadata: XkcdCurrentComicMetadataModel = self.create(comic_metadata)
             
             return db_comic_metadata
+
+    def set_current(self, num: int, last_updated: t.Any, commit: bool = True) -> XkcdCurrentComicMetadataModel:
+        """Point the metadata row at a new current comic, creating the row if it does not exist.
+
+        Description:
+            Unlike `create_or_update()`, the commit can be deferred (`commit=False`) so the metadata is
+            updated in the same transaction as the comic it points to.
+        """
+        existing_entity: XkcdCurrentComicMetadataModel | None = self.session.get(XkcdCurrentComicMetadataModel, 1)
+
+        if existing_entity:
+            existing_entity.num = num
+            existing_entity.last_updated = last_updated
+        else:
+            existing_entity = XkcdCurrentComicMetadataModel(id=1, num=num, last_updated=last_updated)
+            self.session.add(existing_entity)
+
+        self.session.flush()
+
+        if commit:
+            self.session.commit()
+
+        return existing_entity
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
+from functools import cached_property, lru_cache
 import typing as t
 
 from .constants import XKCD_URL_BASE
@@ -16,9 +17,23 @@ from pydantic import (
     field_validator,
 )
 
+@lru_cache(maxsize=16384)
+def get_comic_num_hash(comic_num: t.Union[int, str]) -> str:
+    """Return a comic number's `comic_num_hash`, memoized across comics."""
+    return hash_utils.get_hash_from_str(input_str=str(comic_num))
+
+
+def get_comic_num_hashes(comic_nums: t.Iterable[t.Union[int, str]]) -> list[str]:
+    """Return the `comic_num_hash` of many comic numbers at once, i.e. for bulk saves."""
+    return hash_utils.get_hashes_from_strs(input_strs=comic_nums)
+
+
 class XkcdComicImgBase(BaseModel):
     num: t.Union[str, int] = Field(default=None)
-    img_bytes: bytes = Field(default=None, repr=False)
+    img_bytes: bytes | None = Field(default=None, repr=False)
+    img_hash: str | None = Field(default=None)
+    img_size: int | None = Field(default=None)
+    img_mime_type: str | None = Field(default=None)
     
     
 class XkcdComicImgIn(XkcdComicImgBase):
@@ -46,11 +61,12 @@ class XkcdComicBase(BaseModel):
 
         return _link
 
+    ## Computed once per comic, not on every read/dump. Not recomputed if num is changed after creation
     @computed_field
-    @property
+    @cached_property
     def comic_num_hash(self) -> str:
         try:
-            _hash: str = hash_utils.get_hash_from_str(input_str=str(self.num))
+            _hash: str = get_comic_num_hash(self.num)
 
             return _hash
         except Exception as exc:
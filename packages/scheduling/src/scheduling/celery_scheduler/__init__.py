@@ -6,8 +6,11 @@ from .celeryapp import check_task
 from .celeryconfig import (
     CelerySettings,
     celery_settings,
+    return_http_cache_redis_url,
     return_rabbitmq_url,
+    return_rate_limit_redis_url,
     return_redis_url,
 )
+from .local_executor import LocalAsyncResult, LocalTaskExecutor
 from .start_celery import beat, worker
 from .utils import execute_celery_task, get_celery_tasks_list, watch_celery_task
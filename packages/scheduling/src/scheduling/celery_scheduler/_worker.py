@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import subprocess
 
-from . import celeryapp
+from . import celeryapp, routing
 
 from celery import Celery
 from loguru import logger as log
@@ -13,22 +13,43 @@ APP_SETTINGS = settings.get_namespace("app")
 CELERY_SETTINGS = settings.get_namespace("celery")
 
 
-def start_celery_worker(app: Celery = celeryapp.app):
+def start_celery_worker(app: Celery = celeryapp.app, queues: str | list[str] | None = None):
     """Starts the Celery worker.
 
+    Description:
+        The worker's concurrency & prefetch multiplier come from the settings of the queues it consumes
+        (see `routing.get_worker_options()`). Workers are named after their queues, i.e. `realtime@<host>`,
+        so several workers can run on one host.
+
     Params:
         app (Celery): An initialized Celery app
+        queues (str | list[str] | None): Queues the worker consumes, i.e. "realtime" or "bulk,maintenance".
+            When empty, the worker consumes every queue.
 
     """
     log.debug(f"Celery app ({type(app)}): {app}")
 
+    queue_names: list[str] = routing.parse_queues(queues)
+    worker_options: dict[str, int] = routing.get_worker_options(queue_names)
+
     app.autodiscover_tasks(
         packages=["scheduling.celery_scheduler.celery_tasks.weatherapi_tasks"]
     )
 
-    log.info("Starting Celery worker")
+    log.info(f"Starting Celery worker for queue(s) {queue_names} with options: {worker_options}")
     try:
-        app.worker_main(argv=["worker", "--loglevel=DEBUG", "--uid=0", "--gid=0"])
+        app.worker_main(
+            argv=[
+                "worker",
+                "--loglevel=DEBUG",
+                "--uid=0",
+                "--gid=0",
+                f"--queues={','.join(queue_names)}",
+                f"--hostname={'-'.join(queue_names)}@%h",
+                f"--concurrency={worker_options['concurrency']}",
+                f"--prefetch-multiplier={worker_options['prefetch_multiplier']}",
+            ]
+        )
     except Exception as exc:
         msg = Exception(f"Unhandled exception getting Celery worker. Details: {exc}")
         log.error(msg)
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+from scheduling.celery_scheduler import worker_resources
+from scheduling.celery_scheduler.celery_tasks.xkcd_api_tasks.results import (
+    STATUS_SAVED,
+    comic_task_result,
+)
+
 from celery import current_app, shared_task
 import db_lib
 from depends import db_depends
@@ -14,10 +20,9 @@ import xkcdapi.db_client
 def task_adhoc_current_comic() -> dict:
     log.info("Running adhoc Celery task to request current XKCD comic")
     
-    xkcd_api_controller: xkcdapi.controllers.XkcdApiController = xkcdapi.controllers.XkcdApiController()
-    
     try:
-        current_comic: xkcd_domain.XkcdComicIn = xkcd_api_controller.get_current_comic()
+        with worker_resources.shared_api_controller() as api_ctl:
+            current_comic: xkcd_domain.XkcdComicIn = api_ctl.get_current_comic()
         if not current_comic:
             log.warning("current_comic is None, indicating an error requesting the comic from the XKCD API.")
             return
@@ -43,10 +48,9 @@ def task_adhoc_request_comic(num: int, save: bool = False) -> dict | None:
 
     log.info(f"Running adhoc Celery task to request XKCD comic #{num}")
     
-    xkcd_api_controller: xkcdapi.controllers.XkcdApiController = xkcdapi.controllers.XkcdApiController()
-    
     try:
-        comic, comic_img = xkcd_api_controller.get_comic_and_img(comic_num=num)
+        with worker_resources.shared_api_controller() as api_ctl:
+            comic, comic_img = api_ctl.get_comic_and_img(comic_num=num)
 
         if not comic:
             log.warning("comic is None, indicating an error requesting the comic from the XKCD API.")
@@ -63,9 +67,10 @@ def task_adhoc_request_comic(num: int, save: bool = False) -> dict | None:
         return comic.model_dump()
     
     log.debug(f"Saving comic #{comic.num} to database.")
-    # engine = db_depends.get_db_engine()
+    engine = worker_resources.get_engine()
     
-    db_comic, db_comic_img = xkcdapi.db_client.save_comic_and_img_to_db(comic=comic, comic_img=comic_img)
-    log.success(f"Saved comic #{db_comic.num} and its image to the database.")
+    db_comic, db_comic_img = xkcdapi.db_client.save_comic_and_img_to_db(comic=comic, comic_img=comic_img, engine=engine)
+    log.success(f"Saved comic #{comic.num} and its image to the database.")
     
-    return comic.model_dump()
+    ## Reference the saved image by hash, its bytes do not go through the result backend
+    return comic_task_result(status=STATUS_SAVED, comic=db_comic or comic, comic_img=db_comic_img)
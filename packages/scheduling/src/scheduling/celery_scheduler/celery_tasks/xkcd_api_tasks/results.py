@@ -0,0 +1,50 @@
+"""Compact results for the XKCD Celery tasks.
+
+Task results are stored in the result backend (Redis) until they expire, and read back by anyone waiting on the
+task. Tasks return references to what they saved (comic number & database ID, image hash & size) instead of
+dumping the saved schemas, which can carry a comic image's bytes.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from domain import xkcd as xkcd_domain
+
+## Task result statuses
+STATUS_SAVED: str = "saved"
+STATUS_NOT_MODIFIED: str = "not_modified"
+STATUS_UNCHANGED: str = "unchanged"
+STATUS_FAILED: str = "failed"
+
+
+def comic_ref(comic: t.Union[xkcd_domain.XkcdComicIn, xkcd_domain.XkcdComicOut, xkcd_domain.XkcdComicRecord, None]) -> dict | None:
+    """Return a reference to a comic: its number, title & database ID (when saved)."""
+    if comic is None:
+        return None
+
+    return {"num": comic.num, "id": getattr(comic, "id", None), "title": comic.title}
+
+
+def comic_img_ref(comic_img: t.Union[xkcd_domain.XkcdComicImgIn, xkcd_domain.XkcdComicImgOut, None]) -> dict | None:
+    """Return a reference to a comic image: its number, database ID, content hash, size & MIME type. Never its bytes."""
+    if comic_img is None:
+        return None
+
+    return {"num": comic_img.num, "id": getattr(comic_img, "id", None), "img_hash": comic_img.img_hash, "img_size": comic_img.img_size, "img_mime_type": comic_img.img_mime_type}
+
+
+def comic_task_result(status: str, comic: t.Any = None, comic_img: t.Any = None, **extra: t.Any) -> dict:
+    """Build a task result for a comic & its image.
+
+    Params:
+        status (str): What the task did, i.e. `STATUS_SAVED` or `STATUS_NOT_MODIFIED`.
+        comic (XkcdComicIn | XkcdComicOut | XkcdComicRecord | None): The comic the task requested or saved.
+        comic_img (XkcdComicImgIn | XkcdComicImgOut | None): The comic's image.
+        **extra (Any): Extra JSON-serializable values to include in the result.
+
+    Returns:
+        (dict): A result of a few hundred bytes, i.e. `{"status": "saved", "comic": {"num": 3000, ...}, "img": {...}}`.
+
+    """
+    return {"status": status, "comic": comic_ref(comic), "img": comic_img_ref(comic_img), **extra}
@@ -24,4 +24,20 @@ TASK_SCHEDULE_5m_update_current_comic_metadata = {
         "task": "update_current_comic_metadata",
         "schedule": crontab(minute="*/5")
     }
-}
\ No newline at end of file
+}
+
+## Poll for a new current XKCD comic every 5 minutes, saving the comic, image & metadata only when it changes
+TASK_SCHEDULE_5m_poll_current_comic = {
+    "5m_poll_current_comic": {
+        "task": "poll_current_comic",
+        "schedule": crontab(minute="*/5")
+    }
+}
+
+## Request & save any comics missing from the database every night
+TASK_SCHEDULE_nightly_sync_missing_comics = {
+    "nightly_sync_missing_comics": {
+        "task": "sync_missing_comics",
+        "schedule": crontab(hour="3", minute="0")
+    }
+}
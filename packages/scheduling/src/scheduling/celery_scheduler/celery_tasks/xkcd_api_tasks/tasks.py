@@ -4,7 +4,22 @@ from pathlib import Path
 import time
 import typing as t
 
-from celery import current_app
+from scheduling.celery_scheduler import worker_resources
+from scheduling.celery_scheduler.celery_tasks.xkcd_api_tasks.results import (
+    STATUS_FAILED,
+    STATUS_NOT_MODIFIED,
+    STATUS_SAVED,
+    STATUS_UNCHANGED,
+    comic_img_ref,
+    comic_task_result,
+)
+from scheduling.celery_scheduler.celeryconfig import (
+    return_http_cache_redis_url,
+    return_rate_limit_redis_url,
+)
+from scheduling.celery_scheduler.task_locks import singleton_task
+
+from celery import chord, current_app, group
 from celery.result import AsyncResult
 from core_utils import time_utils
 import db_lib
@@ -17,17 +32,25 @@ import sqlalchemy.exc as sa_exc
 import sqlalchemy.orm as so
 import xkcdapi
 import xkcdapi.controllers
+import xkcdapi.crawler
 import xkcdapi.db_client
 import xkcdapi.request_client
 
+## Scheduled tasks that request & save the current comic share one lock. A run that starts while another is still
+#  in progress (i.e. a slow XKCD API) is skipped, instead of requesting & saving the same comic again
+CURRENT_COMIC_LOCK: str = "current_comic"
+## Seconds a lock is held at most, if the worker holding it dies
+CURRENT_COMIC_LOCK_TIMEOUT: int = 900
+SYNC_MISSING_COMICS_LOCK_TIMEOUT: int = 3 * 60 * 60
+
+
 @current_app.task(name="request_current_comic")
 def task_current_comic() -> dict:
     log.info("Running Celery task to request current XKCD comic")
     
-    xkcd_api_controller: xkcdapi.controllers.XkcdApiController = xkcdapi.controllers.XkcdApiController()
-    
     try:
-        current_comic: xkcd_domain.XkcdComicIn = xkcd_api_controller.get_current_comic()
+        with worker_resources.shared_api_controller() as api_ctl:
+            current_comic: xkcd_domain.XkcdComicIn = api_ctl.get_current_comic()
         if not current_comic:
             log.warning("current_comic is None, indicating an error requesting the comic from the XKCD API.")
             return
@@ -43,58 +66,283 @@ def task_current_comic() -> dict:
 
 
 @current_app.task(name="request_and_save_current_comic")
-def task_save_current_comic(engine: sa.Engine | None = None) -> t.Tuple[dict | None, dict | None]:
+@singleton_task(lock_name=CURRENT_COMIC_LOCK, timeout=CURRENT_COMIC_LOCK_TIMEOUT)
+def task_save_current_comic(engine: sa.Engine | None = None) -> dict:
+    """Request the current comic & its image, and save both to the database.
+
+    Returns:
+        (dict): A compact result (see `results.comic_task_result()`) referencing the saved comic & image by number,
+            ID & image hash. The image's bytes are never returned through the result backend.
+
+    """
     log.info("Running Celery task to request current XKCD comic & image, and save both to the database.")
     
     if not engine:
         log.warning("No SQLAlchemy Engine object detected. Initializing Engine with app's database settings.")
-        engine: sa.Engine = depends.db_depends.get_db_engine()
+        engine: sa.Engine = worker_resources.get_engine()
     
-    xkcd_api_controller: xkcdapi.controllers.XkcdApiController = xkcdapi.controllers.XkcdApiController()
-    
-    with xkcd_api_controller as api_ctl:
+    with worker_resources.shared_api_controller() as api_ctl:
         log.info("Requesting current XKCD comic")
-        current_comic: xkcd_domain.XkcdComicIn = api_ctl.get_current_comic()
+        try:
+            current_comic: xkcd_domain.XkcdComicIn | None = api_ctl.get_current_comic_if_modified(scope="request_and_save_current_comic")
+        except httpx.HTTPError as exc:
+            log.error(f"({type(exc)}) Error requesting current XKCD comic. Details: {exc}")
+            
+            return comic_task_result(status=STATUS_FAILED, error=str(exc))
+        
+        if not current_comic:
+            ## 304 Not Modified, the current comic is already saved
+            log.info("Current XKCD comic has not changed since the last request, skipping image request & database save.")
+            
+            return comic_task_result(status=STATUS_NOT_MODIFIED)
+        
         log.info("Requesting current XKCD comic image")
         current_comic_img: xkcd_domain.XkcdComicImgIn = api_ctl.get_comic_img(comic=current_comic)
     
-    log.info("Saving XKCD comic and image to database")
-    db_current_comic, db_current_comic_img = xkcdapi.db_client.save_comic_and_img_to_db(comic=current_comic, comic_img=current_comic_img, engine=engine)
+        log.info("Saving XKCD comic and image to database")
+        db_current_comic, db_current_comic_img = xkcdapi.db_client.save_comic_and_img_to_db(comic=current_comic, comic_img=current_comic_img, engine=engine)
+        
+        ## Only skip the next poll once the comic has been saved
+        api_ctl.commit_validators(scope="request_and_save_current_comic")
     
     if not db_current_comic:
         log.warning("db_current_comic is None, indicating an issue saving the current comic to the database. Returning None for the comic object")
-        comic_out_dict = None
-    else:
-        comic_out_dict = db_current_comic.model_dump()
     
     if not db_current_comic_img:
         log.warning("db_current_comic_img is None, indicating an issue saving the current comic's image to the database. Returning None for the comic image object")
-        comic_img_out_dict = None
-    else:
-        comic_img_out_dict = db_current_comic_img.model_dump()
         
     # log.debug(f"Current comic: {db_current_comic}, current comic image: {db_current_comic_img}")
     
-    return comic_out_dict, comic_img_out_dict
+    return comic_task_result(status=STATUS_SAVED, comic=db_current_comic, comic_img=db_current_comic_img)
 
 
 @current_app.task(name="update_current_comic_metadata")
-def task_update_current_comic_metadata(engine: sa.Engine | None = None) -> dict:
+@singleton_task(lock_name=CURRENT_COMIC_LOCK, timeout=CURRENT_COMIC_LOCK_TIMEOUT)
+def task_update_current_comic_metadata(engine: sa.Engine | None = None) -> dict | None:
     log.info("Running Celery task to update current comic metadata in the database.")
     
     if not engine:
         log.warning("No SQLAlchemy Engine object detected. Initializing Engine with app's database settings.")
-        engine: sa.Engine = depends.db_depends.get_db_engine()
-    
-    xkcd_api_controller: xkcdapi.controllers.XkcdApiController = xkcdapi.controllers.XkcdApiController()
+        engine: sa.Engine = worker_resources.get_engine()
     
-    with xkcd_api_controller as api_ctl:
-        current_comic = api_ctl.get_current_comic()
+    with worker_resources.shared_api_controller() as api_ctl:
+        try:
+            current_comic: xkcd_domain.XkcdComicIn | None = api_ctl.get_current_comic_if_modified(scope="update_current_comic_metadata")
+        except httpx.HTTPError as exc:
+            log.error(f"({type(exc)}) Error requesting current XKCD comic, skipping metadata update. Details: {exc}")
+            
+            return None
+        
+        if not current_comic:
+            ## 304 Not Modified, the saved metadata is still current
+            log.info("Current XKCD comic has not changed since the last request, skipping metadata update.")
+            
+            return None
+        
         current_comic_metadata = xkcd_domain.XkcdCurrentComicMetadataIn(num=current_comic.num, last_updated=time_utils.get_ts())
         
-    log.debug(f"Current comic metadata: {current_comic_metadata}")
-    db_metadata_obj: xkcd_domain.XkcdCurrentComicMetadataOut = xkcdapi.db_client.update_db_current_comic_metadata(comic_metadata=current_comic_metadata, engine=engine)
+        log.debug(f"Current comic metadata: {current_comic_metadata}")
+        db_metadata_obj: xkcd_domain.XkcdCurrentComicMetadataOut = xkcdapi.db_client.update_db_current_comic_metadata(comic_metadata=current_comic_metadata, engine=engine)
+        
+        api_ctl.commit_validators(scope="update_current_comic_metadata")
     
     log.debug(f"Current comic metadata: {db_metadata_obj}")
     
     return db_metadata_obj.model_dump()
+
+
+@current_app.task(name="poll_current_comic")
+@singleton_task(lock_name=CURRENT_COMIC_LOCK, timeout=CURRENT_COMIC_LOCK_TIMEOUT)
+def task_poll_current_comic(stream_img: bool = False) -> dict:
+    """Poll for a new current XKCD comic, saving it only when it changes.
+
+    Description:
+        Replaces scheduling `request_and_save_current_comic` & `update_current_comic_metadata` side by side. The current
+        comic is requested once (conditionally, see `XkcdApiController.get_current_comic_if_modified()`) and its number is
+        compared against the saved current comic metadata. Nothing else happens unless a new comic was published, in
+        which case its image is downloaded and the comic, image & metadata are saved in one transaction.
+
+    Params:
+        stream_img (bool): (default: False) Stream the image straight into the image store instead of reading it into memory.
+
+    Returns:
+        (dict): Summary of the poll; `changed` is `True` when a new comic was saved. `status` is "failed" (with an
+            `error`) when the current comic could not be requested.
+
+    """
+    log.info("Running Celery task to poll for a new current XKCD comic.")
+    
+    validators_scope: str = "poll_current_comic"
+    engine: sa.Engine = worker_resources.get_engine()
+    
+    with worker_resources.shared_api_controller() as api_ctl:
+        try:
+            current_comic: xkcd_domain.XkcdComicIn | None = api_ctl.get_current_comic_if_modified(scope=validators_scope)
+        except httpx.HTTPError as exc:
+            log.error(f"({type(exc)}) Error polling current XKCD comic. Details: {exc}")
+            
+            return {"status": STATUS_FAILED, "changed": False, "num": None, "previous_num": None, "error": str(exc)}
+        
+        if not current_comic:
+            log.info("Current XKCD comic has not changed since the last poll.")
+            
+            return {"status": STATUS_NOT_MODIFIED, "changed": False, "num": None, "previous_num": None}
+        
+        try:
+            previous_num: int | None = xkcdapi.db_client.get_current_comic_metadata_from_db(engine=engine).num
+        except ValueError:
+            ## No metadata saved yet
+            previous_num = None
+        
+        if previous_num == current_comic.num:
+            log.info(f"Current XKCD comic is still #{current_comic.num}, nothing to save.")
+            api_ctl.commit_validators(scope=validators_scope)
+            
+            return {"status": STATUS_UNCHANGED, "changed": False, "num": current_comic.num, "previous_num": previous_num}
+        
+        log.info(f"New current XKCD comic: #{current_comic.num} (previous: #{previous_num}). Requesting image.")
+        if stream_img:
+            current_comic_img: xkcd_domain.XkcdComicImgIn | None = api_ctl.stream_comic_img(comic=current_comic)
+        else:
+            current_comic_img: xkcd_domain.XkcdComicImgIn | None = api_ctl.get_comic_img(comic=current_comic)
+        
+        if not current_comic_img:
+            log.warning(f"Could not download image for comic #{current_comic.num}. Saving the comic without it, the missing comic sync will retry the image.")
+        
+        db_comic, db_comic_img, db_metadata = xkcdapi.db_client.save_current_comic_to_db(comic=current_comic, comic_img=current_comic_img, engine=engine)
+        
+        api_ctl.commit_validators(scope=validators_scope)
+    
+    log.success(f"Saved new current XKCD comic #{db_metadata.num}.")
+    
+    return {"status": STATUS_SAVED, "changed": True, "num": db_metadata.num, "previous_num": previous_num, "comic_saved": db_comic is not None, "img_saved": db_comic_img is not None, "img": comic_img_ref(db_comic_img)}
+
+
+@current_app.task(name="sync_missing_comics")
+@singleton_task(lock_name="sync_missing_comics", timeout=SYNC_MISSING_COMICS_LOCK_TIMEOUT)
+def task_sync_missing_comics(max_concurrency: int = 25, batch_size: int = 100) -> dict:
+    log.info("Running Celery task to request & save comics missing from the database.")
+    
+    engine: sa.Engine = worker_resources.get_engine()
+    
+    try:
+        sync_summary: dict = xkcdapi.crawler.sync_missing_comics(max_concurrency=max_concurrency, batch_size=batch_size, engine=engine, rate_limit_redis_url=return_rate_limit_redis_url(), cache_redis_url=return_http_cache_redis_url())
+    except Exception as exc:
+        msg = f"({type(exc)}) Error syncing missing comics. Details: {exc}"
+        log.error(msg)
+        
+        raise exc
+    
+    log.info(f"Missing comic sync summary: {sync_summary}")
+    
+    return sync_summary
+
+
+def _chunk_comic_nums(comic_nums: list[int], chunk_size: int) -> list[list[int]]:
+    """Split a list of comic numbers into chunks of at most `chunk_size` numbers."""
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be a positive integer. Got: {chunk_size}")
+    
+    return [comic_nums[i:i + chunk_size] for i in range(0, len(comic_nums), chunk_size)]
+
+
+@current_app.task(name="backfill_comics")
+def task_backfill_comics(start: int = 1, end: int | None = None, chunk_size: int = 100, max_concurrency: int = 10, only_missing: bool = False, stream_imgs: bool = False) -> dict:
+    """Request & save a range of comics in parallel across Celery workers.
+
+    Description:
+        The range is split into chunks of `chunk_size` comics, and each chunk is sent to the workers as one
+        `backfill_comic_chunk` task in a Celery group. Each chunk requests its comics concurrently and saves them
+        with a single bulk write. When every chunk is done, the `backfill_comics_complete` chord callback
+        totals the results & updates the current comic metadata.
+
+    Params:
+        start (int): (default: 1) The first comic number to request.
+        end (int | None): The last comic number to request. When `None`, the current comic number is used.
+        chunk_size (int): (default: 100) Number of comics per chunk task.
+        max_concurrency (int): (default: 10) Maximum number of comics each chunk task requests at once.
+        only_missing (bool): (default: False) Only request comics that are not fully saved in the database.
+        stream_imgs (bool): (default: False) Stream images straight into the image store.
+
+    Returns:
+        (dict): The ID of the chord's result & the number of comics & chunks dispatched.
+
+    """
+    log.info(f"Running Celery task to backfill comics {start}-{end or 'current'} in chunks of [{chunk_size}].")
+    
+    engine: sa.Engine = worker_resources.get_engine()
+    
+    if end is None:
+        end = xkcdapi.crawler.get_current_comic_num(engine=engine)
+    
+    if start < 1 or end < start:
+        raise ValueError(f"Invalid comic range: {start}-{end}")
+    
+    if only_missing:
+        comic_nums: list[int] = [n for n in xkcdapi.db_client.get_missing_comic_nums(max_comic_num=end, engine=engine) if n >= start]
+    else:
+        comic_nums: list[int] = [n for n in range(start, end + 1) if n not in xkcd_domain.constants.IGNORE_COMIC_NUMS]
+    
+    if not comic_nums:
+        log.info(f"No comics to backfill in range {start}-{end}.")
+        
+        return {"chord_id": None, "requested": 0, "chunks": 0}
+    
+    chunks: list[list[int]] = _chunk_comic_nums(comic_nums=comic_nums, chunk_size=chunk_size)
+    
+    header: group = group(task_backfill_comic_chunk.s(comic_nums=chunk, max_concurrency=max_concurrency, stream_imgs=stream_imgs) for chunk in chunks)
+    chord_result: AsyncResult = chord(header)(task_backfill_comics_complete.s())
+    
+    log.info(f"Dispatched [{len(comic_nums)}] comic(s) in [{len(chunks)}] chunk(s). Chord ID: {chord_result.id}")
+    
+    return {"chord_id": chord_result.id, "requested": len(comic_nums), "chunks": len(chunks)}
+
+
+@current_app.task(name="backfill_comic_chunk")
+def task_backfill_comic_chunk(comic_nums: list[int], max_concurrency: int = 10, stream_imgs: bool = False) -> dict:
+    """Request a chunk of comics concurrently & save them with one bulk database write."""
+    log.info(f"Running Celery task to backfill [{len(comic_nums)}] comic(s) ({min(comic_nums)}-{max(comic_nums)}).")
+    
+    engine: sa.Engine = worker_resources.get_engine()
+    
+    ## batch_size covers the whole chunk, so the chunk is saved in a single write
+    summary: dict = xkcdapi.crawler.crawl_and_save_comics(comic_nums=comic_nums, max_concurrency=max_concurrency, batch_size=len(comic_nums), engine=engine, stream_imgs=stream_imgs, rate_limit_redis_url=return_rate_limit_redis_url(), cache_redis_url=return_http_cache_redis_url())
+    
+    failed: set[int] = set(summary["failed"])
+    summary["max_num"] = max((n for n in comic_nums if n not in failed and n not in xkcd_domain.constants.IGNORE_COMIC_NUMS), default=None)
+    
+    return summary
+
+
+@current_app.task(name="backfill_comics_complete")
+def task_backfill_comics_complete(chunk_summaries: list[dict]) -> dict:
+    """Chord callback for `backfill_comics`. Totals the chunk results & moves the current comic metadata forward."""
+    summary: dict = {
+        "chunks": len(chunk_summaries),
+        "requested": sum(s["requested"] for s in chunk_summaries),
+        "crawled": sum(s["crawled"] for s in chunk_summaries),
+        "saved_comics": sum(s["saved_comics"] for s in chunk_summaries),
+        "saved_imgs": sum(s["saved_imgs"] for s in chunk_summaries),
+        "failed": sorted(n for s in chunk_summaries for n in s["failed"]),
+    }
+    
+    max_num: int | None = max((s["max_num"] for s in chunk_summaries if s.get("max_num")), default=None)
+    
+    if max_num:
+        engine: sa.Engine = worker_resources.get_engine()
+        
+        try:
+            previous_num: int | None = xkcdapi.db_client.get_current_comic_metadata_from_db(engine=engine).num
+        except ValueError:
+            ## No metadata saved yet. A backfill with an explicit end does not know the current comic, so leave it
+            #  to the current comic poll (a backfill to the current comic saves the metadata before dispatching)
+            previous_num = None
+        
+        ## Only move the metadata forward, a backfill of old comics should not overwrite a newer current comic
+        if previous_num is not None and max_num > previous_num:
+            current_comic_metadata = xkcd_domain.XkcdCurrentComicMetadataIn(num=max_num, last_updated=time_utils.get_ts())
+            xkcdapi.db_client.update_db_current_comic_metadata(comic_metadata=current_comic_metadata, engine=engine)
+    
+    log.info(f"Backfill complete: {summary}")
+    
+    return summary
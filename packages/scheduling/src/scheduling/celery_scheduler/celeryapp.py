@@ -3,6 +3,14 @@ from __future__ import annotations
 from functools import lru_cache
 import typing as t
 
+## Record task durations & dump worker metrics (metrics),
+## build & close each worker process's API controller, database engine & cache handles (worker_resources),
+## and configure the Celery queues & task routes (routing)
+from scheduling.celery_scheduler import (
+    metrics as celery_metrics,
+    routing as celery_routing,
+    worker_resources as celery_worker_resources,
+)
 from scheduling.celery_scheduler.celery_tasks.xkcd_api_tasks import (
     adhoc_tasks as celery_xkcd_api_adhoc_tasks,
     scheduled_tasks as celery_xkcd_api_scheduled_tasks,
@@ -37,12 +45,13 @@ INCLUDE_TASK_PATHS: list[str] = [
 
 ## List of scheduled task dicts to add to Celery beat's schedule
 BEAT_SCHEDULED_TASKS: list = [
-    ## Request & save current XKCD comic every hour
-    celery_xkcd_api_scheduled_tasks.TASK_SCHEDULE_hourly_current_comic_check,
+    ## Poll for a new current XKCD comic every 5 minutes. Replaces the hourly current comic check
+    #  & the 5 minute metadata update, which both requested the current comic on their own
+    celery_xkcd_api_scheduled_tasks.TASK_SCHEDULE_5m_poll_current_comic,
     ## Demo: request and save current XKCD comic every minute
     # celery_xkcd_api_scheduled_tasks.TASK_SCHEDULE_minutely_current_comic_check,
-    ## Refresh current comic metadata in database every 5 minutes
-    celery_xkcd_api_scheduled_tasks.TASK_SCHEDULE_5m_update_current_comic_metadata,
+    ## Request & save comics missing from the database every night
+    celery_xkcd_api_scheduled_tasks.TASK_SCHEDULE_nightly_sync_missing_comics,
 ]
 
 app: Celery = Celery(
@@ -55,7 +64,21 @@ app: Celery = Celery(
 )
 
 ## Set app config
-app.conf.update(timezone=APP_SETTINGS.get("TZ", default="Etc/UTC"), enable_utc=True)
+app.conf.update(
+    timezone=APP_SETTINGS.get("TZ", default="Etc/UTC"),
+    enable_utc=True,
+    ## Task results are compact references (see xkcd_api_tasks.results), expire them once callers have read them.
+    #  Chord callbacks read their header's results, keep this longer than the longest backfill
+    result_expires=int(CELERY_SETTINGS.get("CELERY_RESULT_EXPIRES", default=21600)),
+    ## i.e. "zlib", "gzip" or "bzip2". Empty stores results uncompressed
+    result_compression=CELERY_SETTINGS.get("CELERY_RESULT_COMPRESSION", default="") or None,
+    ## Route current comic polling, bulk comic requests & bookkeeping to separate queues (see routing.py),
+    #  so a backfill does not delay new comics
+    task_queues=celery_routing.TASK_QUEUES,
+    task_routes=celery_routing.TASK_ROUTES,
+    task_default_queue=celery_routing.DEFAULT_QUEUE,
+    task_default_routing_key=celery_routing.DEFAULT_QUEUE,
+)
 
 ## Autodiscover
 app.autodiscover_tasks(INCLUDE_TASK_PATHS)
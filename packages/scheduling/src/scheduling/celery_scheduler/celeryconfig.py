@@ -66,6 +66,37 @@ def return_redis_url(
     return redis_url
 
 
+def return_rate_limit_redis_url(
+    shared_rate_limit: bool = CELERY_SETTINGS.get("CELERY_SHARED_RATE_LIMIT", default=True),
+) -> str | None:
+    """Return the Redis URL workers share HTTP rate limit buckets through (the result backend), or `None` to rate limit per process.
+
+    Params:
+        shared_rate_limit (bool): (default: True) When `False`, each worker process has its own request budget.
+
+    """
+    if not shared_rate_limit:
+        return None
+
+    return return_redis_url()
+
+
+def return_http_cache_redis_url(
+    shared_http_cache: bool = CELERY_SETTINGS.get("CELERY_SHARED_HTTP_CACHE", default=False),
+) -> str | None:
+    """Return the Redis URL workers share the HTTP response cache through (the result backend), or `None` to use the cache in the HTTP settings.
+
+    Params:
+        shared_http_cache (bool): (default: False) When `True`, workers on every host share one HTTP cache in Redis. When `False`,
+            the workers on a host share the SQLite cache database.
+
+    """
+    if not shared_http_cache:
+        return None
+
+    return return_redis_url()
+
+
 class CelerySettings(BaseModel):
     broker_host: str = Field(
         default=CELERY_SETTINGS.get("CELERY_BROKER_HOST", default="localhost")
@@ -0,0 +1,231 @@
+"""Run registered Celery tasks on a local thread or process pool, without a broker or result backend.
+
+Description:
+    `LocalTaskExecutor.send_task()` takes the same arguments as `Celery.send_task()`, but runs the task in this
+    process's `concurrent.futures` pool (with `Task.apply()`, so task signals & retries behave as in a worker) and
+    returns a `LocalAsyncResult`, which has the `AsyncResult` methods the CLI & `watch_celery_task()` use
+    (`.id`, `.state`, `.ready()`, `.get(timeout=...)`).
+
+    Use it on a single node without RabbitMQ & Redis, or to benchmark tasks without broker round trips:
+
+        with LocalTaskExecutor(celery_app=celeryapp.app, max_workers=4) as executor:
+            async_res = execute_celery_task(task_name="poll_current_comic", celery_app=executor)
+            result = watch_celery_task(async_res)
+
+    Tasks that dispatch other tasks (i.e. `backfill_comics`, which sends a chord of chunks) still need a broker for
+    the tasks they send.
+
+    The "process" pool runs tasks registered on `celeryapp.app`, which each child process imports. Child processes
+    build their API controller & database engine once, when they start (see `worker_resources`).
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager
+import typing as t
+import uuid
+
+from scheduling.celery_scheduler.celeryconfig import CELERY_SETTINGS
+
+from celery import Celery, Task, states
+from loguru import logger as log
+
+## "thread" or "process"
+LOCAL_POOL: str = CELERY_SETTINGS.get("CELERY_LOCAL_POOL", default="thread")
+## Number of tasks run at once. 0 uses the concurrent.futures default
+LOCAL_MAX_WORKERS: int = int(CELERY_SETTINGS.get("CELERY_LOCAL_MAX_WORKERS", default=4))
+
+
+def _apply_task(task: Task, args: tuple, kwargs: dict, task_id: str) -> t.Any:
+    return task.apply(args=args, kwargs=kwargs, task_id=task_id).get(disable_sync_subtasks=False)
+
+
+def _apply_task_by_name(task_name: str, args: tuple, kwargs: dict, task_id: str) -> t.Any:
+    """Run a task registered on `celeryapp.app` in a process pool's child process."""
+    from scheduling.celery_scheduler import celeryapp
+
+    return _apply_task(celeryapp.app.tasks[task_name], args=args, kwargs=kwargs, task_id=task_id)
+
+
+def _init_process_pool_worker() -> None:
+    """Warm up a process pool's child process, like Celery's `worker_process_init` does for prefork workers."""
+    from scheduling.celery_scheduler import worker_resources
+
+    if not worker_resources.WARM_UP:
+        return
+
+    try:
+        worker_resources.warm_up()
+    except Exception as exc:
+        log.warning(f"({type(exc)}) Error warming up local task pool process. Details: {exc}")
+
+
+class LocalAsyncResult:
+    """The result of a task run by a `LocalTaskExecutor`, with the same API as Celery's `AsyncResult`.
+
+    Params:
+        task_id (str): The task run's ID.
+        task_name (str): Name of the task.
+        future (Future): The pool's future for the task run.
+    """
+
+    def __init__(self, task_id: str, task_name: str, future: Future):
+        self.id: str = task_id
+        self.name: str = task_name
+        self._future: Future = future
+
+    def __repr__(self) -> str:
+        return f"<LocalAsyncResult: {self.id} ({self.name}) {self.state}>"
+
+    @property
+    def task_id(self) -> str:
+        return self.id
+
+    @property
+    def state(self) -> str:
+        """The task's Celery state: PENDING, STARTED, SUCCESS, FAILURE or REVOKED."""
+        if self._future.cancelled():
+            return states.REVOKED
+        if self._future.running():
+            return states.STARTED
+        if not self._future.done():
+            return states.PENDING
+
+        return states.FAILURE if self._future.exception() is not None else states.SUCCESS
+
+    @property
+    def status(self) -> str:
+        return self.state
+
+    @property
+    def result(self) -> t.Any:
+        """The task's return value, or the exception it raised. `None` until the task is done."""
+        if not self._future.done() or self._future.cancelled():
+            return None
+
+        return self._future.exception() or self._future.result()
+
+    def ready(self) -> bool:
+        return self._future.done()
+
+    def successful(self) -> bool:
+        return self.state == states.SUCCESS
+
+    def failed(self) -> bool:
+        return self.state == states.FAILURE
+
+    def get(self, timeout: float | None = None, propagate: bool = True, **kwargs: t.Any) -> t.Any:
+        """Wait for the task & return its result.
+
+        Params:
+            timeout (float | None): Seconds to wait. When `None`, wait until the task is done.
+            propagate (bool): (default: True) Re-raise the task's exception. When `False`, the exception is returned.
+
+        Raises:
+            TimeoutError: If the task is not done within `timeout` seconds.
+
+        """
+        if not propagate:
+            exc: BaseException | None = self._future.exception(timeout=timeout)
+            if exc is not None:
+                return exc
+
+        return self._future.result(timeout=timeout)
+
+    wait = get
+
+    def revoke(self, **kwargs: t.Any) -> None:
+        """Cancel the task if it has not started yet."""
+        self._future.cancel()
+
+    def forget(self) -> None:
+        """Nothing to forget, results are only kept in memory."""
+        return
+
+
+class LocalTaskExecutor(AbstractContextManager):
+    """Send tasks to a local thread or process pool instead of a Celery broker.
+
+    Params:
+        celery_app (Celery): The app the tasks are registered on.
+        max_workers (int | None): Number of tasks run at once. When `None`, the `CELERY_LOCAL_MAX_WORKERS` setting is used.
+        pool (str | None): "thread" or "process". When `None`, the `CELERY_LOCAL_POOL` setting is used. Threads share one
+            API controller & database engine, processes build their own.
+    """
+
+    def __init__(self, celery_app: Celery, max_workers: int | None = None, pool: str | None = None):
+        if not celery_app:
+            raise ValueError("Missing a Celery app to run tasks from.")
+
+        self.celery_app: Celery = celery_app
+        self.max_workers: int | None = (max_workers if max_workers is not None else LOCAL_MAX_WORKERS) or None
+        self.pool: str = str(pool or LOCAL_POOL).lower()
+
+        if self.pool not in ["thread", "process"]:
+            raise ValueError(f"Invalid pool: {self.pool}. Must be one of ['thread', 'process']")
+
+        ## Placeholder for the pool, created on first use
+        self._executor: Executor | None = None
+
+    def __enter__(self) -> t.Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, traceback) -> t.Literal[False]:
+        self.shutdown()
+
+        return False
+
+    @property
+    def tasks(self) -> t.Mapping[str, Task]:
+        """The app's registered tasks, so the executor can stand in for the app in `get_celery_tasks_list()`."""
+        return self.celery_app.tasks
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.pool == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_process_pool_worker)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="celery-local")
+
+        return self._executor
+
+    def send_task(self, name: str, args: t.Sequence | None = None, kwargs: dict | None = None, task_id: str | None = None, **options: t.Any) -> LocalAsyncResult:
+        """Run a registered task in the pool. Takes the same arguments as `Celery.send_task()`.
+
+        Params:
+            name (str): Name of the task.
+            args (Sequence | None): Positional arguments for the task.
+            kwargs (dict | None): Keyword arguments for the task.
+            task_id (str | None): ID for the task run. A new UUID when `None`.
+            **options (Any): Celery routing options (i.e. `queue`), ignored by the local pool.
+
+        Returns:
+            (LocalAsyncResult): The task run's result.
+
+        Raises:
+            NotRegistered: If no task named `name` is registered on the app.
+
+        """
+        ## Raises NotRegistered before anything is submitted
+        task: Task = self.celery_app.tasks[name]
+        task_id: str = task_id or str(uuid.uuid4())
+        args: tuple = tuple(args or ())
+        kwargs: dict = dict(kwargs or {})
+
+        if self.pool == "process":
+            future: Future = self._get_executor().submit(_apply_task_by_name, name, args, kwargs, task_id)
+        else:
+            future: Future = self._get_executor().submit(_apply_task, task, args, kwargs, task_id)
+
+        log.debug(f"Submitted task {name} ({task_id}) to the local {self.pool} pool.")
+
+        return LocalAsyncResult(task_id=task_id, task_name=name, future=future)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Shut the pool down, waiting for running tasks unless `wait` is `False`."""
+        if self._executor is None:
+            return
+
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+        self._executor = None
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import threading
+import time
+import typing as t
+
+from scheduling.celery_scheduler.celeryconfig import CELERY_SETTINGS
+
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from core_utils import metrics_utils
+from loguru import logger as log
+
+TASK_SECONDS: metrics_utils.Histogram = metrics_utils.histogram("celery_task_duration_seconds", "Time spent running each Celery task, by final state.", labelnames=("task", "state"))
+
+## Directory each worker process dumps its metrics to (celery-<pid>.prom), for node_exporter's textfile collector.
+#  A process removes its file when it shuts down, so files of replaced worker processes are not scraped forever.
+#  An empty value disables the dump
+METRICS_DIR: str = CELERY_SETTINGS.get("CELERY_METRICS_DIR", default=".metrics")
+## Minimum seconds between two dumps by the same process
+METRICS_DUMP_INTERVAL: float = float(CELERY_SETTINGS.get("CELERY_METRICS_DUMP_INTERVAL", default=15))
+
+## perf_counter() at task start, by task ID
+_task_starts: dict[str, float] = {}
+_next_dump: float = 0.0
+_dump_lock: threading.Lock = threading.Lock()
+
+
+def get_metrics_file(pid: int | None = None) -> Path | None:
+    """Return the file this worker process dumps its metrics to, or `None` if dumps are disabled."""
+    if not METRICS_DIR:
+        return None
+
+    return Path(METRICS_DIR) / f"celery-{pid or os.getpid()}.prom"
+
+
+def dump_metrics(force: bool = False) -> Path | None:
+    """Write this process's metrics to its file, at most every `METRICS_DUMP_INTERVAL` seconds unless `force` is set."""
+    global _next_dump
+
+    path: Path | None = get_metrics_file()
+    if path is None:
+        return None
+
+    with _dump_lock:
+        if not force and time.monotonic() < _next_dump:
+            return None
+
+        _next_dump = time.monotonic() + METRICS_DUMP_INTERVAL
+
+    try:
+        return metrics_utils.write_metrics(path, const_labels={"pid": str(os.getpid())})
+    except Exception as exc:
+        log.warning(f"({type(exc)}) Error writing metrics to '{path}'. Details: {exc}")
+
+        return None
+
+
+def remove_metrics_file() -> bool:
+    """Remove this process's metrics file. Returns `True` if a file was removed."""
+    path: Path | None = get_metrics_file()
+    if path is None:
+        return False
+
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        return False
+    except OSError as exc:
+        log.warning(f"({type(exc)}) Error removing metrics file '{path}'. Details: {exc}")
+
+        return False
+
+    return True
+
+
+@task_prerun.connect
+def _record_task_start(task_id: str | None = None, **kwargs: t.Any) -> None:
+    if task_id:
+        _task_starts[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _record_task_duration(task_id: str | None = None, task: t.Any = None, state: str | None = None, **kwargs: t.Any) -> None:
+    start: float | None = _task_starts.pop(task_id, None) if task_id else None
+    if start is None:
+        return
+
+    TASK_SECONDS.observe(time.perf_counter() - start, task=getattr(task, "name", "unknown"), state=state or "UNKNOWN")
+
+    dump_metrics()
+
+
+## worker_process_shutdown is sent by prefork pool processes, worker_shutdown by a solo/threads pool worker
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _remove_metrics_file_on_shutdown(**kwargs: t.Any) -> None:
+    remove_metrics_file()
+
+
+def _reset_after_fork() -> None:
+    """Start a forked child with its own dump schedule & no task timings from its parent."""
+    global _dump_lock, _next_dump
+
+    _dump_lock = threading.Lock()
+    _next_dump = 0.0
+    _task_starts.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
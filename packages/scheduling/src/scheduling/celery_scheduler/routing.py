@@ -0,0 +1,130 @@
+"""Celery queues & task routes.
+
+Description:
+    Tasks are split across 3 queues, so a long backfill cannot delay the current comic poll:
+        - realtime: Polling & saving the current comic, and adhoc requests. Short tasks where latency matters.
+        - bulk: Backfill chunks & the nightly missing comic sync. Long tasks requesting many comics.
+        - maintenance: Backfill dispatch & the chord callback that totals a backfill. Short bookkeeping tasks
+          that should not wait behind a queue of bulk chunks.
+
+    Each queue has its own worker concurrency & prefetch multiplier in the `[celery]` settings, i.e.
+    `CELERY_QUEUE_BULK_CONCURRENCY` & `CELERY_QUEUE_BULK_PREFETCH_MULTIPLIER`. Start a worker per queue
+    (or group of queues) to keep realtime tasks on their own processes:
+
+        project_cli celery start --mode worker --queues realtime
+        project_cli celery start --mode worker --queues bulk,maintenance
+
+    A worker started without `--queues` consumes every queue.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from scheduling.celery_scheduler.celeryconfig import CELERY_SETTINGS
+
+from kombu import Queue
+
+QUEUE_REALTIME: str = "realtime"
+QUEUE_BULK: str = "bulk"
+QUEUE_MAINTENANCE: str = "maintenance"
+
+QUEUE_NAMES: t.Tuple[str, ...] = (QUEUE_REALTIME, QUEUE_BULK, QUEUE_MAINTENANCE)
+
+TASK_QUEUES: t.Tuple[Queue, ...] = tuple(Queue(queue_name, routing_key=queue_name) for queue_name in QUEUE_NAMES)
+
+## Tasks not listed here are sent to the default queue
+DEFAULT_QUEUE: str = CELERY_SETTINGS.get("CELERY_DEFAULT_QUEUE", default=QUEUE_REALTIME)
+
+## Queue each task is sent to, by task name
+TASK_QUEUE_NAMES: dict[str, str] = {
+    "request_current_comic": QUEUE_REALTIME,
+    "request_and_save_current_comic": QUEUE_REALTIME,
+    "update_current_comic_metadata": QUEUE_REALTIME,
+    "poll_current_comic": QUEUE_REALTIME,
+    "adhoc-current-comic": QUEUE_REALTIME,
+    "adhoc-request-comic": QUEUE_REALTIME,
+    "backfill_comic_chunk": QUEUE_BULK,
+    "sync_missing_comics": QUEUE_BULK,
+    "backfill_comics": QUEUE_MAINTENANCE,
+    "backfill_comics_complete": QUEUE_MAINTENANCE,
+}
+
+## Celery `task_routes` setting
+TASK_ROUTES: dict[str, dict] = {task_name: {"queue": queue_name, "routing_key": queue_name} for task_name, queue_name in TASK_QUEUE_NAMES.items()}
+
+## Worker options used for each queue when the [celery] settings do not override them
+_DEFAULT_QUEUE_OPTIONS: dict[str, dict[str, int]] = {
+    ## Several processes, so a new comic is never stuck behind another realtime task
+    QUEUE_REALTIME: {"concurrency": 2, "prefetch_multiplier": 4},
+    ## Chunks run for minutes, reserve one at a time so idle workers can take the rest
+    QUEUE_BULK: {"concurrency": 4, "prefetch_multiplier": 1},
+    QUEUE_MAINTENANCE: {"concurrency": 1, "prefetch_multiplier": 1},
+}
+
+
+def parse_queues(queues: t.Union[str, t.Iterable[str], None]) -> list[str]:
+    """Parse a comma-separated string (or list) of queue names, i.e. "realtime,bulk".
+
+    Params:
+        queues (str | Iterable[str] | None): Queue names. When empty, every queue is returned.
+
+    Returns:
+        (list[str]): Unique queue names, in the order given.
+
+    Raises:
+        ValueError: When a queue name is not one of `QUEUE_NAMES`.
+
+    """
+    if isinstance(queues, str):
+        queues = queues.split(",")
+
+    queue_names: list[str] = list(dict.fromkeys(q.strip().lower() for q in (queues or []) if q and q.strip()))
+    if not queue_names:
+        return list(QUEUE_NAMES)
+
+    unknown: list[str] = [q for q in queue_names if q not in QUEUE_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown Celery queue(s): {unknown}. Must be one of {list(QUEUE_NAMES)}")
+
+    return queue_names
+
+
+def get_queue_options(queue_name: str) -> dict[str, int]:
+    """Return the worker concurrency & prefetch multiplier configured for a queue.
+
+    Params:
+        queue_name (str): One of `QUEUE_NAMES`.
+
+    Returns:
+        (dict[str, int]): `{"concurrency": int, "prefetch_multiplier": int}`
+
+    """
+    defaults: dict[str, int] = _DEFAULT_QUEUE_OPTIONS[queue_name]
+
+    return {
+        "concurrency": int(CELERY_SETTINGS.get(f"CELERY_QUEUE_{queue_name.upper()}_CONCURRENCY", default=defaults["concurrency"])),
+        "prefetch_multiplier": int(CELERY_SETTINGS.get(f"CELERY_QUEUE_{queue_name.upper()}_PREFETCH_MULTIPLIER", default=defaults["prefetch_multiplier"])),
+    }
+
+
+def get_worker_options(queues: t.Union[str, t.Iterable[str], None] = None) -> dict[str, int]:
+    """Return the concurrency & prefetch multiplier for a worker consuming one or more queues.
+
+    Description:
+        Celery sets both per worker, not per queue. A worker consuming several queues gets the sum of their
+        concurrency, and the lowest of their prefetch multipliers so it does not hoard bulk tasks.
+
+    Params:
+        queues (str | Iterable[str] | None): The queues the worker consumes. When empty, every queue.
+
+    Returns:
+        (dict[str, int]): `{"concurrency": int, "prefetch_multiplier": int}`
+
+    """
+    queue_options: list[dict[str, int]] = [get_queue_options(queue_name) for queue_name in parse_queues(queues)]
+
+    return {
+        "concurrency": sum(options["concurrency"] for options in queue_options),
+        "prefetch_multiplier": min(options["prefetch_multiplier"] for options in queue_options),
+    }
@@ -17,16 +17,17 @@ import setup
 LOGGING_SETTINGS = settings.get_namespace("logging")
 
 
-def worker(app: Celery):
+def worker(app: Celery, queues: str | list[str] | None = None):
     """Starts the Celery worker.
 
     Params:
         app (Celery): An initialized Celery app
+        queues (str | list[str] | None): Queues the worker consumes, i.e. "realtime". When empty, every queue.
 
     """
     log.info("Starting Celery worker.")
     try:
-        start_celery_worker(app=app)
+        start_celery_worker(app=app, queues=queues)
     except Exception as exc:
         msg = f"({type(exc)}) Error running Celery worker. Details: {exc}"
         log.error(msg)
@@ -55,12 +56,14 @@ def beat(app: Celery):
     log.info("Celery beat stopped.")
 
 
-def start(app: Celery, mode: str):
+def start(app: Celery, mode: str, queues: str | list[str] | None = None):
     """Starts the Celery worker or beat schedule.
 
     Params:
         app (Celery): An initialized Celery app
         mode (str): The mode to start the Celery app in. Must be one of ['worker', 'beat']
+        queues (str | list[str] | None): Queues a worker consumes, i.e. "realtime". When empty, every queue.
+            Ignored in 'beat' mode.
 
     """
     log.info(f"Starting Celery in mode '{mode}'.")
@@ -71,7 +74,7 @@ def start(app: Celery, mode: str):
 
     match mode.lower():
         case "worker":
-            worker(app=app)
+            worker(app=app, queues=queues)
         case "beat":
             beat(app=app)
         case _:
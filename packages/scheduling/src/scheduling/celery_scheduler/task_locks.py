@@ -0,0 +1,287 @@
+"""Singleton locks for Celery tasks, so a run is skipped while another run of the same task is in progress.
+
+Description:
+    When a scheduled run stalls past its interval, beat sends the task again and both runs request & save the same
+    comic. `singleton_task()` wraps a task body in a `TaskLock`. A run that cannot take the lock returns
+    `{"status": "skipped", ...}` straight away, instead of waiting for the lock or being queued again.
+
+    Locks are kept in Redis (the result backend, see `return_redis_url()`) with `SET NX PX`, so workers on every host
+    share them. When the `CELERY_TASK_LOCK_BACKEND` setting is "file", or Redis cannot be reached, a lock file in
+    `CELERY_TASK_LOCK_DIR` is used instead. That only covers workers on the same host. Taking over an expired lock
+    file & releasing one happen under an `flock` on a `<name>.lock.guard` file next to it, so two runs cannot both
+    take over the same expired lock.
+
+    Every lock has a timeout, so a lock held by a worker that died is released on its own. Set it longer than the
+    task can run.
+
+Usage:
+    @current_app.task(name="poll_current_comic")
+    @singleton_task(lock_name="current_comic", timeout=900)
+    def task_poll_current_comic() -> dict:
+        ...
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+import importlib.util
+import json
+import os
+from pathlib import Path
+import time
+import typing as t
+import uuid
+
+from scheduling.celery_scheduler.celeryconfig import CELERY_SETTINGS, return_redis_url
+
+from loguru import logger as log
+
+try:
+    import fcntl
+except ImportError:
+    ## Windows. Lock file takeovers are not guarded
+    fcntl = None
+
+## Result returned by a run that was skipped because another run held its lock
+STATUS_SKIPPED: str = "skipped"
+
+## "redis" or "file"
+LOCK_BACKEND: str = CELERY_SETTINGS.get("CELERY_TASK_LOCK_BACKEND", default="redis")
+## Directory lock files are created in, by the "file" backend & when Redis cannot be reached
+LOCK_DIR: str = CELERY_SETTINGS.get("CELERY_TASK_LOCK_DIR", default=".locks")
+LOCK_KEY_PREFIX: str = "auto-xkcd:task-lock"
+
+## Delete the lock only if it still holds this run's token, so a run whose lock expired cannot release the next run's lock
+##   KEYS[1]: lock key
+##   ARGV[1]: token
+_REDIS_RELEASE_SCRIPT: str = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@lru_cache(maxsize=None)
+def _get_redis_client(redis_url: str) -> t.Any:
+    import redis
+
+    ## Fail fast when Redis is down, the lock falls back to a lock file
+    return redis.Redis.from_url(redis_url, socket_connect_timeout=5, socket_timeout=5)
+
+
+class TaskLock:
+    """A non-blocking lock shared by every worker, held for at most `timeout` seconds.
+
+    Params:
+        name (str): Lock name. Tasks using the same name never run at the same time.
+        timeout (float): (default: 600) Seconds until the lock expires if it is not released.
+        redis_url (str | None): Redis server to keep the lock in. When `None`, the Celery result backend is used.
+        backend (str | None): "redis" or "file". When `None`, the `CELERY_TASK_LOCK_BACKEND` setting is used.
+        lock_dir (str | Path | None): Directory for lock files. When `None`, the `CELERY_TASK_LOCK_DIR` setting is used.
+    """
+
+    def __init__(self, name: str, timeout: float = 600, redis_url: str | None = None, backend: str | None = None, lock_dir: t.Union[str, Path, None] = None):
+        if not name:
+            raise ValueError("Missing a lock name")
+        if timeout <= 0:
+            raise ValueError(f"timeout must be a positive number of seconds. Got: {timeout}")
+
+        self.name: str = name
+        self.timeout: float = timeout
+        self.redis_url: str | None = redis_url
+        self.backend: str = str(backend or LOCK_BACKEND).lower()
+        self.lock_dir: Path = Path(lock_dir or LOCK_DIR)
+
+        self.token: str = uuid.uuid4().hex
+        ## Backend holding the lock, once acquired
+        self.acquired_backend: str | None = None
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_val, traceback) -> t.Literal[False]:
+        self.release()
+
+        return False
+
+    @property
+    def key(self) -> str:
+        return f"{LOCK_KEY_PREFIX}:{self.name}"
+
+    @property
+    def path(self) -> Path:
+        return self.lock_dir / f"{self.name}.lock"
+
+    @property
+    def guard_path(self) -> Path:
+        return self.lock_dir / f"{self.name}.lock.guard"
+
+    @property
+    def locked(self) -> bool:
+        return self.acquired_backend is not None
+
+    def acquire(self) -> bool:
+        """Take the lock without waiting. Returns `False` if another run holds it."""
+        if self.locked:
+            return True
+
+        if self.backend == "redis":
+            try:
+                acquired: bool | None = self._acquire_redis()
+            except Exception as exc:
+                log.warning(f"({type(exc)}) Error taking task lock '{self.name}' in Redis, falling back to a lock file. Details: {exc}")
+                acquired = None
+
+            if acquired is not None:
+                self.acquired_backend = "redis" if acquired else None
+
+                return acquired
+
+        acquired = self._acquire_file()
+        self.acquired_backend = "file" if acquired else None
+
+        return acquired
+
+    def release(self) -> bool:
+        """Release the lock if this run still holds it. Returns `True` if a lock was released."""
+        backend: str | None = self.acquired_backend
+        self.acquired_backend = None
+
+        try:
+            match backend:
+                case "redis":
+                    return bool(self._get_redis().register_script(_REDIS_RELEASE_SCRIPT)(keys=[self.key], args=[self.token]))
+                case "file":
+                    return self._release_file()
+                case _:
+                    return False
+        except Exception as exc:
+            log.warning(f"({type(exc)}) Error releasing task lock '{self.name}', it expires in at most {self.timeout}s. Details: {exc}")
+
+            return False
+
+    def _get_redis(self) -> t.Any:
+        return _get_redis_client(self.redis_url or return_redis_url())
+
+    def _acquire_redis(self) -> bool | None:
+        """Take the lock in Redis. Returns `None` when the `redis` package is not installed."""
+        if not importlib.util.find_spec("redis"):
+            log.warning("Task locks in Redis require the 'redis' package. Falling back to a lock file.")
+
+            return None
+
+        return bool(self._get_redis().set(self.key, self.token, nx=True, px=int(self.timeout * 1000)))
+
+    def _read_file(self) -> dict | None:
+        try:
+            return json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            ## Half-written by a run creating it right now, or left behind by a run that died while writing it
+            return {}
+
+    @contextmanager
+    def _file_guard(self) -> t.Generator[None, None, None]:
+        """Hold an exclusive `flock` on the lock's guard file, so only one run at a time takes over or releases the lock file."""
+        fd: int = os.open(self.guard_path, os.O_CREAT | os.O_RDWR)
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+
+            yield
+        finally:
+            ## Closing the file releases the flock
+            os.close(fd)
+
+    def _write_file(self) -> None:
+        """Replace the lock file with this run's token in one step, so no other run sees it missing or half-written."""
+        tmp_path: Path = self.path.with_name(f".{self.path.name}.{self.token}.tmp")
+        tmp_path.write_text(json.dumps({"token": self.token, "pid": os.getpid(), "expires": time.time() + self.timeout}))
+        os.replace(tmp_path, self.path)
+
+    def _acquire_file(self) -> bool:
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+        ## Two attempts: the second after the lock file was released between open() & reading it
+        for _ in range(2):
+            try:
+                fd: int = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                ## Lock files are only removed or replaced under the guard, so the lock read here is the one replaced
+                with self._file_guard():
+                    held: dict | None = self._read_file()
+
+                    if held is None:
+                        ## Released between open() & read
+                        continue
+
+                    try:
+                        ## A lock file that cannot be read expires `timeout` seconds after it was written
+                        expires: float = held.get("expires") or self.path.stat().st_mtime + self.timeout
+                    except FileNotFoundError:
+                        continue
+
+                    if expires > time.time():
+                        return False
+
+                    log.warning(f"Task lock file '{self.path}' expired (held by PID {held.get('pid')}), taking it over.")
+                    self._write_file()
+
+                return True
+
+            with os.fdopen(fd, "w") as f:
+                json.dump({"token": self.token, "pid": os.getpid(), "expires": time.time() + self.timeout}, f)
+
+            return True
+
+        return False
+
+    def _release_file(self) -> bool:
+        with self._file_guard():
+            held: dict | None = self._read_file()
+            if not held or held.get("token") != self.token:
+                return False
+
+            self.path.unlink(missing_ok=True)
+
+        return True
+
+
+def singleton_task(lock_name: str | None = None, timeout: float = 600) -> t.Callable[[t.Callable[..., t.Any]], t.Callable[..., t.Any]]:
+    """Skip a task run while another run holding the same lock is in progress.
+
+    Description:
+        Put the decorator below `@current_app.task(...)`. A skipped run logs why & returns
+        `{"status": "skipped", "lock": <lock name>}`.
+
+    Params:
+        lock_name (str | None): Name of the lock. Tasks sharing a name are never run at the same time. When `None`,
+            the function's name is used.
+        timeout (float): (default: 600) Seconds until the lock expires if a run dies without releasing it.
+
+    """
+
+    def decorator(func: t.Callable[..., t.Any]) -> t.Callable[..., t.Any]:
+        name: str = lock_name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
+            lock: TaskLock = TaskLock(name=name, timeout=timeout)
+
+            if not lock.acquire():
+                log.info(f"Another run holds task lock '{name}', skipping {func.__name__}.")
+
+                return {"status": STATUS_SKIPPED, "lock": name}
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                lock.release()
+
+        return wrapper
+
+    return decorator
@@ -11,6 +11,8 @@ def execute_celery_task(task_name: str, celery_app: Celery, *args, **kwargs) ->
 
     Params:
         task_name (str): The name of the Celery task to execute.
+        celery_app (Celery): The app to send the task to. Pass a `LocalTaskExecutor` to run the task
+            in this process, which returns a `LocalAsyncResult`.
         *args: Positional arguments to pass to the task.
         **kwargs: Keyword arguments to pass to the task.
 
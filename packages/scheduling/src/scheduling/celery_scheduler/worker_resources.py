@@ -0,0 +1,143 @@
+"""Per-process resources shared by every task a Celery worker process runs.
+
+Description:
+    Each worker process builds one `XkcdApiController` (pooled HTTP client, HTTP cache & rate limit handles),
+    database engine & session pool, and reuses them for every task instead of building them in each task body.
+
+    When `CELERY_WORKER_WARM_UP` is enabled, the `worker_process_init` signal builds & opens them while the worker
+    boots, so the first task after a restart does not pay for it. Resources are also built on first use, i.e. in
+    the solo pool or when tasks run eagerly, where `worker_process_init` is not sent. `worker_process_shutdown`
+    closes them.
+
+Usage:
+    with worker_resources.shared_api_controller() as api_ctl:
+        comic = api_ctl.get_current_comic()
+
+    engine = worker_resources.get_engine()
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+import os
+import threading
+import typing as t
+
+from scheduling.celery_scheduler.celeryconfig import (
+    CELERY_SETTINGS,
+    return_http_cache_redis_url,
+    return_rate_limit_redis_url,
+)
+
+from celery.signals import worker_process_init, worker_process_shutdown
+import db_lib
+import depends
+from loguru import logger as log
+import sqlalchemy as sa
+import sqlalchemy.orm as so
+import xkcdapi.controllers
+from xkcdapi.image_store import get_image_store
+
+## Build the process's resources when the worker process starts, instead of in its first task
+WARM_UP: bool = CELERY_SETTINGS.get("CELERY_WORKER_WARM_UP", default=True)
+
+_api_controller: xkcdapi.controllers.XkcdApiController | None = None
+## PID of the process that built _api_controller. A forked child builds its own, the parent's sockets are not shared
+_api_controller_pid: int | None = None
+_lock: threading.Lock = threading.Lock()
+
+
+def get_api_controller() -> xkcdapi.controllers.XkcdApiController:
+    """Return this process's open `XkcdApiController`, building it on first use.
+
+    Description:
+        The controller is opened once & stays open for the life of the process. Do not close it (or use it
+        in a `with` block, which closes it on exit), use `shared_api_controller()` instead.
+
+    Returns:
+        (XkcdApiController): An open controller, sharing the HTTP rate limit & cache with the other workers.
+
+    """
+    global _api_controller, _api_controller_pid
+
+    if _api_controller is not None and _api_controller_pid == os.getpid():
+        return _api_controller
+
+    with _lock:
+        if _api_controller is None or _api_controller_pid != os.getpid():
+            api_controller: xkcdapi.controllers.XkcdApiController = xkcdapi.controllers.XkcdApiController(rate_limit_redis_url=return_rate_limit_redis_url(), cache_redis_url=return_http_cache_redis_url())
+
+            _api_controller = api_controller.open()
+            _api_controller_pid = os.getpid()
+
+    return _api_controller
+
+
+@contextmanager
+def shared_api_controller() -> t.Generator[xkcdapi.controllers.XkcdApiController, None, None]:
+    """Use this process's `XkcdApiController` in a `with` block, without closing it on exit."""
+    yield get_api_controller()
+
+
+def get_engine() -> sa.Engine:
+    """Return this process's database engine, built from the app's database settings on first use."""
+    return depends.db_depends.get_db_engine()
+
+
+def get_session_pool() -> so.sessionmaker[so.Session]:
+    """Return the session pool bound to this process's database engine."""
+    return db_lib.get_cached_session_pool(get_engine())
+
+
+def warm_up() -> None:
+    """Build & open this process's resources, and check out a first database connection."""
+    get_api_controller()
+
+    engine: sa.Engine = get_engine()
+    get_session_pool()
+
+    ## Connect once so the pool holds a connection before the first task asks for one
+    with engine.connect():
+        pass
+
+    get_image_store()
+
+
+def close_resources() -> None:
+    """Close this process's `XkcdApiController` & dispose its database connection pools."""
+    global _api_controller, _api_controller_pid
+
+    with _lock:
+        api_controller: xkcdapi.controllers.XkcdApiController | None = _api_controller if _api_controller_pid == os.getpid() else None
+
+        _api_controller = None
+        _api_controller_pid = None
+
+    if api_controller:
+        try:
+            api_controller.close()
+        except Exception as exc:
+            log.warning(f"({type(exc)}) Error closing XKCD API controller. Details: {exc}")
+
+    db_lib.dispose_engines(close=True)
+
+
+@worker_process_init.connect
+def _warm_up_worker_process(**kwargs: t.Any) -> None:
+    if not WARM_UP:
+        return
+
+    try:
+        warm_up()
+    except Exception as exc:
+        ## Tasks build whatever is missing on first use, a failed warm-up should not stop the worker
+        log.warning(f"({type(exc)}) Error warming up worker process {os.getpid()}. Details: {exc}")
+
+        return
+
+    log.debug(f"Worker process {os.getpid()} warmed up.")
+
+
+@worker_process_shutdown.connect
+def _close_worker_process_resources(**kwargs: t.Any) -> None:
+    close_resources()
@@ -1,3 +1,4 @@
 from __future__ import annotations
 
+from .async_comic_controllers import AsyncXkcdApiController
 from .comic_controllers import XkcdApiController
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import AbstractAsyncContextManager
+import time
+import typing as t
+
+from xkcdapi.helpers import (
+    comic_num_req,
+    current_comic_req,
+    parse_comic_record,
+    parse_comic_response,
+    return_comic_num_url,
+    return_current_comic_url,
+)
+from xkcdapi.image_store import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    ImageStoreBase,
+    ImageStreamWriter,
+    StoredImage,
+    get_image_store,
+)
+from xkcdapi.metrics import observe_response
+
+from domain import xkcd as xkcd_domain
+from domain.xkcd.constants import IGNORE_COMIC_NUMS, XKCD_URL_BASE
+import http_lib
+import httpx
+from loguru import logger as log
+
+class AsyncXkcdApiController(AbstractAsyncContextManager):
+    """Async controller for requesting XKCD comics & images concurrently.
+
+    Description:
+        Wraps an `http_lib.AsyncHttpxController`, sharing one pooled `httpx.AsyncClient` across all requests.
+        The number of comics being fetched at once (JSON + image) is bounded by `max_concurrency`.
+
+    Params:
+        use_cache (bool): (default: True) Use the hishel HTTP cache.
+        force_cache (bool): (default: True) Cache responses even when the server's headers say not to.
+        cache_ttl (int): (default: 900) Amount of time, in seconds, cached responses live for.
+        follow_redirects (bool): (default: True) Follow redirect responses.
+        max_concurrency (int): (default: 25) Maximum number of comics requested at the same time.
+        stream_imgs (bool): (default: False) Stream images straight into the image store (see `stream_comic_img()`)
+            instead of reading them into memory.
+        image_store (ImageStoreBase | None): The store streamed images are saved to. When `None`, the store configured
+            in the app's `[image_store]` settings is used.
+        rate_limit_redis_url (str | None): Share the per-host request rate limit with other processes through this Redis
+            server. When `None`, the `HTTP_RATELIMIT_REDIS_URL` HTTP setting is used.
+        cache_redis_url (str | None): Cache responses in this Redis server, shared with other processes & hosts. When
+            `None`, the cache configured in the HTTP settings is used.
+        base_url (str): (default: "https://xkcd.com") The XKCD site comics are requested from, i.e. a local stand-in
+            for benchmarks.
+
+    Usage:
+        async with AsyncXkcdApiController(max_concurrency=50) as api_ctl:
+            async for comics, comic_imgs in api_ctl.crawl_range(start=1, end=100):
+                ...
+    """
+
+    def __init__(self, use_cache: bool = True, force_cache: bool = True, cache_ttl: int = 900, follow_redirects: bool = True, max_concurrency: int = 25, stream_imgs: bool = False, image_store: ImageStoreBase | None = None, rate_limit_redis_url: str | None = None, cache_redis_url: str | None = None, base_url: str = XKCD_URL_BASE):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be a positive integer. Got: {max_concurrency}")
+
+        self.use_cache = use_cache
+        self.force_cache = force_cache
+        self.cache_ttl = cache_ttl
+        self.follow_redirects = follow_redirects
+        self.max_concurrency = max_concurrency
+        self.stream_imgs = stream_imgs
+        self.image_store = image_store
+        self.rate_limit_redis_url = rate_limit_redis_url
+        self.cache_redis_url = cache_redis_url
+        self.base_url = base_url.rstrip("/")
+
+        ## HTTP controller
+        self.http_controller: http_lib.AsyncHttpxController | None = None
+        ## Limits the number of comics being requested at once
+        self._semaphore: asyncio.Semaphore | None = None
+        ## Comic numbers that failed during the last crawl, and the error for each
+        self.failed_comic_nums: dict[int, str] = {}
+
+    async def __aenter__(self) -> t.Self:
+        http_controller: http_lib.AsyncHttpxController = self._get_http_controller()
+        self.http_controller = await http_controller.__aenter__()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, traceback) -> t.Literal[False] | None:
+        if self.http_controller:
+            await self.http_controller.__aexit__(None, None, None)
+            self.http_controller = None
+
+        if exc_val:
+            msg = f"({exc_type}) {exc_val}"
+            log.error(msg)
+
+            if traceback:
+                log.error(f"Traceback: {traceback}")
+
+            return False
+
+        return
+
+    def current_comic_url(self) -> str:
+        return return_current_comic_url(base_url=self.base_url)
+
+    def get_cache_stats(self) -> dict:
+        """Return the HTTP cache hits, misses & hit ratio for requests sent by this controller."""
+        if not self.http_controller:
+            return {}
+
+        return self.http_controller.get_cache_stats()
+
+    def comic_url(self, comic_num: t.Union[int, str]) -> str:
+        return return_comic_num_url(comic_num=comic_num, base_url=self.base_url)
+
+    def _get_http_controller(self) -> http_lib.AsyncHttpxController:
+        rate_limit_kwargs: dict = {"rate_limit_redis_url": self.rate_limit_redis_url} if self.rate_limit_redis_url else {}
+        cache_kwargs: dict = {"cache_type": "redis", "cache_redis_url": self.cache_redis_url} if self.cache_redis_url else {}
+
+        http_controller: http_lib.AsyncHttpxController = http_lib.get_async_http_controller(use_cache=self.use_cache, force_cache=self.force_cache, follow_redirects=self.follow_redirects, cache_ttl=self.cache_ttl, max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency, **rate_limit_kwargs, **cache_kwargs)
+
+        return http_controller
+
+    async def _send(self, req: httpx.Request, kind: str = "other") -> httpx.Response:
+        """Send a request, recording its latency & cache result under the endpoint `kind` ("current", "comic" or "img")."""
+        if not self.http_controller:
+            raise RuntimeError("AsyncXkcdApiController is not open. Use 'async with' before sending requests.")
+
+        start: float = time.perf_counter()
+        res: httpx.Response = await self.http_controller.send_request(request=req)
+        observe_response(kind=kind, response=res, seconds=time.perf_counter() - start)
+
+        return res
+
+    async def get_current_comic(self) -> xkcd_domain.XkcdComicIn | None:
+        req: httpx.Request = current_comic_req(base_url=self.base_url)
+        res: httpx.Response = await self._send(req, kind="current")
+
+        if res.status_code != 200:
+            log.warning(f"Non-200 response: [{res.status_code}: {res.reason_phrase}]")
+
+            return
+
+        return parse_comic_response(response=res)
+
+    async def get_comic(self, comic_num: t.Union[int, str], as_record: bool = False) -> xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord | None:
+        """Request a comic. When `as_record` is `True`, return a lightweight `XkcdComicRecord` instead of an `XkcdComicIn`."""
+        req: httpx.Request = comic_num_req(comic_num=comic_num, base_url=self.base_url)
+        res: httpx.Response = await self._send(req, kind="comic")
+
+        if res.status_code != 200:
+            log.warning(f"Non-200 response for comic #{comic_num}: [{res.status_code}: {res.reason_phrase}]")
+
+            return
+
+        if as_record:
+            return parse_comic_record(response=res)
+
+        return parse_comic_response(response=res)
+
+    async def get_comic_img(self, comic: t.Union[xkcd_domain.XkcdComicIn, xkcd_domain.XkcdComicOut, xkcd_domain.XkcdComicRecord]) -> xkcd_domain.XkcdComicImgIn | None:
+        if not comic.img_url:
+            log.warning(f"Comic #{comic.num} does not have an image URL.")
+
+            return
+
+        req: httpx.Request = http_lib.build_request(url=comic.img_url)
+        res: httpx.Response = await self._send(req, kind="img")
+
+        if res.status_code != 200:
+            log.warning(f"Non-200 response for comic #{comic.num} image: [{res.status_code}: {res.reason_phrase}]")
+
+            return
+
+        return xkcd_domain.XkcdComicImgIn(num=comic.num, img_bytes=res.content)
+
+    async def stream_comic_img(self, comic: t.Union[xkcd_domain.XkcdComicIn, xkcd_domain.XkcdComicOut, xkcd_domain.XkcdComicRecord], chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> xkcd_domain.XkcdComicImgIn | None:
+        """Download a comic's image straight into the image store, holding at most one chunk in memory.
+
+        Returns:
+            (XkcdComicImgIn | None): The comic image with its content hash, size & MIME type, and no `img_bytes`.
+
+        """
+        if not comic.img_url:
+            log.warning(f"Comic #{comic.num} does not have an image URL.")
+
+            return
+
+        if self.image_store is None:
+            self.image_store = get_image_store()
+
+        req: httpx.Request = http_lib.build_request(url=comic.img_url)
+
+        if not self.http_controller:
+            raise RuntimeError("AsyncXkcdApiController is not open. Use 'async with' before sending requests.")
+
+        start: float = time.perf_counter()
+        ## Around the HTTP cache, which would read the whole body & store a copy of it
+        res: httpx.Response = await self.http_controller.send_uncached_request(request=req, stream=True)
+
+        try:
+            if res.status_code != 200:
+                log.warning(f"Non-200 response for comic #{comic.num} image: [{res.status_code}: {res.reason_phrase}]")
+
+                return
+
+            writer: ImageStreamWriter = self.image_store.open_writer()
+            try:
+                async for chunk in res.aiter_bytes(chunk_size=chunk_size):
+                    writer.write(chunk)
+
+                ## Moving the finished file into the store may be a network upload, keep it off the event loop
+                stored_img: StoredImage = await asyncio.to_thread(writer.finish)
+            except BaseException:
+                writer.abort()
+
+                raise
+        finally:
+            await res.aclose()
+            observe_response(kind="img", response=res, seconds=time.perf_counter() - start)
+
+        return xkcd_domain.XkcdComicImgIn(num=comic.num, img_hash=stored_img.img_hash, img_size=stored_img.img_size, img_mime_type=stored_img.img_mime_type)
+
+    async def get_comic_and_img(self, comic_num: t.Union[int, str], as_record: bool = False) -> t.Tuple[xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord, xkcd_domain.XkcdComicImgIn | None]:
+        log.debug(f"Request comic #{comic_num}")
+        comic: xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord | None = await self.get_comic(comic_num=comic_num, as_record=as_record)
+
+        if not comic:
+            raise ValueError(f"Error getting comic #{comic_num}")
+
+        log.debug(f"Request image for comic #{comic_num}")
+        if self.stream_imgs:
+            comic_img: xkcd_domain.XkcdComicImgIn | None = await self.stream_comic_img(comic=comic)
+        else:
+            comic_img: xkcd_domain.XkcdComicImgIn | None = await self.get_comic_img(comic=comic)
+
+        return comic, comic_img
+
+    async def _crawl_one(self, comic_num: int, as_record: bool = False) -> t.Tuple[xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord, xkcd_domain.XkcdComicImgIn | None] | None:
+        """Request a single comic & its image, holding one of the controller's concurrency slots."""
+        async with self._semaphore:
+            try:
+                return await self.get_comic_and_img(comic_num=comic_num, as_record=as_record)
+            except Exception as exc:
+                msg = f"({type(exc)}) Error requesting comic #{comic_num}. Details: {exc}"
+                log.warning(msg)
+
+                self.failed_comic_nums[comic_num] = str(exc)
+
+                return None
+
+    async def crawl_comics(self, comic_nums: t.Iterable[int], batch_size: int = 100, as_records: bool = False) -> t.AsyncIterator[t.Tuple[list[xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord], list[xkcd_domain.XkcdComicImgIn]]]:
+        """Request many comics & their images concurrently, yielding results in batches as they complete.
+
+        Description:
+            Comic numbers in `IGNORE_COMIC_NUMS` are skipped. Comics that fail to download are logged,
+            recorded in `self.failed_comic_nums` and left out of the yielded batches. A comic without an
+            image is yielded in the comics list with no matching entry in the images list.
+
+        Params:
+            comic_nums (Iterable[int]): The comic numbers to request.
+            batch_size (int): (default: 100) Number of comics to collect before yielding a batch.
+            as_records (bool): (default: False) Yield lightweight `XkcdComicRecord`s instead of `XkcdComicIn`s. Records
+                take less memory & convert straight to database rows, use them when the batches are only saved.
+
+        Yields:
+            (Tuple[list[XkcdComicIn | XkcdComicRecord], list[XkcdComicImgIn]]): A batch of comics and their images.
+
+        """
+        if not self.http_controller:
+            raise RuntimeError("AsyncXkcdApiController is not open. Use 'async with' before crawling.")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer. Got: {batch_size}")
+
+        _nums: list[int] = sorted({int(n) for n in comic_nums if int(n) not in IGNORE_COMIC_NUMS})
+        if not _nums:
+            log.warning("No comic numbers to crawl.")
+            return
+
+        log.info(f"Crawling [{len(_nums)}] comic(s) with max concurrency [{self.max_concurrency}]")
+        self.failed_comic_nums = {}
+
+        tasks: list[asyncio.Task] = [asyncio.create_task(self._crawl_one(num, as_record=as_records)) for num in _nums]
+
+        comics: list[xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord] = []
+        comic_imgs: list[xkcd_domain.XkcdComicImgIn] = []
+
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                if result is None:
+                    continue
+
+                comic, comic_img = result
+                comics.append(comic)
+                if comic_img:
+                    comic_imgs.append(comic_img)
+
+                if len(comics) >= batch_size:
+                    yield comics, comic_imgs
+
+                    comics, comic_imgs = [], []
+
+            if comics:
+                yield comics, comic_imgs
+        finally:
+            ## Cancel outstanding requests if the consumer stops iterating early
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        if self.failed_comic_nums:
+            log.warning(f"Failed requesting [{len(self.failed_comic_nums)}] comic(s): {sorted(self.failed_comic_nums.keys())}")
+
+    async def crawl_range(self, start: int, end: int, batch_size: int = 100, as_records: bool = False) -> t.AsyncIterator[t.Tuple[list[xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord], list[xkcd_domain.XkcdComicImgIn]]]:
+        """Request every comic from `start` to `end` (inclusive), yielding results in batches.
+
+        Params:
+            start (int): The first comic number to request.
+            end (int): The last comic number to request.
+            batch_size (int): (default: 100) Number of comics to collect before yielding a batch.
+            as_records (bool): (default: False) Yield lightweight `XkcdComicRecord`s instead of `XkcdComicIn`s.
+
+        """
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid comic range: {start}-{end}")
+
+        async for batch in self.crawl_comics(comic_nums=range(start, end + 1), batch_size=batch_size, as_records=as_records):
+            yield batch
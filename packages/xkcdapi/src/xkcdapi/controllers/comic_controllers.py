@@ -3,14 +3,23 @@ from __future__ import annotations
 from contextlib import AbstractContextManager, contextmanager
 import json
 from pathlib import Path
+import time
 import typing as t
 
 from xkcdapi.helpers import (
     comic_num_req,
     current_comic_req,
+    parse_comic_response,
     return_comic_num_url,
     return_current_comic_url,
 )
+from xkcdapi.image_store import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    ImageStoreBase,
+    StoredImage,
+    get_image_store,
+)
+from xkcdapi.metrics import observe_response
 
 from domain import xkcd as xkcd_domain
 from domain.xkcd.constants import (
@@ -24,26 +33,54 @@ import httpx
 from loguru import logger as log
 
 class XkcdApiController(AbstractContextManager):
-    def __init__(self, use_cache: bool = True, force_cache: bool = True, cache_ttl: int = 900, follow_redirects: bool = True):
+    """Controller for requesting XKCD comics & images.
+
+    Description:
+        Holds one persistent `http_lib.HttpxController` for its whole lifetime. The httpx client, its pool of
+        keep-alive connections & the cache connection are opened on the first request (or on `__enter__()`) and
+        reused by every request until the controller is closed, instead of being rebuilt for each request.
+
+    Params:
+        use_cache (bool): (default: True) Use the hishel HTTP cache.
+        force_cache (bool): (default: True) Cache responses even when the server's headers say not to.
+        cache_ttl (int): (default: 900) Amount of time, in seconds, cached responses live for.
+        follow_redirects (bool): (default: True) Follow redirect responses.
+        http2 (bool): (default: False) Enable HTTP/2 (requires `httpx[http2]`).
+        max_connections (int): (default: 10) Maximum number of connections in the client's pool.
+        max_keepalive_connections (int): (default: 10) Maximum number of idle connections kept alive.
+        keepalive_expiry (float): (default: 30.0) Time, in seconds, an idle connection is kept alive for.
+        rate_limit_redis_url (str | None): Share the per-host request rate limit with other processes through this Redis
+            server. When `None`, the `HTTP_RATELIMIT_REDIS_URL` HTTP setting is used.
+        cache_redis_url (str | None): Cache responses in this Redis server, shared with other processes & hosts. When
+            `None`, the cache configured in the HTTP settings is used.
+        base_url (str): (default: "https://xkcd.com") The XKCD site comics are requested from, i.e. a local stand-in
+            for benchmarks.
+    """
+
+    def __init__(self, use_cache: bool = True, force_cache: bool = True, cache_ttl: int = 900, follow_redirects: bool = True, http2: bool = False, max_connections: int = 10, max_keepalive_connections: int = 10, keepalive_expiry: float = 30.0, rate_limit_redis_url: str | None = None, cache_redis_url: str | None = None, base_url: str = XKCD_URL_BASE):
         
         self.use_cache = use_cache
         self.force_cache = force_cache
         self.cache_ttl = cache_ttl
         self.follow_redirects = follow_redirects
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.rate_limit_redis_url = rate_limit_redis_url
+        self.cache_redis_url = cache_redis_url
+        self.base_url = base_url.rstrip("/")
         
         ## HTTP controller
         self.http_controller: http_lib.HttpxController | None = None
+        ## 200 responses from conditional requests whose validators have not been saved yet, by scope
+        self._pending_validators: dict[str, httpx.Response] = {}
         
     def __enter__(self) -> t.Self:
-        http_controller: http_lib.HttpxController = self._get_http_controller()
-        self.http_controller = http_controller
-        
-        return self
+        return self.open()
     
     def __exit__(self, exc_type, exc_val, traceback) -> t.Literal[False] | None:
-        if self.http_controller:
-            if self.http_controller.client:
-                self.http_controller.client.close()
+        self.close()
 
         if exc_val:
             msg = f"({exc_type}) {exc_val}"
@@ -56,79 +93,202 @@ class XkcdApiController(AbstractContextManager):
         
         return
     
+    def open(self) -> t.Self:
+        """Build & open the persistent HTTP client, its connection pool & cache. Returns early if already open."""
+        self._get_open_http_controller()
+        
+        return self
+    
+    def close(self) -> None:
+        """Close the persistent HTTP client & its connection pool."""
+        if self.http_controller:
+            self.http_controller.close()
+    
     def current_comic_url(self) -> str:
-        return return_current_comic_url()
+        return return_current_comic_url(base_url=self.base_url)
+    
+    def get_cache_stats(self) -> dict:
+        """Return the HTTP cache hits, misses & hit ratio for requests sent by this controller."""
+        if not self.http_controller:
+            return {}
+        
+        return self.http_controller.get_cache_stats()
     
     def comic_url(self, comic_num: t.Union[int, str]) -> str:
-        return return_comic_num_url(comic_num=comic_num)
+        return return_comic_num_url(comic_num=comic_num, base_url=self.base_url)
 
-    def _get_http_controller(self):
-        http_controller: http_lib.HttpxController = http_lib.get_http_controller(use_cache=self.use_cache, force_cache=self.force_cache, follow_redirects=self.follow_redirects, cache_ttl=self.cache_ttl)
+    def _get_http_controller(self) -> http_lib.HttpxController:
+        ## Only override the HTTP settings' Redis URL when one was passed
+        rate_limit_kwargs: dict = {"rate_limit_redis_url": self.rate_limit_redis_url} if self.rate_limit_redis_url else {}
+        cache_kwargs: dict = {"cache_type": "redis", "cache_redis_url": self.cache_redis_url} if self.cache_redis_url else {}
         
-        return http_controller
-
-    def get_current_comic(self) -> xkcd_domain.XkcdComicIn:
-        req: httpx.Request = current_comic_req()
+        http_controller: http_lib.HttpxController = http_lib.get_http_controller(use_cache=self.use_cache, force_cache=self.force_cache, follow_redirects=self.follow_redirects, cache_ttl=self.cache_ttl, persistent=True, http2=self.http2, max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive_connections, keepalive_expiry=self.keepalive_expiry, **rate_limit_kwargs, **cache_kwargs)
         
+        return http_controller
+    
+    def _get_open_http_controller(self) -> http_lib.HttpxController:
+        """Return the persistent HTTP controller, creating & opening it if needed."""
         if not self.http_controller:
             self.http_controller = self._get_http_controller()
+        
+        return self.http_controller.open()
+    
+    def _send(self, req: httpx.Request, kind: str = "other") -> httpx.Response:
+        """Send a request, recording its latency & cache result under the endpoint `kind` ("current", "comic" or "img")."""
+        http_ctl: http_lib.HttpxController = self._get_open_http_controller()
+        
+        start: float = time.perf_counter()
+        res: httpx.Response = http_ctl.send_request(request=req)
+        observe_response(kind=kind, response=res, seconds=time.perf_counter() - start)
+        
+        return res
 
-        with self.http_controller as http_ctl:
-            res = http_ctl.send_request(req)
+    def get_current_comic(self) -> xkcd_domain.XkcdComicIn:
+        req: httpx.Request = current_comic_req(base_url=self.base_url)
+        res: httpx.Response = self._send(req, kind="current")
 
         if res.status_code != 200:
             log.warning(f"Non-200 response: [{res.status_code}: {res.reason_phrase}]")
             
             return
         
-        ## Create dict from response
-        res_dict: dict = http_lib.decode_response(response=res)
-        ## Create XkcdApiResponseIn object
-        comic_res: xkcd_domain.XkcdApiResponseIn = xkcd_domain.XkcdApiResponseIn(response_content=res_dict)
-        ## Create XkcdComicIn object
-        comic: xkcd_domain.XkcdComicIn = comic_res.return_comic_obj()
+        ## Create XkcdComicIn object from the response's JSON bytes
+        comic: xkcd_domain.XkcdComicIn = parse_comic_response(response=res)
                 
         return comic
         
-    def get_comic(self, comic_num: t.Union[int, str]) -> xkcd_domain.XkcdComicIn:
-        req: httpx.Request = comic_num_req(comic_num=comic_num)
+    def get_current_comic_if_modified(self, scope: str = "current_comic") -> xkcd_domain.XkcdComicIn | None:
+        """Request the current comic with the ETag/Last-Modified validators saved from the last poll.
+
+        Description:
+            When the server answers `304 Not Modified`, the response has no body & `None` is returned without
+            parsing anything, so callers can skip the image request & database write.
+
+            The new validators are not saved until `commit_validators()` is called with the same scope. Call it once
+            the comic has been processed, so a poll that fails part way is retried in full next time.
+
+        Params:
+            scope (str): (default: "current_comic") Namespace for the saved validators. Use a different scope for
+                each job polling the current comic, so one job's poll does not hide a new comic from another.
+
+        Returns:
+            (XkcdComicIn | None): The current comic, or `None` if it has not changed.
+
+        Raises:
+            httpx.HTTPStatusError: When the server answers with a status other than 200 or 304, so a failed poll is
+                not mistaken for an unchanged comic.
+
+        """
+        req: httpx.Request = current_comic_req(base_url=self.base_url)
+        http_ctl: http_lib.HttpxController = self._get_open_http_controller()
         
-        if not self.http_controller:
-            self.http_controller = self._get_http_controller()
+        start: float = time.perf_counter()
+        res: httpx.Response = http_ctl.send_conditional_request(request=req, scope=scope, save_validators=False)
+        observe_response(kind="current", response=res, seconds=time.perf_counter() - start)
         
-        with self.http_controller as http_ctl:
-            res = http_ctl.send_request(request=req)
+        if res.status_code == 304:
+            log.debug(f"Current comic not modified since last poll (scope: {scope}).")
+            
+            return
         
         if res.status_code != 200:
             log.warning(f"Non-200 response: [{res.status_code}: {res.reason_phrase}]")
             
-        ## Create dict from response
-        res_dict: dict = http_lib.decode_response(response=res)
-        ## Create XkcdApiResponseIn object
-        comic_res: xkcd_domain.XkcdApiResponseIn = xkcd_domain.XkcdApiResponseIn(response_content=res_dict)
-        ## Create XkcdComiIn object
-        comic: xkcd_domain.XkcdComicIn = comic_res.return_comic_obj()
+            raise httpx.HTTPStatusError(f"Error requesting current comic (scope: {scope}): [{res.status_code}: {res.reason_phrase}]", request=res.request, response=res)
+        
+        self._pending_validators[scope] = res
+        
+        return parse_comic_response(response=res)
+    
+    def commit_validators(self, scope: str = "current_comic") -> bool:
+        """Save the validators from the last `get_current_comic_if_modified()` response for `scope`.
+
+        Returns:
+            (bool): `True` if validators were saved.
+
+        """
+        res: httpx.Response | None = self._pending_validators.pop(scope, None)
+        if res is None:
+            return False
+        
+        http_ctl: http_lib.HttpxController = self._get_open_http_controller()
+        
+        return http_ctl.save_validators(response=res, scope=scope)
+        
+    def get_comic(self, comic_num: t.Union[int, str]) -> xkcd_domain.XkcdComicIn:
+        req: httpx.Request = comic_num_req(comic_num=comic_num, base_url=self.base_url)
+        res: httpx.Response = self._send(req, kind="comic")
+        
+        if res.status_code != 200:
+            log.warning(f"Non-200 response: [{res.status_code}: {res.reason_phrase}]")
+            
+        ## Create XkcdComicIn object from the response's JSON bytes
+        comic: xkcd_domain.XkcdComicIn = parse_comic_response(response=res)
         
         return comic
 
     def get_comic_img(self, comic: t.Union[xkcd_domain.XkcdComicIn, xkcd_domain.XkcdComicOut]) -> xkcd_domain.XkcdComicImgIn:
         req: httpx.Request = http_lib.build_request(url=comic.img_url)
+        res: httpx.Response = self._send(req, kind="img")
+        
+        if res.status_code != 200:
+            log.warning(f"Non-200 response: [{res.status_code}: {res.reason_phrase}]")
+            
+            return
+
+        img_bytes: bytes = res.content
+        
+        comic_img: xkcd_domain.XkcdComicImgIn = xkcd_domain.XkcdComicImgIn(num=comic.num, img_bytes=img_bytes)
+        
+        return comic_img
+    
+    def stream_comic_img(self, comic: t.Union[xkcd_domain.XkcdComicIn, xkcd_domain.XkcdComicOut], image_store: ImageStoreBase | None = None, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> xkcd_domain.XkcdComicImgIn | None:
+        """Download a comic's image straight into the image store, without holding the whole image in memory.
+
+        Description:
+            The response body is read in `chunk_size` chunks, each one hashed & written to the store before the
+            next is read. The request skips the HTTP cache, which would read the whole body & store a copy of it.
+
+        Params:
+            comic (XkcdComicIn | XkcdComicOut): The comic whose image will be downloaded.
+            image_store (ImageStoreBase | None): The store to save the image to. When `None`, the store configured
+                in the app's `[image_store]` settings is used.
+            chunk_size (int): (default: 65536) Number of bytes read from the response at a time.
+
+        Returns:
+            (XkcdComicImgIn | None): The comic image with its content hash, size & MIME type, and no `img_bytes`.
+
+        """
+        if not comic.img_url:
+            log.warning(f"Comic #{comic.num} does not have an image URL.")
+            
+            return
+        
+        if image_store is None:
+            image_store = get_image_store()
+        
+        req: httpx.Request = http_lib.build_request(url=comic.img_url)
+        http_ctl: http_lib.HttpxController = self._get_open_http_controller()
         
-        with self.http_controller as http_ctl:
-            res: httpx.Response = http_ctl.send_request(request=req)
+        start: float = time.perf_counter()
+        res: httpx.Response = http_ctl.send_uncached_request(request=req, stream=True)
         
+        try:
             if res.status_code != 200:
                 log.warning(f"Non-200 response: [{res.status_code}: {res.reason_phrase}]")
                 
                 return
-
-            img_bytes: bytes = res.content
-            
-            comic_img: xkcd_domain.XkcdComicImgIn = xkcd_domain.XkcdComicImgIn(num=comic.num, img_bytes=img_bytes)
             
-            return comic_img
+            stored_img: StoredImage = image_store.put_stream(res.iter_bytes(chunk_size=chunk_size))
+        finally:
+            res.close()
+            observe_response(kind="img", response=res, seconds=time.perf_counter() - start)
+        
+        comic_img: xkcd_domain.XkcdComicImgIn = xkcd_domain.XkcdComicImgIn(num=comic.num, img_hash=stored_img.img_hash, img_size=stored_img.img_size, img_mime_type=stored_img.img_mime_type)
+        
+        return comic_img
     
-    def get_comic_and_img(self, comic_num: t.Union[int, str]) -> t.Tuple[xkcd_domain.XkcdComicIn, xkcd_domain.XkcdComicImgIn]:
+    def get_comic_and_img(self, comic_num: t.Union[int, str], stream_img: bool = False, image_store: ImageStoreBase | None = None) -> t.Tuple[xkcd_domain.XkcdComicIn, xkcd_domain.XkcdComicImgIn]:
         log.debug(f"Request comic #{comic_num}")
         try:
             comic: xkcd_domain.XkcdComicImgIn = self.get_comic(comic_num=comic_num)
@@ -143,7 +303,10 @@ class XkcdApiController(AbstractContextManager):
         
         log.debug(f"Request image for comic #{comic_num}")
         try:
-            comic_img: xkcd_domain.XkcdComicImgIn = self.get_comic_img(comic=comic)
+            if stream_img:
+                comic_img: xkcd_domain.XkcdComicImgIn = self.stream_comic_img(comic=comic, image_store=image_store)
+            else:
+                comic_img: xkcd_domain.XkcdComicImgIn = self.get_comic_img(comic=comic)
         except Exception as exc:
             msg = f"({type(exc)}) Error requesting image for comic #{comic_num}. Details: {exc}"
             log.error(msg)
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from .__methods import (
+    crawl_and_save_comic_range,
+    crawl_and_save_comics,
+    get_current_comic_num,
+    sync_missing_comics,
+    warm_cache,
+)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import typing as t
+
+from xkcdapi import db_client
+from xkcdapi.controllers import AsyncXkcdApiController, XkcdApiController
+
+from core_utils import time_utils
+from domain import xkcd as xkcd_domain
+from loguru import logger as log
+import sqlalchemy as sa
+import sqlalchemy.orm as so
+
+def _save_batch(comics: list[xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord], comic_imgs: list[xkcd_domain.XkcdComicImgIn], session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> t.Tuple[int, int]:
+    """Save a batch of crawled comics & images, returning the number of new comics & images saved."""
+    if comic_imgs:
+        db_comics, db_comic_imgs = db_client.save_multiple_comics_and_imgs_to_db(comics=comics, comic_imgs=comic_imgs, session_pool=session_pool, engine=engine)
+    else:
+        db_comics = db_client.save_multiple_comics_to_db(comics=comics, session_pool=session_pool, engine=engine)
+        db_comic_imgs = None
+
+    return len(db_comics or []), len(db_comic_imgs or [])
+
+
+async def _crawl_and_save(comic_nums: t.Iterable[int], max_concurrency: int, batch_size: int, use_cache: bool, cache_ttl: int, save: bool, session_pool: so.sessionmaker[so.Session] | None, engine: sa.Engine | None, stream_imgs: bool = False, rate_limit_redis_url: str | None = None, cache_redis_url: str | None = None) -> dict:
+    summary: dict = {"requested": 0, "crawled": 0, "saved_comics": 0, "saved_imgs": 0, "failed": []}
+
+    async with AsyncXkcdApiController(use_cache=use_cache, cache_ttl=cache_ttl, max_concurrency=max_concurrency, stream_imgs=stream_imgs, rate_limit_redis_url=rate_limit_redis_url, cache_redis_url=cache_redis_url) as api_ctl:
+        async for comics, comic_imgs in api_ctl.crawl_comics(comic_nums=comic_nums, batch_size=batch_size, as_records=True):
+            summary["crawled"] += len(comics)
+            log.info(f"Crawled batch of [{len(comics)}] comic(s) ([{summary['crawled']}] total)")
+
+            if not save:
+                continue
+
+            ## Save in a worker thread so in-flight requests keep progressing while the batch is written
+            saved_comics, saved_imgs = await asyncio.to_thread(_save_batch, comics, comic_imgs, session_pool, engine)
+            summary["saved_comics"] += saved_comics
+            summary["saved_imgs"] += saved_imgs
+
+        summary["failed"] = sorted(api_ctl.failed_comic_nums.keys())
+        summary["cache"] = api_ctl.get_cache_stats()
+
+    return summary
+
+
+def crawl_and_save_comics(comic_nums: t.Iterable[int], max_concurrency: int = 25, batch_size: int = 100, use_cache: bool = True, cache_ttl: int = 900, save: bool = True, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None, stream_imgs: bool = False, rate_limit_redis_url: str | None = None, cache_redis_url: str | None = None) -> dict:
+    """Concurrently request a set of comics & images, saving them to the database in batches.
+
+    Params:
+        comic_nums (Iterable[int]): The comic numbers to request. Numbers in `IGNORE_COMIC_NUMS` are skipped.
+        max_concurrency (int): (default: 25) Maximum number of comics requested at once.
+        batch_size (int): (default: 100) Number of comics to collect before each database write.
+        use_cache (bool): (default: True) Use the HTTP cache.
+        cache_ttl (int): (default: 900) Amount of time, in seconds, cached responses live for.
+        save (bool): (default: True) When `False`, comics are requested but not saved to the database.
+        session_pool (sqlalchemy.orm.sessionmaker[sqlalchemy.orm.Session]): An initialized SQLAlchemy sessionmaker object. If session_pool=None, a default session pool
+            will be initialized from the app's database settings.
+        engine (sqlalchemy.Engine): An initialized SQLAlchemy Engine. If engine=None, a default Engine will be initialized from the app's database settings.
+        stream_imgs (bool): (default: False) Stream images straight into the image store instead of holding them in memory.
+        rate_limit_redis_url (str | None): Share the per-host request rate limit with other processes through this Redis server.
+        cache_redis_url (str | None): Cache HTTP responses in this Redis server, shared with other processes.
+
+    Returns:
+        (dict): A summary of the crawl, with the number of comics requested, crawled & saved, and a list of failed comic numbers.
+
+    """
+    comic_nums = list(comic_nums)
+
+    summary: dict = asyncio.run(_crawl_and_save(comic_nums=comic_nums, max_concurrency=max_concurrency, batch_size=batch_size, use_cache=use_cache, cache_ttl=cache_ttl, save=save, session_pool=session_pool, engine=engine, stream_imgs=stream_imgs, rate_limit_redis_url=rate_limit_redis_url, cache_redis_url=cache_redis_url))
+    summary["requested"] = len(comic_nums)
+
+    log.info(f"Crawl complete. Requested: [{summary['requested']}], crawled: [{summary['crawled']}], saved comics: [{summary['saved_comics']}], saved images: [{summary['saved_imgs']}], failed: [{len(summary['failed'])}]")
+
+    return summary
+
+
+def crawl_and_save_comic_range(start: int, end: int, max_concurrency: int = 25, batch_size: int = 100, use_cache: bool = True, cache_ttl: int = 900, save: bool = True, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None, stream_imgs: bool = False, rate_limit_redis_url: str | None = None, cache_redis_url: str | None = None) -> dict:
+    """Concurrently request every comic from `start` to `end` (inclusive), saving them to the database in batches.
+
+    Params:
+        start (int): The first comic number to request.
+        end (int): The last comic number to request.
+        See `crawl_and_save_comics()` for the remaining params.
+
+    Returns:
+        (dict): A summary of the crawl.
+
+    """
+    if start < 1 or end < start:
+        raise ValueError(f"Invalid comic range: {start}-{end}")
+
+    return crawl_and_save_comics(comic_nums=range(start, end + 1), max_concurrency=max_concurrency, batch_size=batch_size, use_cache=use_cache, cache_ttl=cache_ttl, save=save, session_pool=session_pool, engine=engine, stream_imgs=stream_imgs, rate_limit_redis_url=rate_limit_redis_url, cache_redis_url=cache_redis_url)
+
+
+def get_current_comic_num(use_cache: bool = True, cache_ttl: int = 900, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> int:
+    """Return the current comic number from the metadata table, requesting it from the XKCD API if it has not been saved yet."""
+    try:
+        current_comic_metadata: xkcd_domain.XkcdCurrentComicMetadataOut = db_client.get_current_comic_metadata_from_db(session_pool=session_pool, engine=engine)
+
+        return current_comic_metadata.num
+    except ValueError:
+        log.warning("Current comic metadata not found in database. Requesting current comic from the XKCD API.")
+
+    with XkcdApiController(use_cache=use_cache, cache_ttl=cache_ttl) as api_ctl:
+        current_comic: xkcd_domain.XkcdComicIn | None = api_ctl.get_current_comic()
+
+    if not current_comic:
+        raise ValueError("Unable to determine current comic number from the database or the XKCD API.")
+
+    current_comic_metadata: xkcd_domain.XkcdCurrentComicMetadataIn = xkcd_domain.XkcdCurrentComicMetadataIn(num=current_comic.num, last_updated=time_utils.get_ts())
+    db_client.update_db_current_comic_metadata(comic_metadata=current_comic_metadata, session_pool=session_pool, engine=engine)
+
+    return current_comic.num
+
+
+def sync_missing_comics(max_concurrency: int = 25, batch_size: int = 100, use_cache: bool = True, cache_ttl: int = 900, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None, stream_imgs: bool = False, rate_limit_redis_url: str | None = None, cache_redis_url: str | None = None) -> dict:
+    """Request & save only the comics missing from the database.
+
+    Description:
+        Reads the current comic number from the metadata table and diffs it against the comics already
+        saved (see `db_client.get_missing_comic_nums()`). Comics saved without their image are requested again.
+        The cost of a sync scales with the number of missing comics, not the size of the archive.
+
+    Params:
+        See `crawl_and_save_comics()`.
+
+    Returns:
+        (dict): A summary of the crawl. When nothing is missing, `requested` is 0.
+
+    """
+    current_comic_num: int = get_current_comic_num(use_cache=use_cache, cache_ttl=cache_ttl, session_pool=session_pool, engine=engine)
+
+    missing_comic_nums: list[int] = db_client.get_missing_comic_nums(max_comic_num=current_comic_num, session_pool=session_pool, engine=engine)
+    if not missing_comic_nums:
+        log.info(f"No missing comics. Database is up to date through comic #{current_comic_num}.")
+
+        return {"requested": 0, "crawled": 0, "saved_comics": 0, "saved_imgs": 0, "failed": []}
+
+    log.info(f"Syncing [{len(missing_comic_nums)}] missing comic(s) through comic #{current_comic_num}")
+
+    return crawl_and_save_comics(comic_nums=missing_comic_nums, max_concurrency=max_concurrency, batch_size=batch_size, use_cache=use_cache, cache_ttl=cache_ttl, session_pool=session_pool, engine=engine, stream_imgs=stream_imgs, rate_limit_redis_url=rate_limit_redis_url, cache_redis_url=cache_redis_url)
+
+
+def warm_cache(start: int = 1, end: int | None = None, max_concurrency: int = 25, batch_size: int = 100, cache_ttl: int = 900, save: bool = True, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None, rate_limit_redis_url: str | None = None, cache_redis_url: str | None = None) -> dict:
+    """Pre-populate the HTTP cache & the database with a range of comics, i.e. after a deploy or cache wipe.
+
+    Description:
+        Requests the current comic (saving the current comic metadata), then every comic & image in the range through
+        the concurrent crawler, so later requests for them are served from the cache. Comics already in the cache are
+        read from it, so running a warm-up twice within `cache_ttl` costs no requests to the XKCD API.
+
+        Cache entries are kept for `cache_ttl` seconds, also by controllers configured with a shorter TTL (the SQLite &
+        Redis caches save each entry's expiry with it). After that, the cache is cold again & the warm-up has to be
+        run again (the comics saved to the database are kept).
+
+    Params:
+        start (int): (default: 1) First comic number to warm.
+        end (int | None): Last comic number to warm. When `None`, warm through the current comic.
+        cache_ttl (int): (default: 900) Seconds the warmed HTTP cache entries are kept.
+        save (bool): (default: True) Save comics, images & the current comic metadata to the database. When `False`,
+            only the HTTP cache is warmed.
+        See `crawl_and_save_comics()` for the other params.
+
+    Returns:
+        (dict): The crawl summary (see `crawl_and_save_comics()`), with the current comic number & the HTTP cache
+            hit/miss stats of the current comic request ("current_comic_cache") & the crawl ("cache").
+
+    """
+    with XkcdApiController(cache_ttl=cache_ttl, rate_limit_redis_url=rate_limit_redis_url, cache_redis_url=cache_redis_url) as api_ctl:
+        current_comic: xkcd_domain.XkcdComicIn | None = api_ctl.get_current_comic()
+        current_comic_cache: dict = api_ctl.get_cache_stats()
+
+    if not current_comic:
+        raise ValueError("Unable to request the current comic from the XKCD API.")
+
+    if save:
+        current_comic_metadata: xkcd_domain.XkcdCurrentComicMetadataIn = xkcd_domain.XkcdCurrentComicMetadataIn(num=current_comic.num, last_updated=time_utils.get_ts())
+        db_client.update_db_current_comic_metadata(comic_metadata=current_comic_metadata, session_pool=session_pool, engine=engine)
+
+    end = current_comic.num if end is None else min(end, current_comic.num)
+    log.info(f"Warming cache for comics #{start}-#{end}")
+
+    summary: dict = crawl_and_save_comic_range(start=start, end=end, max_concurrency=max_concurrency, batch_size=batch_size, cache_ttl=cache_ttl, save=save, session_pool=session_pool, engine=engine, rate_limit_redis_url=rate_limit_redis_url, cache_redis_url=cache_redis_url)
+    summary["current_comic_num"] = current_comic.num
+    summary["current_comic_cache"] = current_comic_cache
+
+    return summary
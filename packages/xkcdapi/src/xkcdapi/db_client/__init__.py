@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 from .__methods import (
+    comic_to_row,
+    comics_to_rows,
     get_current_comic_metadata_from_db,
+    get_missing_comic_nums,
+    load_comic_img_bytes,
     save_comic_and_img_to_db,
     save_comic_img_to_db,
     save_comic_to_db,
+    save_current_comic_to_db,
     save_multiple_comic_imgs_to_db,
     save_multiple_comics_and_imgs_to_db,
     save_multiple_comics_to_db,
+    store_comic_img,
     update_db_current_comic_metadata,
 )
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import typing as t
 
+from xkcdapi.image_store import ImageStoreBase, StoredImage, get_image_store
+from xkcdapi.metrics import instrument_save
+
 from core_utils import time_utils
 import db_lib
 from depends import db_depends
@@ -11,13 +14,72 @@ import sqlalchemy as sa
 import sqlalchemy.exc as sa_exc
 import sqlalchemy.orm as so
 
-def return_session_pool(engine: sa.Engine) -> so.sessionmaker[so.Session]:
+def return_session_pool(session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> so.sessionmaker[so.Session]:
+    if session_pool is not None:
+        return session_pool
+    
     if engine is None:
         engine = db_depends.get_db_engine()
 
     return db_depends.get_session_pool(engine=engine)
 
 
+def store_comic_img(comic_img: xkcd_domain.XkcdComicImgIn, image_store: ImageStoreBase | None = None) -> dict:
+    """Save a comic image's bytes to the image store, returning the database row for the image.
+
+    Description:
+        The returned row holds the image's content hash, size & MIME type instead of its bytes. Images
+        that were already stored (`img_hash` set, no `img_bytes`) are returned as-is.
+
+    Params:
+        comic_img (XkcdComicImgIn): The comic image to store.
+        image_store (ImageStoreBase | None): The image store to save to. When `None`, the store configured
+            in the app's `[image_store]` settings is used.
+
+    Returns:
+        (dict): Column values for an `XkcdComicImageModel` row.
+
+    """
+    img_row: dict = comic_img.model_dump()
+
+    if not comic_img.img_bytes:
+        return img_row
+
+    if image_store is None:
+        image_store = get_image_store()
+
+    stored_img: StoredImage = image_store.put(comic_img.img_bytes)
+
+    img_row.update(img_bytes=None, img_hash=stored_img.img_hash, img_size=stored_img.img_size, img_mime_type=stored_img.img_mime_type)
+
+    return img_row
+
+
+def load_comic_img_bytes(comic_img: t.Union[xkcd_domain.XkcdComicImgIn, xkcd_domain.XkcdComicImgOut], image_store: ImageStoreBase | None = None) -> bytes:
+    """Return a comic image's bytes, reading them from the image store if they are not on the schema.
+
+    Params:
+        comic_img (XkcdComicImgIn | XkcdComicImgOut): The comic image to load bytes for.
+        image_store (ImageStoreBase | None): The image store to read from. When `None`, the store configured
+            in the app's `[image_store]` settings is used.
+
+    Returns:
+        (bytes): The image's bytes.
+
+    """
+    if comic_img.img_bytes:
+        return comic_img.img_bytes
+
+    if not comic_img.img_hash:
+        raise ValueError(f"Image for comic #{comic_img.num} has no bytes or image hash.")
+
+    if image_store is None:
+        image_store = get_image_store()
+
+    return image_store.get(comic_img.img_hash)
+
+
+@instrument_save
 def update_db_current_comic_metadata(comic_metadata: xkcd_domain.XkcdCurrentComicMetadataIn, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> xkcd_domain.XkcdCurrentComicMetadataOut:
     """Save/overwrite current XKCD comic metadata in the database.
     
@@ -38,7 +100,7 @@ def update_db_current_comic_metadata(comic_metadata: xkcd_domain.XkcdCurrentComi
         log.warning(f"The 'last_updated' property of the current comic metadata object is empty. Setting a timestamp before converting & saving.")
         comic_metadata.last_updated = time_utils.get_ts()
     
-    session_pool: so.sessionmaker[so.Session] = return_session_pool(engine=engine)
+    session_pool: so.sessionmaker[so.Session] = return_session_pool(session_pool=session_pool, engine=engine)
         
     try:
         with session_pool() as session:
@@ -76,7 +138,7 @@ def get_current_comic_metadata_from_db(session_pool: so.sessionmaker[so.Session]
         (XkcdCurrentcomicMetadataOut): A schema representing the saved comic metadata for the current XKCD comic in the database.
     
     """
-    session_pool: so.sessionmaker[so.Session] = return_session_pool(engine=engine)
+    session_pool: so.sessionmaker[so.Session] = return_session_pool(session_pool=session_pool, engine=engine)
     
     try:
         with session_pool() as session:
@@ -101,6 +163,51 @@ def get_current_comic_metadata_from_db(session_pool: so.sessionmaker[so.Session]
     return comic_metadata_out
 
 
+def get_missing_comic_nums(max_comic_num: int | None = None, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> list[int]:
+    """Return the comic numbers that are not fully saved in the database (comic & image).
+
+    Description:
+        Diffs the range 1..`max_comic_num` (minus `IGNORE_COMIC_NUMS`) against the set of complete comic numbers,
+        loaded with a single query. Comics that were saved without their image (`img_saved` is False) are
+        included in the result.
+
+    Params:
+        max_comic_num (int | None): The highest comic number to check. When None, the number stored in the
+            current comic metadata table is used.
+        session_pool (sqlalchemy.orm.sessionmaker[sqlalchemy.orm.Session]): An initialized SQLAlchemy sessionmaker object. If session_pool=None, a default session pool
+            will be initialized from the app's database settings.
+        engine (sqlalchemy.Engine): An initialized SQLAlchemy Engine. If engine=None, a default Engine will be initialized from the app's database settings.
+
+    Returns:
+        (list[int]): A sorted list of comic numbers missing from the database.
+
+    """
+    if max_comic_num is None:
+        current_comic_metadata: xkcd_domain.XkcdCurrentComicMetadataOut = get_current_comic_metadata_from_db(session_pool=session_pool, engine=engine)
+        max_comic_num = current_comic_metadata.num
+
+    session_pool: so.sessionmaker[so.Session] = return_session_pool(session_pool=session_pool, engine=engine)
+
+    try:
+        with session_pool() as session:
+            repo: xkcd_domain.XkcdComicRepository = xkcd_domain.XkcdComicRepository(session=session)
+
+            complete_comic_nums: set[int] = repo.get_complete_comic_nums()
+    except Exception as exc:
+        msg = f"({type(exc)}) Error loading saved comic numbers from the database. Details: {exc}"
+        log.error(msg)
+
+        raise exc
+
+    ignore_nums: set[int] = set(xkcd_domain.constants.IGNORE_COMIC_NUMS)
+    missing_comic_nums: list[int] = [n for n in range(1, max_comic_num + 1) if n not in complete_comic_nums and n not in ignore_nums]
+
+    log.debug(f"Found [{len(missing_comic_nums)}] missing comic(s) out of [{max_comic_num}]")
+
+    return missing_comic_nums
+
+
+@instrument_save
 def save_comic_to_db(comic: xkcd_domain.XkcdComicIn, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> xkcd_domain.XkcdComicOut:
     """Save a single XKCD comic to the database.
     
@@ -117,7 +224,7 @@ def save_comic_to_db(comic: xkcd_domain.XkcdComicIn, session_pool: so.sessionmak
     if not isinstance(comic, xkcd_domain.XkcdComicIn):
         raise TypeError(f"comic must be an instance of XkcdComicIn. Got: ({type(comic)})")
     
-    session_pool: so.sessionmaker[so.Session] = return_session_pool(engine=engine)
+    session_pool: so.sessionmaker[so.Session] = return_session_pool(session_pool=session_pool, engine=engine)
         
     try:
         with session_pool() as session:
@@ -154,11 +261,18 @@ def save_comic_to_db(comic: xkcd_domain.XkcdComicIn, session_pool: so.sessionmak
     return comic_out
 
     
-def save_comic_img_to_db(comic_img: xkcd_domain.XkcdComicImgIn, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> xkcd_domain.XkcdComicImgOut:
+@instrument_save
+def save_comic_img_to_db(comic_img: xkcd_domain.XkcdComicImgIn, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None, image_store: ImageStoreBase | None = None) -> xkcd_domain.XkcdComicImgOut:
     """Save a single XKCD comic image to the database.
     
+    Description:
+        The image's bytes are saved to the image store (see `store_comic_img()`), and the database row
+        only keeps its content hash, size & MIME type.
+    
     Params:
         comic_img (XkcdComicImgIn): The XkcdComicImgIn schema for a comic image to save to the database.
+        image_store (ImageStoreBase | None): The image store to save image bytes to. When `None`, the store configured
+            in the app's `[image_store]` settings is used.
         session_pool (sqlalchemy.orm.sessionmaker[sqlalchemy.orm.Session]): An initialized SQLAlchemy sessionmaker object. If session_pool=None, a default session pool
             will be initialized from the app's database settings.
         engine (sqlalchemy.Engine): An initialized SQLAlchemy Engine. If engine=None, a default Engine will be initialized from the app's database settings.
@@ -170,7 +284,7 @@ def save_comic_img_to_db(comic_img: xkcd_domain.XkcdComicImgIn, session_pool: so
     if not isinstance(comic_img, xkcd_domain.XkcdComicImgIn):
         raise TypeError(f"comic must be an instance of XkcdComicImgIn. Got: ({type(comic_img)})")
     
-    session_pool: so.sessionmaker[so.Session] = return_session_pool(engine=engine)
+    session_pool: so.sessionmaker[so.Session] = return_session_pool(session_pool=session_pool, engine=engine)
         
     try:
         with session_pool() as session:
@@ -180,14 +294,21 @@ def save_comic_img_to_db(comic_img: xkcd_domain.XkcdComicImgIn, session_pool: so
             
             if existing_comic_img:
                 log.debug(f"Image for comic #{comic_img.num} already exists in database. Returning object from database.")
+                xkcd_domain.XkcdComicRepository(session=session).set_img_saved(comic_nums=[comic_img.num])
+                ## Flagging the comic commits, which expires the loaded image
+                session.refresh(existing_comic_img)
+
                 return xkcd_domain.XkcdComicImgOut(**existing_comic_img.__dict__)
             
             log.debug(f"Did not find image for comic #{comic_img.num} in database. Initializing database model")
             
-            comic_img_model: xkcd_domain.XkcdComicImageModel = xkcd_domain.XkcdComicImageModel(**comic_img.model_dump())
+            comic_img_model: xkcd_domain.XkcdComicImageModel = xkcd_domain.XkcdComicImageModel(**store_comic_img(comic_img=comic_img, image_store=image_store))
             
             # log.debug(f"Saving image for comic: {comic_img}")
             db_comic_img: xkcd_domain.XkcdComicImageModel = repo.create(comic_img_model)
+
+            ## Flag the comic as having its image saved. Refresh after, the flag's commit expires the new image
+            xkcd_domain.XkcdComicRepository(session=session).set_img_saved(comic_nums=[db_comic_img.num])
             session.refresh(db_comic_img)
 
     except Exception as exc:
@@ -207,7 +328,8 @@ def save_comic_img_to_db(comic_img: xkcd_domain.XkcdComicImgIn, session_pool: so
     return comic_img_out
 
 
-def save_comic_and_img_to_db(comic: xkcd_domain.XkcdComicIn, comic_img: xkcd_domain.XkcdComicImgIn, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> t.Tuple[xkcd_domain.XkcdComicOut | None, xkcd_domain.XkcdComicImgOut | None]:
+@instrument_save
+def save_comic_and_img_to_db(comic: xkcd_domain.XkcdComicIn, comic_img: xkcd_domain.XkcdComicImgIn, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None, image_store: ImageStoreBase | None = None) -> t.Tuple[xkcd_domain.XkcdComicOut | None, xkcd_domain.XkcdComicImgOut | None]:
     """Save a comic and image at the same time.
     
     Params:
@@ -222,174 +344,217 @@ def save_comic_and_img_to_db(comic: xkcd_domain.XkcdComicIn, comic_img: xkcd_dom
 
     """
     comic: xkcd_domain.XkcdComicOut = save_comic_to_db(comic=comic, session_pool=session_pool, engine=engine)
-    comic_img: xkcd_domain.XkcdComicImgOut = save_comic_img_to_db(comic_img=comic_img, session_pool=session_pool, engine=engine)
+    comic_img: xkcd_domain.XkcdComicImgOut = save_comic_img_to_db(comic_img=comic_img, session_pool=session_pool, engine=engine, image_store=image_store)
     
     return comic, comic_img
     
 
-def save_multiple_comics_to_db(comics: list[xkcd_domain.XkcdComicIn], session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> list[xkcd_domain.XkcdComicOut]:
+@instrument_save
+def save_current_comic_to_db(comic: xkcd_domain.XkcdComicIn, comic_img: xkcd_domain.XkcdComicImgIn | None = None, session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None, image_store: ImageStoreBase | None = None) -> t.Tuple[xkcd_domain.XkcdComicOut | None, xkcd_domain.XkcdComicImgOut | None, xkcd_domain.XkcdCurrentComicMetadataOut]:
+    """Save a new current comic, its image & the current comic metadata in a single transaction.
+
+    Description:
+        The comic & image rows are written with `INSERT ... ON CONFLICT DO NOTHING`, the comic's `img_saved` flag is set and
+        the current comic metadata is pointed at the comic, all in one session & one commit. If any write fails, none of
+        them are kept, so the metadata never points at a comic that was not saved.
+
+    Params:
+        comic (XkcdComicIn): The new current comic.
+        comic_img (XkcdComicImgIn | None): The comic's image. When `None`, only the comic & metadata are saved.
+        session_pool (sqlalchemy.orm.sessionmaker[sqlalchemy.orm.Session]): An initialized SQLAlchemy sessionmaker object. If session_pool=None, a default session pool
+            will be initialized from the app's database settings.
+        engine (sqlalchemy.Engine): An initialized SQLAlchemy Engine. If engine=None, a default Engine will be initialized from the app's database settings.
+        image_store (ImageStoreBase | None): The image store to save image bytes to. When `None`, the store configured
+            in the app's `[image_store]` settings is used.
+
+    Returns:
+        (Tuple[XkcdComicOut | None, XkcdComicImgOut | None, XkcdCurrentComicMetadataOut]): The saved comic & image (`None` if they
+            already existed) and the updated current comic metadata.
+
+    """
+    if not isinstance(comic, xkcd_domain.XkcdComicIn):
+        raise TypeError(f"comic must be an instance of XkcdComicIn. Got: ({type(comic)})")
+
+    ## Write image bytes to the content store before opening the transaction, stored images are keyed by hash so a retry is harmless
+    comic_img_row: dict | None = store_comic_img(comic_img=comic_img, image_store=image_store) if comic_img else None
+
+    session_pool: so.sessionmaker[so.Session] = return_session_pool(session_pool=session_pool, engine=engine)
+
+    try:
+        with session_pool() as session:
+            comic_repo: xkcd_domain.XkcdComicRepository = xkcd_domain.XkcdComicRepository(session=session)
+
+            saved_comic_rows: list[dict] = comic_repo.upsert_all(rows=[comic.model_dump()], index_elements=["num"], commit=False)
+
+            saved_img_rows: list[dict] = []
+            if comic_img_row:
+                saved_img_rows = xkcd_domain.XkcdComicImageRepository(session=session).upsert_all(rows=[comic_img_row], index_elements=["num"], commit=False)
+                comic_repo.set_img_saved(comic_nums=[comic.num], commit=False)
+
+            db_comic_metadata: xkcd_domain.XkcdCurrentComicMetadataModel = xkcd_domain.XkcdCurrentComicMetadataRepository(session=session).set_current(num=comic.num, last_updated=time_utils.get_ts(), commit=False)
+            ## Read the metadata before committing, committed models are expired
+            comic_metadata_out: xkcd_domain.XkcdCurrentComicMetadataOut = xkcd_domain.XkcdCurrentComicMetadataOut(id=db_comic_metadata.id, num=db_comic_metadata.num, last_updated=db_comic_metadata.last_updated)
+
+            session.commit()
+
+    except Exception as exc:
+        msg = f"({type(exc)}) Error saving current comic #{comic.num} to database. Details: {exc}"
+        log.error(msg)
+
+        raise exc
+
+    comic_out: xkcd_domain.XkcdComicOut | None = xkcd_domain.XkcdComicOut(**saved_comic_rows[0]) if saved_comic_rows else None
+    comic_img_out: xkcd_domain.XkcdComicImgOut | None = xkcd_domain.XkcdComicImgOut(**saved_img_rows[0]) if saved_img_rows else None
+
+    return comic_out, comic_img_out, comic_metadata_out
+
+
+def comic_to_row(comic: t.Union[xkcd_domain.XkcdComicIn, xkcd_domain.XkcdComicRecord]) -> dict:
+    """Return a comic as a dict of XkcdComicModel column values. Records convert without going through pydantic."""
+    if isinstance(comic, xkcd_domain.XkcdComicRecord):
+        return comic.to_row()
+
+    return comic.model_dump()
+
+
+def comics_to_rows(comics: t.Iterable[t.Union[xkcd_domain.XkcdComicIn, xkcd_domain.XkcdComicRecord]]) -> list[dict]:
+    """Return comics as XkcdComicModel rows, de-duplicated by `num`.
+
+    Description:
+        Pydantic comics are dumped without `comic_num_hash`, and the hashes of all their numbers are computed in one
+        pass with `get_comic_num_hashes()`. Records already carry their hash.
+    """
+    rows: dict[int, dict] = {}
+
+    for comic in comics:
+        if isinstance(comic, xkcd_domain.XkcdComicRecord):
+            rows[comic.num] = comic.to_row()
+        else:
+            rows[comic.num] = comic.model_dump(exclude={"comic_num_hash"})
+
+    unhashed_rows: list[dict] = [row for row in rows.values() if "comic_num_hash" not in row]
+    for row, comic_num_hash in zip(unhashed_rows, xkcd_domain.get_comic_num_hashes(row["num"] for row in unhashed_rows)):
+        row["comic_num_hash"] = comic_num_hash
+
+    return list(rows.values())
+
+
+@instrument_save
+def save_multiple_comics_to_db(comics: list[xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord], session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> list[xkcd_domain.XkcdComicOut]:
     """Save multiple XkcdComicIn objects to the database at once.
     
+    Description:
+        Comics are written with a bulk `INSERT ... ON CONFLICT DO NOTHING` on the `_comic_num_uc` constraint (see
+        `BaseRepository.upsert_all()`), in one statement per chunk. Comics that already exist are skipped.
+    
     Params:
-        comics (list[XkcdComicIn]): List of XkcdComicIn schemas that will be converted to XkcdComicModel database models (if they do not exist in the database already).
+        comics (list[XkcdComicIn | XkcdComicRecord]): List of XkcdComicIn schemas (or lightweight XkcdComicRecords) that will be converted to XkcdComicModel database models (if they do not exist in the database already).
         session_pool (sqlalchemy.orm.sessionmaker[sqlalchemy.orm.Session]): An initialized SQLAlchemy sessionmaker object. If session_pool=None, a default session pool
             will be initialized from the app's database settings.
         engine (sqlalchemy.Engine): An initialized SQLAlchemy Engine. If engine=None, a default Engine will be initialized from the app's database settings.
     
     Returns:
-        (list[XkcdComicOut]): A list of XkcdComicOut schemas, converted from models saved to the database.
+        (list[XkcdComicOut]): A list of XkcdComicOut schemas for the comics saved to the database.
 
     """
     if (not comics) or (isinstance(comics, list) and len(comics) == 0):
         raise ValueError("comics should be a list of comics with 1 or more XkcdComicIn objects.")
     
-    log.debug(f"Incoming comics: {comics}")
-    
-    ## List to hold comic numbers that already exist in the database
-    existing_comic_nums: list[int] = []
+    log.debug(f"Saving [{len(comics)}] incoming comic(s)")
+
+    ## De-duplicate incoming comics, a single INSERT cannot contain the same num twice
+    comic_rows: list[dict] = comics_to_rows(comics)
 
-    session_pool: so.sessionmaker[so.Session] = return_session_pool(engine=engine)
+    session_pool: so.sessionmaker[so.Session] = return_session_pool(session_pool=session_pool, engine=engine)
     
     try:
         with session_pool() as session:
             repo: xkcd_domain.XkcdComicRepository = xkcd_domain.XkcdComicRepository(session=session)
             
-            _comic_nums = [c.num for c in comics]
-            log.debug(f"Incoming comic nums: {_comic_nums}")
-            
-            existing_comics: list[xkcd_domain.XkcdComicModel] | None = repo.get_multiple_by_num(comic_nums=_comic_nums) or []
-            if existing_comics:
-                log.debug(f"Found [{len(existing_comics)}] comic(s) that already exist in database.")
-                
-                ## Create list of existing comic numbers
-                existing_comic_nums = [c.num for c in existing_comics] or []
-                log.debug(f"Existing comic numbers: {existing_comic_nums}")
-                
-                comics = [c for c in comics if c.num not in existing_comic_nums]
-                log.debug(f"Working on [{len(comics)}] comic(s) that do not already exist in the database.")
-                
-            ## Create models
-            comic_db_models: list[xkcd_domain.XkcdComicModel] = []
-            for comic in comics:
-                comic_model: xkcd_domain.XkcdComicModel = xkcd_domain.XkcdComicModel(**comic.model_dump())
-                comic_db_models.append(comic_model)
+            saved_rows: list[dict] = repo.upsert_all(rows=comic_rows, index_elements=["num"])
                 
-            log.debug(f"Converted [{len(comic_db_models)}] XkcdComicIn object(s) to XkcdComicModel object(s)")
-            
-            comic_models: list[xkcd_domain.XkcdComicModel] = repo.create_all(comic_db_models) or []
-            for c in comic_models:
-                session.refresh(c)
-                
-            log.debug(f"Saved [{len(comic_models)}] comic(s) to database.")
+            log.debug(f"Saved [{len(saved_rows)}] new comic(s) to database, skipped [{len(comic_rows) - len(saved_rows)}] existing comic(s).")
 
     except Exception as exc:
-        msg = f"({type(exc)}) Error saving comic image to database. Details: {exc}"
+        msg = f"({type(exc)}) Error saving comics to database. Details: {exc}"
         log.error(msg)
         
         raise exc
     
-    if (not comic_models) or (isinstance(comic_models, list) and len(comic_models) == 0):
-        log.warning(f"Comic models list is empty, an error occurred while saving multiple comics to database.")
+    if not saved_rows:
+        log.warning("No new comics were saved to the database.")
         
         return
     
-    log.debug(f"Saved [{comic_models}] comic(s) to the database.")
-    
-    comics_out: list[xkcd_domain.XkcdComicOut] = []
-    
-    for c_model in comic_models:
-        c_schema: xkcd_domain.XkcdComicOut = xkcd_domain.XkcdComicOut(**c_model.__dict__)
-        comics_out.append(c_schema)
-        
-    log.debug(f"Converted [{len(comics_out)}] comic model(s) to XkcdComicOut object(s)")
+    comics_out: list[xkcd_domain.XkcdComicOut] = [xkcd_domain.XkcdComicOut(**row) for row in saved_rows]
     
     return comics_out
     
     
-def save_multiple_comic_imgs_to_db(comic_imgs: list[xkcd_domain.XkcdComicImgIn], session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> list[xkcd_domain.XkcdComicImgOut]:
+@instrument_save
+def save_multiple_comic_imgs_to_db(comic_imgs: list[xkcd_domain.XkcdComicImgIn], session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None, image_store: ImageStoreBase | None = None) -> list[xkcd_domain.XkcdComicImgOut]:
     """Save multiple XkcdComicImgIn objects to the database at once.
     
+    Description:
+        Image bytes are saved to the image store (see `store_comic_img()`). The rows, holding each image's hash, size &
+        MIME type, are written with a bulk `INSERT ... ON CONFLICT DO NOTHING` on the `_comic_img_num_uc` constraint (see
+        `BaseRepository.upsert_all()`), in one statement per chunk. Images that already exist are skipped.
+    
     Params:
         comic_imgs (list[XkcdComicImgIn]): List of XkcdComicImgIn schemas that will be converted to XkcdComicImageModel database models (if they do not exist in the database already).
+        image_store (ImageStoreBase | None): The image store to save image bytes to. When `None`, the store configured
+            in the app's `[image_store]` settings is used.
         session_pool (sqlalchemy.orm.sessionmaker[sqlalchemy.orm.Session]): An initialized SQLAlchemy sessionmaker object. If session_pool=None, a default session pool
             will be initialized from the app's database settings.
         engine (sqlalchemy.Engine): An initialized SQLAlchemy Engine. If engine=None, a default Engine will be initialized from the app's database settings.
     
     Returns:
-        (list[XkcdComicImgOut]): A list of XkcdComicImgOut schemas, converted from models saved to the database.
+        (list[XkcdComicImgOut]): A list of XkcdComicImgOut schemas for the comic images saved to the database.
 
     """
     if (not comic_imgs) or (isinstance(comic_imgs, list) and len(comic_imgs) == 0):
         raise ValueError("comic_imgs should be a list of comic images with 1 or more XkcdComicImageIn objects.")
     
-    log.debug(f"Incoming comic images: {comic_imgs}")
+    log.debug(f"Saving [{len(comic_imgs)}] incoming comic image(s)")
     
-    ## List to hold comic numbers that already exist in the database
-    existing_comic_img_nums: list[int] = []
+    ## De-duplicate incoming images, a single INSERT cannot contain the same num twice
+    comic_img_rows: list[dict] = list({c.num: store_comic_img(comic_img=c, image_store=image_store) for c in comic_imgs}.values())
 
-    session_pool: so.sessionmaker[so.Session] = return_session_pool(engine=engine)
+    session_pool: so.sessionmaker[so.Session] = return_session_pool(session_pool=session_pool, engine=engine)
     
     try:
         with session_pool() as session:
             repo: xkcd_domain.XkcdComicImageRepository = xkcd_domain.XkcdComicImageRepository(session=session)
             
-            _comic_img_nums = [c.num for c in comic_imgs]
-            log.debug(f"Incoming comic image nums: {_comic_img_nums}")
-            
-            existing_comic_imgs: list[xkcd_domain.XkcdComicImageModel] | None = repo.get_multiple_by_num(comic_nums=_comic_img_nums) or []
-            if existing_comic_imgs:
-                log.debug(f"Found [{len(existing_comic_imgs)}] comic image(s) that already exist in database.")
-                
-                ## Create list of existing comic image numbers
-                existing_comic_img_nums = [c.num for c in existing_comic_imgs] or []
-                log.debug(f"Existing comic image numbers: {existing_comic_img_nums}")
-                
-                comic_imgs = [c for c in comic_imgs if c.num not in existing_comic_img_nums]
-                log.debug(f"Working on [{len(comic_imgs)}] comic image(s) that do not already exist in the database.")
-                
-            ## Create models
-            comic_img_db_models: list[xkcd_domain.XkcdComicImageModel] = []
-            for comic_img in comic_imgs:
-                comic_img_model: xkcd_domain.XkcdComicImageModel = xkcd_domain.XkcdComicImageModel(**comic_img.model_dump())
-                comic_img_db_models.append(comic_img_model)
+            saved_rows: list[dict] = repo.upsert_all(rows=comic_img_rows, index_elements=["num"])
                 
-            log.debug(f"Converted [{len(comic_img_db_models)}] XkcdComicImgIn object(s) to XkcdComicImageModel object(s)")
-            
-            comic_img_models: list[xkcd_domain.XkcdComicImageModel] = repo.create_all(comic_img_db_models) or []
-            for c in comic_img_models:
-                session.refresh(c)
-                
-            log.debug(f"Saved [{len(comic_img_models)}] comic image(s) to database.")
+            log.debug(f"Saved [{len(saved_rows)}] new comic image(s) to database, skipped [{len(comic_img_rows) - len(saved_rows)}] existing image(s).")
+
+            ## Flag new & already-saved images on their comics in one statement
+            xkcd_domain.XkcdComicRepository(session=session).set_img_saved(comic_nums=[row["num"] for row in comic_img_rows])
 
     except Exception as exc:
-        msg = f"({type(exc)}) Error saving comic image to database. Details: {exc}"
+        msg = f"({type(exc)}) Error saving comic images to database. Details: {exc}"
         log.error(msg)
         
         raise exc
     
-    if (not comic_img_models) or (isinstance(comic_img_models, list) and len(comic_img_models) == 0):
-        log.warning(f"Comic image models list is empty, an error occurred while saving multiple comic images to database.")
+    if not saved_rows:
+        log.warning("No new comic images were saved to the database.")
         
         return
     
-    log.debug(f"Saved [{comic_img_models}] comic image(s) to the database.")
-    
-    comic_imgs_out: list[xkcd_domain.XkcdComicImgOut] = []
-    
-    for c_i_model in comic_img_models:
-        c_schema: xkcd_domain.XkcdComicImgOut = xkcd_domain.XkcdComicImgOut(**c_i_model.__dict__)
-        comic_imgs_out.append(c_schema)
-        
-    log.debug(f"Converted [{len(comic_imgs_out)}] comic image model(s) to XkcdComicImgOut object(s)")
+    comic_imgs_out: list[xkcd_domain.XkcdComicImgOut] = [xkcd_domain.XkcdComicImgOut(**row) for row in saved_rows]
     
     return comic_imgs_out
 
 
-def save_multiple_comics_and_imgs_to_db(comics: list[xkcd_domain.XkcdComicIn], comic_imgs: list[xkcd_domain.XkcdComicImgIn], session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None) -> t.Tuple[list[xkcd_domain.XkcdComicOut] | None, list[xkcd_domain.XkcdComicImgOut] | None]:
+@instrument_save
+def save_multiple_comics_and_imgs_to_db(comics: list[xkcd_domain.XkcdComicIn | xkcd_domain.XkcdComicRecord], comic_imgs: list[xkcd_domain.XkcdComicImgIn], session_pool: so.sessionmaker[so.Session] | None = None, engine: sa.Engine | None = None, image_store: ImageStoreBase | None = None) -> t.Tuple[list[xkcd_domain.XkcdComicOut] | None, list[xkcd_domain.XkcdComicImgOut] | None]:
     """Save multiple comics and images to the database at once.
     
     Params:
-        comics (list[XkcdComicIn]): A list of XkcdComicIn objects to convert to database models, filter existing, and save any that do not exist.
+        comics (list[XkcdComicIn | XkcdComicRecord]): A list of XkcdComicIn objects (or lightweight XkcdComicRecords) to convert to database models, filter existing, and save any that do not exist.
         comic_imgs (list[XkcdComicImgIn]): List of XkcdComicImgIn schemas that will be converted to XkcdComicImageModel database models (if they do not exist in the database already).
         session_pool (sqlalchemy.orm.sessionmaker[sqlalchemy.orm.Session]): An initialized SQLAlchemy sessionmaker object. If session_pool=None, a default session pool
             will be initialized from the app's database settings.
@@ -400,6 +565,6 @@ def save_multiple_comics_and_imgs_to_db(comics: list[xkcd_domain.XkcdComicIn], c
 
     """
     comics: list[xkcd_domain.XkcdComicOut] = save_multiple_comics_to_db(comics=comics, session_pool=session_pool, engine=engine)
-    comic_imgs: list[xkcd_domain.XkcdComicImgOut] = save_multiple_comic_imgs_to_db(comic_imgs=comic_imgs, session_pool=session_pool, engine=engine)
+    comic_imgs: list[xkcd_domain.XkcdComicImgOut] = save_multiple_comic_imgs_to_db(comic_imgs=comic_imgs, session_pool=session_pool, engine=engine, image_store=image_store)
     
     return comics, comic_imgs
@@ -3,6 +3,8 @@ from __future__ import annotations
 from .__methods import (
     comic_num_req,
     current_comic_req,
+    parse_comic_record,
+    parse_comic_response,
     return_comic_num_url,
     return_current_comic_url,
 )
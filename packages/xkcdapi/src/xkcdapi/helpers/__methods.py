@@ -2,38 +2,43 @@ from __future__ import annotations
 
 import typing as t
 
+from domain import xkcd as xkcd_domain
 from domain.xkcd.constants import CURRENT_XKCD_URL, XKCD_URL_BASE, XKCD_URL_POSTFIX
 import http_lib
 import httpx
 from loguru import logger as log
 
-def return_comic_num_url(comic_num: t.Union[int, str] = None) -> str:
+def return_comic_num_url(comic_num: t.Union[int, str] = None, base_url: str = XKCD_URL_BASE) -> str:
     if not comic_num:
         raise ValueError("Missing a comic number")
     if not isinstance(comic_num, int) and not isinstance(comic_num, str):
         raise TypeError(f"Invalid type for comic_num: ({type(comic_num)}). Must be an int or str.")
 
     ## Build URL from input comic_num
-    _url: str = f"{XKCD_URL_BASE}/{comic_num}/{XKCD_URL_POSTFIX}"
+    _url: str = f"{base_url}/{comic_num}/{XKCD_URL_POSTFIX}"
     
     return _url
     
 
-def return_current_comic_url() -> str:
-    return CURRENT_XKCD_URL
+def return_current_comic_url(base_url: str = XKCD_URL_BASE) -> str:
+    if base_url == XKCD_URL_BASE:
+        return CURRENT_XKCD_URL
+    
+    return f"{base_url}/{XKCD_URL_POSTFIX}"
     
 
-def comic_num_req(comic_num: t.Union[int, str] = None) -> httpx.Request:
+def comic_num_req(comic_num: t.Union[int, str] = None, base_url: str = XKCD_URL_BASE) -> httpx.Request:
     """Build an `httpx.Request` object from an input comic number.
 
     Params:
         comic_num (int, str): A comic number to request, i.e. 42.
+        base_url (str): (default: "https://xkcd.com") The XKCD site to request the comic from.
 
     Returns:
         (httpx.request): An initialized `httpx.Request` for the given `comic_num`.
 
     """
-    _url: str = return_comic_num_url(comic_num=comic_num)
+    _url: str = return_comic_num_url(comic_num=comic_num, base_url=base_url)
 
     # log.debug(f"Requesting URL for comic #{comic_num}: {_url}")
     try:
@@ -51,8 +56,8 @@ def comic_num_req(comic_num: t.Union[int, str] = None) -> httpx.Request:
         raise msg
     
     
-def current_comic_req() -> httpx.Request:
-    _url: str = return_current_comic_url()
+def current_comic_req(base_url: str = XKCD_URL_BASE) -> httpx.Request:
+    _url: str = return_current_comic_url(base_url=base_url)
     
     try:
         ## Build the request
@@ -64,3 +69,49 @@ def current_comic_req() -> httpx.Request:
         log.error(msg)
         
         raise exc
+
+
+def parse_comic_response(response: httpx.Response) -> xkcd_domain.XkcdComicIn:
+    """Build an `XkcdComicIn` straight from an XKCD API response's JSON bytes.
+
+    Description:
+        Pydantic parses & validates the raw bytes in one step, instead of decoding them to a str, loading a dict,
+        then validating it through `XkcdApiResponseIn` & again into `XkcdComicIn`.
+
+    Params:
+        response (httpx.Response): A response from the XKCD JSON API, its body already read.
+
+    Returns:
+        (XkcdComicIn): The comic in the response.
+
+    """
+    try:
+        comic: xkcd_domain.XkcdComicIn = xkcd_domain.XkcdComicIn.model_validate_json(response.content)
+
+        return comic
+    except Exception as exc:
+        msg = f"({type(exc)}) Error converting response content to XkcdComicIn object. Details: {exc}"
+        log.error(msg)
+
+        raise exc
+
+
+def parse_comic_record(response: httpx.Response) -> xkcd_domain.XkcdComicRecord:
+    """Build a lightweight `XkcdComicRecord` from an XKCD API response's JSON bytes, for bulk crawls.
+
+    Params:
+        response (httpx.Response): A response from the XKCD JSON API, its body already read.
+
+    Returns:
+        (XkcdComicRecord): The comic in the response.
+
+    """
+    try:
+        comic: xkcd_domain.XkcdComicRecord = xkcd_domain.XkcdComicRecord.from_json(response.content)
+
+        return comic
+    except Exception as exc:
+        msg = f"({type(exc)}) Error converting response content to XkcdComicRecord object. Details: {exc}"
+        log.error(msg)
+
+        raise exc
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from .__methods import get_image_store
+from .base import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    ImageStoreBase,
+    ImageStreamWriter,
+    StoredImage,
+    detect_img_mime_type,
+    get_img_hash,
+)
+from .local_store import LocalImageStore
+from .minio_store import MinioImageStore
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from functools import lru_cache
+import typing as t
+
+from .base import ImageStoreBase
+from .local_store import LocalImageStore
+from .minio_store import MinioImageStore
+
+from loguru import logger as log
+from settings import IMAGE_STORE_SETTINGS, MINIO_SETTINGS
+
+@lru_cache(maxsize=None)
+def get_image_store(backend: str | None = None) -> ImageStoreBase:
+    """Return the image store configured in the `[image_store]` settings.
+
+    Description:
+        Stores are created once per backend & reused. The "minio" backend reads its connection
+        details from the `[minio]` settings.
+
+    Params:
+        backend (str | None): The storage backend, "local" or "minio". When `None`, the
+            `IMAGE_STORE_BACKEND` setting is used.
+
+    Returns:
+        (ImageStoreBase): An initialized image store.
+
+    """
+    if backend is None:
+        backend = IMAGE_STORE_SETTINGS.get("IMAGE_STORE_BACKEND", default="local")
+
+    match str(backend).lower():
+        case "local":
+            image_store: ImageStoreBase = LocalImageStore(base_path=IMAGE_STORE_SETTINGS.get("IMAGE_STORE_LOCAL_PATH", default=".data/images"))
+        case "minio":
+            image_store: ImageStoreBase = MinioImageStore(
+                endpoint=MINIO_SETTINGS.get("MINIO_ENDPOINT"),
+                access_key=MINIO_SETTINGS.get("MINIO_ACCESS_KEY"),
+                secret_key=MINIO_SETTINGS.get("MINIO_SECRET_KEY"),
+                bucket=IMAGE_STORE_SETTINGS.get("IMAGE_STORE_MINIO_BUCKET", default="xkcd-images"),
+                prefix=IMAGE_STORE_SETTINGS.get("IMAGE_STORE_MINIO_PREFIX", default="comic_imgs"),
+                secure=MINIO_SETTINGS.get("MINIO_SECURE", default=True),
+                cert_check=MINIO_SETTINGS.get("MINIO_CERT_CHECK", default=True),
+            )
+        case _:
+            raise ValueError(f"Unsupported image store backend: '{backend}'. Use 'local' or 'minio'.")
+
+    log.debug(f"Initialized image store: {image_store}")
+
+    return image_store
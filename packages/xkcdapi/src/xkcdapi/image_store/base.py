@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import abc
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+import typing as t
+
+## Default chunk size, in bytes, when streaming images to a store
+DEFAULT_STREAM_CHUNK_SIZE: int = 64 * 1024
+
+## Magic bytes for the image formats XKCD serves
+IMG_MAGIC_BYTES: list[t.Tuple[bytes, str]] = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+]
+
+
+def get_img_hash(img_bytes: bytes) -> str:
+    """Return the SHA-256 hex digest used as an image's content address."""
+    return hashlib.sha256(img_bytes).hexdigest()
+
+
+def detect_img_mime_type(img_bytes: bytes, default: str = "application/octet-stream") -> str:
+    """Guess an image's MIME type from its leading magic bytes."""
+    for magic, mime_type in IMG_MAGIC_BYTES:
+        if img_bytes.startswith(magic):
+            return mime_type
+
+    if img_bytes[:4] == b"RIFF" and img_bytes[8:12] == b"WEBP":
+        return "image/webp"
+
+    return default
+
+
+@dataclass(frozen=True)
+class StoredImage:
+    """Reference to an image saved in an image store.
+
+    Params:
+        img_hash (str): SHA-256 hex digest of the image bytes, used as the image's key in the store.
+        img_size (int): Size of the image, in bytes.
+        img_mime_type (str): The image's MIME type, i.e. `image/png`.
+    """
+
+    img_hash: str
+    img_size: int
+    img_mime_type: str
+
+
+class ImageStreamWriter:
+    """Write an image to a temporary file chunk by chunk, hashing it as it is written.
+
+    Description:
+        Only one chunk is held in memory at a time. `finish()` moves the finished file into the image
+        store under its content hash (or discards it if the store already has the image).
+
+    Params:
+        image_store (ImageStoreBase): The store the image is saved to when finished.
+    """
+
+    def __init__(self, image_store: ImageStoreBase):
+        self.image_store: ImageStoreBase = image_store
+
+        self._hash = hashlib.sha256()
+        self._size: int = 0
+        ## First bytes of the image, used to detect its MIME type
+        self._head: bytes = b""
+
+        tmp_dir: Path | None = image_store.tmp_dir()
+        if tmp_dir is not None:
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+
+        fd, self.tmp_path = tempfile.mkstemp(dir=tmp_dir, prefix=".tmp-")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+
+        self._hash.update(chunk)
+        self._size += len(chunk)
+        if len(self._head) < 16:
+            self._head += chunk[: 16 - len(self._head)]
+
+        self._file.write(chunk)
+
+    def finish(self) -> StoredImage:
+        """Close the temporary file & save it to the image store, returning a reference to the image."""
+        self._file.close()
+
+        try:
+            if self._size == 0:
+                raise ValueError("Cannot save an empty image stream")
+
+            stored_img: StoredImage = StoredImage(
+                img_hash=self._hash.hexdigest(),
+                img_size=self._size,
+                img_mime_type=detect_img_mime_type(self._head),
+            )
+
+            if not self.image_store.exists(stored_img.img_hash):
+                self.image_store._write_file(stored_img, Path(self.tmp_path))
+
+            return stored_img
+        finally:
+            Path(self.tmp_path).unlink(missing_ok=True)
+
+    def abort(self) -> None:
+        """Discard the partially written image."""
+        self._file.close()
+        Path(self.tmp_path).unlink(missing_ok=True)
+
+
+class ImageStoreBase(abc.ABC):
+    """Base class for content-addressed image storage backends.
+
+    Description:
+        Images are keyed by the SHA-256 hash of their bytes, so saving the same image twice
+        stores it once. The database only keeps the hash, size & MIME type (see `StoredImage`).
+    """
+
+    def put(self, img_bytes: bytes) -> StoredImage:
+        """Save image bytes to the store (if they are not already saved) & return a reference to them."""
+        if not img_bytes:
+            raise ValueError("img_bytes cannot be empty")
+
+        stored_img: StoredImage = StoredImage(
+            img_hash=get_img_hash(img_bytes),
+            img_size=len(img_bytes),
+            img_mime_type=detect_img_mime_type(img_bytes),
+        )
+
+        if not self.exists(stored_img.img_hash):
+            self._write(stored_img, img_bytes)
+
+        return stored_img
+
+    def put_stream(self, chunks: t.Iterable[bytes]) -> StoredImage:
+        """Save an image from an iterable of byte chunks (i.e. `httpx.Response.iter_bytes()`).
+
+        Description:
+            Chunks are hashed & written to a temporary file as they arrive, so memory use is bounded
+            by the chunk size rather than the size of the image.
+
+        Returns:
+            (StoredImage): A reference to the saved image.
+
+        """
+        writer: ImageStreamWriter = self.open_writer()
+
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+        except Exception:
+            writer.abort()
+
+            raise
+
+        return writer.finish()
+
+    def open_writer(self) -> ImageStreamWriter:
+        """Return an `ImageStreamWriter` for saving an image chunk by chunk."""
+        return ImageStreamWriter(image_store=self)
+
+    def tmp_dir(self) -> Path | None:
+        """Directory for partially written images. `None` uses the system temp directory."""
+        return None
+
+    @abc.abstractmethod
+    def _write(self, stored_img: StoredImage, img_bytes: bytes) -> None:
+        """Write image bytes under `stored_img.img_hash`."""
+
+    def _write_file(self, stored_img: StoredImage, path: Path) -> None:
+        """Write the image in a finished temporary file under `stored_img.img_hash`.
+
+        Backends should override this to copy the file without reading it into memory.
+        """
+        self._write(stored_img, path.read_bytes())
+
+    @abc.abstractmethod
+    def get(self, img_hash: str) -> bytes:
+        """Return the bytes for an image hash. Raises `FileNotFoundError` if the image is not in the store."""
+
+    @abc.abstractmethod
+    def exists(self, img_hash: str) -> bool:
+        """Return `True` if an image with this hash is in the store."""
+
+    @abc.abstractmethod
+    def delete(self, img_hash: str) -> None:
+        """Remove an image from the store. Does nothing if the image does not exist."""
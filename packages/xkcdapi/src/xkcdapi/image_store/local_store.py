@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import tempfile
+import typing as t
+
+from .base import ImageStoreBase, StoredImage
+
+from loguru import logger as log
+
+class LocalImageStore(ImageStoreBase):
+    """Save images on the local filesystem, keyed by their content hash.
+
+    Description:
+        Images are saved at `<base_path>/<hash[:2]>/<hash[2:4]>/<hash>`, so no single directory grows
+        too large. Writes go to a temporary file that is renamed into place, so a crash never
+        leaves a partial image under a valid hash.
+
+    Params:
+        base_path (str | Path): (default: ".data/images") Directory images are saved in.
+    """
+
+    def __init__(self, base_path: t.Union[str, Path] = ".data/images"):
+        self.base_path: Path = Path(str(base_path))
+
+    def __repr__(self) -> str:
+        return f"LocalImageStore(base_path={self.base_path})"
+
+    def img_path(self, img_hash: str) -> Path:
+        """Return the path an image hash is saved at."""
+        return self.base_path / img_hash[:2] / img_hash[2:4] / img_hash
+
+    def _write(self, stored_img: StoredImage, img_bytes: bytes) -> None:
+        path: Path = self.img_path(stored_img.img_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(img_bytes)
+
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except Exception as exc:
+            msg = f"({type(exc)}) Error writing image '{stored_img.img_hash}' to '{path}'. Details: {exc}"
+            log.error(msg)
+
+            Path(tmp_path).unlink(missing_ok=True)
+
+            raise exc
+
+    def tmp_dir(self) -> Path:
+        ## Keep partial files on the same filesystem as the store, so finished files can be renamed into place
+        return self.base_path / ".tmp"
+
+    def _write_file(self, stored_img: StoredImage, path: Path) -> None:
+        img_path: Path = self.img_path(stored_img.img_hash)
+        img_path.parent.mkdir(parents=True, exist_ok=True)
+
+        ## mkstemp creates files readable only by the owner
+        os.chmod(path, 0o644)
+        os.replace(path, img_path)
+
+    def get(self, img_hash: str) -> bytes:
+        path: Path = self.img_path(img_hash)
+
+        if not path.exists():
+            raise FileNotFoundError(f"Image '{img_hash}' not found in {self}")
+
+        return path.read_bytes()
+
+    def exists(self, img_hash: str) -> bool:
+        return self.img_path(img_hash).exists()
+
+    def delete(self, img_hash: str) -> None:
+        self.img_path(img_hash).unlink(missing_ok=True)
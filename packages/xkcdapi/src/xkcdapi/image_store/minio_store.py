@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+import typing as t
+
+from .base import ImageStoreBase, StoredImage
+
+from loguru import logger as log
+
+class MinioImageStore(ImageStoreBase):
+    """Save images in a MinIO/S3-compatible bucket, keyed by their content hash.
+
+    Description:
+        Objects are saved as `<prefix>/<hash[:2]>/<hash>`. Requires the `minio` package, which is
+        imported when the store is created so the rest of the app does not depend on it.
+
+        Bucket & object handling follows `scripts/minio/minio_storage_controller.py`.
+
+    Params:
+        endpoint (str): MinIO endpoint, i.e. `minio.example.com:9000`.
+        access_key (str): MinIO access key.
+        secret_key (str): MinIO secret key.
+        bucket (str): (default: "xkcd-images") Bucket to save images in. Created if it does not exist.
+        prefix (str): (default: "comic_imgs") Object name prefix for images.
+        secure (bool): (default: True) Use SSL.
+        cert_check (bool): (default: True) Verify SSL certificates.
+    """
+
+    def __init__(self, endpoint: str, access_key: str, secret_key: str, bucket: str = "xkcd-images", prefix: str = "comic_imgs", secure: bool = True, cert_check: bool = True):
+        try:
+            from minio import Minio
+        except ImportError as exc:
+            raise ImportError("MinioImageStore requires the 'minio' package. Install it with: uv add minio") from exc
+
+        self.bucket: str = bucket
+        self.prefix: str = prefix.strip("/")
+
+        try:
+            self.client = Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure, cert_check=cert_check)
+        except Exception as exc:
+            log.error(f"({type(exc)}) Error connecting to minio. Details: {exc}")
+
+            raise exc
+
+        if not self.client.bucket_exists(self.bucket):
+            log.info(f"Creating MinIO bucket '{self.bucket}'")
+            self.client.make_bucket(self.bucket)
+
+    def __repr__(self) -> str:
+        return f"MinioImageStore(bucket={self.bucket}, prefix={self.prefix})"
+
+    def object_name(self, img_hash: str) -> str:
+        """Return the object name an image hash is saved under."""
+        return f"{self.prefix}/{img_hash[:2]}/{img_hash}" if self.prefix else f"{img_hash[:2]}/{img_hash}"
+
+    def _write(self, stored_img: StoredImage, img_bytes: bytes) -> None:
+        self.client.put_object(self.bucket, self.object_name(stored_img.img_hash), io.BytesIO(img_bytes), length=stored_img.img_size, content_type=stored_img.img_mime_type)
+
+    def _write_file(self, stored_img: StoredImage, path: Path) -> None:
+        ## fput_object uploads large files in parts instead of reading them into memory
+        self.client.fput_object(self.bucket, self.object_name(stored_img.img_hash), str(path), content_type=stored_img.img_mime_type)
+
+    def get(self, img_hash: str) -> bytes:
+        from minio.error import S3Error
+
+        try:
+            res = self.client.get_object(self.bucket, self.object_name(img_hash))
+        except S3Error as exc:
+            if exc.code == "NoSuchKey":
+                raise FileNotFoundError(f"Image '{img_hash}' not found in {self}")
+
+            raise
+
+        try:
+            return res.read()
+        finally:
+            res.close()
+            res.release_conn()
+
+    def exists(self, img_hash: str) -> bool:
+        from minio.error import S3Error
+
+        try:
+            self.client.stat_object(self.bucket, self.object_name(img_hash))
+
+            return True
+        except S3Error as exc:
+            if exc.code == "NoSuchKey":
+                return False
+
+            raise
+
+    def delete(self, img_hash: str) -> None:
+        self.client.remove_object(self.bucket, self.object_name(img_hash))
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+import functools
+import time
+import typing as t
+
+from core_utils import metrics_utils
+import httpx
+import sqlalchemy as sa
+
+HTTP_REQUEST_SECONDS: metrics_utils.Histogram = metrics_utils.histogram("xkcd_http_request_duration_seconds", "Time to get an XKCD API response (including reading the body), by endpoint kind & cache result.", labelnames=("kind", "cache"))
+HTTP_CACHE_REQUESTS: metrics_utils.Counter = metrics_utils.counter("xkcd_http_cache_requests_total", "XKCD API responses served from the HTTP cache (hit), the network (miss), or answered 304 Not Modified (not_modified).", labelnames=("kind", "cache"))
+HTTP_DOWNLOADED_BYTES: metrics_utils.Counter = metrics_utils.counter("xkcd_http_downloaded_bytes_total", "Bytes downloaded from the XKCD API, not counting responses served from the cache.", labelnames=("kind",))
+
+DB_SAVE_SECONDS: metrics_utils.Histogram = metrics_utils.histogram("xkcd_db_save_duration_seconds", "Time spent in each db_client save function.", labelnames=("function",))
+DB_STATEMENTS: metrics_utils.Counter = metrics_utils.counter("xkcd_db_statements_total", "SQL statements executed by each db_client save function.", labelnames=("function",))
+DB_ROWS_SAVED: metrics_utils.Counter = metrics_utils.counter("xkcd_db_rows_saved_total", "Rows returned as saved by each db_client save function.", labelnames=("function",))
+
+## The db_client save function running in the current thread/task, statements are counted against it
+_current_save_function: ContextVar[str | None] = ContextVar("xkcd_current_save_function", default=None)
+
+
+def get_cache_result(response: httpx.Response) -> str:
+    """Return "hit", "miss" or "not_modified" for a response."""
+    if response.status_code == 304:
+        return "not_modified"
+
+    return "hit" if response.extensions.get("from_cache") else "miss"
+
+
+def observe_response(kind: str, response: httpx.Response, seconds: float, num_bytes: int | None = None) -> None:
+    """Record an XKCD API response's latency, cache result & downloaded bytes.
+
+    Params:
+        kind (str): The endpoint kind, "current", "comic" or "img".
+        response (httpx.Response): The response, its body already read (or streamed).
+        seconds (float): Time from sending the request to reading the body.
+        num_bytes (int | None): Bytes downloaded. When `None`, read from the response.
+
+    """
+    cache_result: str = get_cache_result(response)
+
+    HTTP_REQUEST_SECONDS.observe(seconds, kind=kind, cache=cache_result)
+    HTTP_CACHE_REQUESTS.inc(kind=kind, cache=cache_result)
+
+    if cache_result != "hit":
+        HTTP_DOWNLOADED_BYTES.inc(response.num_bytes_downloaded if num_bytes is None else num_bytes, kind=kind)
+
+
+def _count_rows(result: t.Any) -> int:
+    if result is None:
+        return 0
+
+    if isinstance(result, (list, tuple)):
+        return sum(_count_rows(item) for item in result)
+
+    return 1
+
+
+def instrument_save(func: t.Callable) -> t.Callable:
+    """Record a db_client save function's duration, SQL statements & saved rows."""
+    name: str = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current_save_function.set(name)
+        start: float = time.perf_counter()
+
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            DB_SAVE_SECONDS.observe(time.perf_counter() - start, function=name)
+            _current_save_function.reset(token)
+
+        DB_ROWS_SAVED.inc(_count_rows(result), function=name)
+
+        return result
+
+    return wrapper
+
+
+@sa.event.listens_for(sa.engine.Engine, "after_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    function: str | None = _current_save_function.get()
+
+    if function:
+        DB_STATEMENTS.inc(function=function)
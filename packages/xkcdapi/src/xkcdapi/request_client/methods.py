@@ -40,10 +40,11 @@ def request_xkcd_comic(num: t.Union[int, str], use_cache: bool = False, force_ca
     http_controller: http_lib.HttpxController = http_lib.get_http_controller(use_cache=use_cache, force_cache=force_cache, follow_redirects=follow_redirects)
     
     try:
-        res: httpx.Response = http_controller.send_request(req)
-        log.debug(f"Request comic #{num} response: [{res.status_code}: {res.reason_phrase}]")
-        
-        return res
+        with http_controller as http_ctl:
+            res: httpx.Response = http_ctl.send_request(req)
+            log.debug(f"Request comic #{num} response: [{res.status_code}: {res.reason_phrase}]")
+            
+            return res
     except Exception as exc:
         log.error(f"({type(exc)}) Error requesting comic #{num}. Details: {exc}")
         raise exc
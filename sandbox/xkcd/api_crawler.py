@@ -15,14 +15,37 @@ import setup
 import sqlalchemy as sa
 import xkcdapi
 import xkcdapi.controllers
+import xkcdapi.crawler
 import xkcdapi.db_client
 import xkcdapi.request_client
 
 DEMO_CACHE_TTL: int = 86400
+## Maximum number of comics to request at once
+MAX_CONCURRENCY: int = 25
+## Number of comics to collect before each database write
+BATCH_SIZE: int = 100
+
 
 def main(db_engine: sa.Engine):
     log.info("Test script to crawl XKCD API")
 
+    with xkcdapi.controllers.XkcdApiController(cache_ttl=DEMO_CACHE_TTL) as api_ctl:
+        current_comic: xkcd_domain.XkcdComicIn = api_ctl.get_current_comic()
+
+    if not current_comic:
+        raise ValueError("Error requesting the current XKCD comic.")
+
+    log.info(f"Crawling comics 1-{current_comic.num}")
+    crawl_summary: dict = xkcdapi.crawler.crawl_and_save_comic_range(
+        start=1,
+        end=current_comic.num,
+        max_concurrency=MAX_CONCURRENCY,
+        batch_size=BATCH_SIZE,
+        cache_ttl=DEMO_CACHE_TTL,
+        engine=db_engine,
+    )
+    log.success(f"Crawl summary: {crawl_summary}")
+
 
 if __name__ == "__main__":
     setup.setup_loguru_logging(log_level=settings.LOGGING_SETTINGS.get("LOG_LEVEL", default="INFO"), add_file_logger=True, add_error_file_logger=True, colorize=True)
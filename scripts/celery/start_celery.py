@@ -29,11 +29,18 @@ def parse_args():
         required=True,
         help="Mode to run the application: 'worker' or 'beat'.",
     )
+    parser.add_argument(
+        "-q",
+        "--queues",
+        type=str,
+        default=None,
+        help="Comma-separated queues a worker consumes: 'realtime', 'bulk', 'maintenance'. Default: all queues.",
+    )
     return parser.parse_args()
 
 
-def run(app: Celery, mode: str):
-    log.debug(f"Celery mode: {mode}")
+def run(app: Celery, mode: str, queues: str | None = None):
+    log.debug(f"Celery mode: {mode}, queues: {queues or 'all'}")
 
     log.debug(
         f"""
@@ -51,7 +58,7 @@ Database settings]
     log.debug(f"Celery settings class: {celery_settings}")
 
     try:
-        start_celery.start(app=app, mode=mode)
+        start_celery.start(app=app, mode=mode, queues=queues)
     except Exception as e:
         log.error(f"Failed to start application: {e}")
         return False
@@ -80,7 +87,7 @@ if __name__ == "__main__":
         exit(1)
 
     try:
-        run(app=celeryapp.app, mode=args.mode.lower())
+        run(app=celeryapp.app, mode=args.mode.lower(), queues=args.queues)
     except Exception as exc:
         msg = (
             f"({type(exc)}) Error running Celery in '{args.mode}' mode. Details: {exc}"
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import typing as t
+
+from depends import db_depends
+from domain import xkcd as xkcd_domain
+from loguru import logger as log
+import settings
+import setup
+import sqlalchemy as sa
+import sqlalchemy.orm as so
+from xkcdapi.image_store import ImageStoreBase, StoredImage, get_image_store
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Move comic image bytes out of the comic_img table & into the configured image store."
+    )
+    parser.add_argument(
+        "-b",
+        "--batch-size",
+        type=int,
+        default=100,
+        help="Number of images to move per transaction.",
+    )
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="Run VACUUM after moving images to reclaim space (SQLite only).",
+    )
+
+    return parser.parse_args()
+
+
+def offload_comic_imgs(batch_size: int = 100, image_store: ImageStoreBase | None = None, engine: sa.Engine | None = None) -> int:
+    """Save every image still stored inline in the database to the image store, then clear its bytes column.
+
+    Params:
+        batch_size (int): (default: 100) Number of images to move per transaction.
+        image_store (ImageStoreBase | None): The image store to move images to. When `None`, the store configured
+            in the app's `[image_store]` settings is used.
+        engine (sqlalchemy.Engine | None): An initialized SQLAlchemy Engine. If engine=None, a default Engine will be initialized from the app's database settings.
+
+    Returns:
+        (int): The number of images moved.
+
+    """
+    if image_store is None:
+        image_store = get_image_store()
+    if engine is None:
+        engine = db_depends.get_db_engine()
+
+    session_pool: so.sessionmaker[so.Session] = db_depends.get_session_pool(engine=engine)
+    img_table: sa.Table = xkcd_domain.XkcdComicImageModel.__table__
+
+    moved: int = 0
+
+    while True:
+        with session_pool() as session:
+            rows = session.execute(
+                sa.select(img_table.c.id, img_table.c.num, img_table.c.img_bytes)
+                .where(img_table.c.img_bytes.is_not(None))
+                .order_by(img_table.c.id)
+                .limit(batch_size)
+            ).all()
+
+            if not rows:
+                break
+
+            for row in rows:
+                stored_img: StoredImage = image_store.put(row.img_bytes)
+
+                session.execute(
+                    sa.update(img_table)
+                    .where(img_table.c.id == row.id)
+                    .values(img_bytes=None, img_hash=stored_img.img_hash, img_size=stored_img.img_size, img_mime_type=stored_img.img_mime_type)
+                )
+
+            session.commit()
+
+        moved += len(rows)
+        log.info(f"Moved [{moved}] comic image(s) to {image_store}")
+
+    return moved
+
+
+def main(batch_size: int = 100, vacuum: bool = False):
+    engine: sa.Engine = db_depends.get_db_engine()
+
+    moved: int = offload_comic_imgs(batch_size=batch_size, engine=engine)
+    log.success(f"Moved [{moved}] comic image(s) out of the database.")
+
+    if vacuum and engine.dialect.name == "sqlite":
+        log.info("Running VACUUM to reclaim database space")
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    setup.setup_loguru_logging(log_level=settings.LOGGING_SETTINGS.get("LOG_LEVEL", default="INFO"), colorize=True)
+    setup.setup_database()
+
+    main(batch_size=args.batch_size, vacuum=args.vacuum)
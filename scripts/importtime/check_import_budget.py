@@ -0,0 +1,233 @@
+"""Check the import time of the app's entry points against a budget.
+
+Description:
+    Imports each entry point in a fresh interpreter with `python -X importtime`, parses the
+    cumulative import time of the top-level module from stderr, and exits non-zero if any entry
+    point is over its budget.
+
+    Importing an entry point should not open cache databases or build database engines; those are
+    created lazily when first used. Each entry point is imported again in a second interpreter that
+    records every SQLAlchemy engine & SQLite connection created, and the check fails if there are any,
+    or if a file under .cache/ or a database file in the working directory was created or modified.
+
+Usage:
+    python scripts/importtime/check_import_budget.py
+    python scripts/importtime/check_import_budget.py --budget-scale 2.0 --show-slowest 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import re
+import subprocess
+import sys
+import typing as t
+
+## Entry point module -> import time budget, in milliseconds
+IMPORT_BUDGETS_MS: dict[str, int] = {
+    "project_cli.main": 1500,
+    "xkcdapi.controllers": 1200,
+    "xkcdapi.crawler": 1200,
+    "xkcdapi.db_client": 1200,
+    "scheduling.celery_scheduler.celeryapp": 1200,
+}
+
+## Files an import must not create or modify, relative to the working directory
+SIDE_EFFECT_GLOBS: list[str] = [".cache/**/*", ".db/**/*", "*.db", "*.sqlite3"]
+
+## Imports `{module}` & prints every engine & SQLite connection created while importing it, as a JSON list
+SIDE_EFFECT_CHECK: str = """
+import json
+import sqlite3
+
+import sqlalchemy
+
+created = []
+
+_create_engine = sqlalchemy.create_engine
+_sqlite3_connect = sqlite3.connect
+
+
+def create_engine(url, *args, **kwargs):
+    created.append(f"SQLAlchemy engine: {url}")
+    return _create_engine(url, *args, **kwargs)
+
+
+def sqlite3_connect(database, *args, **kwargs):
+    created.append(f"SQLite connection: {database}")
+    return _sqlite3_connect(database, *args, **kwargs)
+
+
+sqlalchemy.create_engine = create_engine
+sqlite3.connect = sqlite3_connect
+
+import {module}
+
+print(json.dumps(created))
+"""
+
+## Matches lines like: 'import time:       123 |       4567 | module.name'
+IMPORTTIME_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Check entry point import times against a budget."
+    )
+    parser.add_argument(
+        "--budget-scale",
+        type=float,
+        default=1.0,
+        help="Multiply every budget by this value, i.e. on slow CI runners.",
+    )
+    parser.add_argument(
+        "--show-slowest",
+        type=int,
+        default=10,
+        help="Number of slowest imports to print for each entry point.",
+    )
+    parser.add_argument(
+        "-m",
+        "--module",
+        action="append",
+        default=None,
+        help="Only check this entry point module. Can be passed multiple times.",
+    )
+
+    return parser.parse_args()
+
+
+def measure_import(module: str) -> t.Tuple[float, list[t.Tuple[float, str]]]:
+    """Import `module` in a new interpreter and return its cumulative import time (ms) & per-module timings.
+
+    Params:
+        module (str): The dotted module path to import.
+
+    Returns:
+        (Tuple[float, list[Tuple[float, str]]]): The top-level cumulative import time in milliseconds, and a
+            list of (cumulative ms, module name) for every module imported.
+
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"Error importing '{module}'. Details: {proc.stderr.strip()[-2000:]}")
+
+    timings: list[t.Tuple[float, str]] = []
+    total_ms: float | None = None
+
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE_RE.match(line)
+        if not match:
+            continue
+
+        cumulative_ms: float = int(match.group(2)) / 1000
+        name: str = match.group(4)
+        timings.append((cumulative_ms, name))
+
+        ## Top-level imports are not indented; the requested module is the last one to finish
+        if len(match.group(3)) <= 1 and (name == module or module.startswith(f"{name}.")):
+            total_ms = max(total_ms or 0, cumulative_ms)
+
+    if total_ms is None:
+        raise RuntimeError(f"Could not find import time for '{module}' in -X importtime output.")
+
+    return total_ms, sorted(timings, reverse=True)
+
+
+def snapshot_files(cwd: Path) -> dict[str, int]:
+    """Return the modification time (ns) of every file matching `SIDE_EFFECT_GLOBS`, by path."""
+    return {str(path): path.stat().st_mtime_ns for pattern in SIDE_EFFECT_GLOBS for path in cwd.glob(pattern) if path.is_file()}
+
+
+def check_import_side_effects(module: str) -> list[str]:
+    """Import `module` in a new interpreter and return the engines, connections & files it created.
+
+    Params:
+        module (str): The dotted module path to import.
+
+    Returns:
+        (list[str]): A description of each side effect. Empty when importing `module` has none.
+
+    """
+    cwd: Path = Path.cwd()
+    files_before: dict[str, int] = snapshot_files(cwd)
+
+    proc = subprocess.run(
+        [sys.executable, "-c", SIDE_EFFECT_CHECK.replace("{module}", module)],
+        capture_output=True,
+        text=True,
+    )
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"Error importing '{module}'. Details: {proc.stderr.strip()[-2000:]}")
+
+    side_effects: list[str] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    for path, mtime_ns in snapshot_files(cwd).items():
+        if path not in files_before:
+            side_effects.append(f"Created file: {path}")
+        elif mtime_ns != files_before[path]:
+            side_effects.append(f"Modified file: {path}")
+
+    return side_effects
+
+
+def main(budget_scale: float = 1.0, show_slowest: int = 10, modules: list[str] | None = None) -> int:
+    budgets: dict[str, int] = IMPORT_BUDGETS_MS
+    if modules:
+        budgets = {m: IMPORT_BUDGETS_MS.get(m, max(IMPORT_BUDGETS_MS.values())) for m in modules}
+
+    failed: list[str] = []
+
+    for module, budget_ms in budgets.items():
+        budget_ms: float = budget_ms * budget_scale
+
+        ## Before the timed import, so a file created by importing the module is seen as new
+        try:
+            side_effects: list[str] = check_import_side_effects(module)
+        except Exception as exc:
+            side_effects = [f"[ERROR] {exc}"]
+
+        for side_effect in side_effects:
+            print(f"[SIDE EFFECT] {module}: {side_effect}")
+
+        if side_effects:
+            failed.append(module)
+
+        try:
+            total_ms, timings = measure_import(module)
+        except Exception as exc:
+            print(f"[ERROR] {exc}")
+            if module not in failed:
+                failed.append(module)
+
+            continue
+
+        status: str = "OK" if total_ms <= budget_ms else "OVER BUDGET"
+        print(f"[{status}] {module}: {total_ms:.1f}ms (budget: {budget_ms:.0f}ms)")
+
+        for cumulative_ms, name in timings[:show_slowest]:
+            print(f"    {cumulative_ms:>9.1f}ms  {name}")
+
+        if total_ms > budget_ms and module not in failed:
+            failed.append(module)
+
+    if failed:
+        print(f"Import budget check failed for: {', '.join(failed)}")
+
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    sys.exit(main(budget_scale=args.budget_scale, show_slowest=args.show_slowest, modules=args.module))